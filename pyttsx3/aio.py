@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextlib
+import functools
+from typing import TYPE_CHECKING
+
+from . import init
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+_TOPICS = ("started-utterance", "started-word", "finished-utterance", "error")
+
+
+class AsyncEngine:
+    """
+    Asyncio front end to an L{engine.Engine}. The engine runs in an external
+    run loop that is iterated on a single worker thread whenever the driver
+    wakes its proxy, so neither synthesis nor playback blocks the event loop.
+    Every call into the engine goes through the same worker thread.
+
+    @ivar engine: Wrapped engine
+    @type engine: L{engine.Engine}
+    @ivar poll_interval: Longest time in seconds between iterations, for
+        drivers whose events do not wake the proxy
+    @type poll_interval: float
+    @ivar _utterances: Futures of the utterances that have not finished
+    @type _utterances: set
+    @ivar _subscribers: Queues of the running L{events} iterators
+    @type _subscribers: list
+    """
+
+    def __init__(
+        self, driverName: str | None = None, debug: bool = False, poll_interval: float = 0.05
+    ) -> None:
+        """
+        @param driverName: Name of the platform specific driver to use. If
+            None, selects the default driver for the operating system.
+        @type driverName: str
+        @param debug: Debugging output enabled or not
+        @type debug: bool
+        @param poll_interval: Longest time in seconds between iterations
+        @type poll_interval: float
+        """
+        self.engine = init(driverName, debug)
+        self.poll_interval = poll_interval
+        self._utterances = set()
+        self._subscribers = []
+        self._loop = None
+        self._worker = None
+        self._woken = None
+        self._runner = None
+        self._closing = False
+        self._tokens = []
+
+    async def __aenter__(self) -> AsyncEngine:  # noqa: PYI034
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _call(self, function, *args):
+        return await self._loop.run_in_executor(self._worker, function, *args)
+
+    async def start(self) -> None:
+        """Starts iterating the engine in an external run loop."""
+        self._loop = asyncio.get_running_loop()
+        self._worker = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix="pyttsx3")
+        self._woken = asyncio.Event()
+        self._closing = False
+        for topic in _TOPICS:
+            self._tokens.append(self.engine.connect(topic, self._callback(topic)))
+        self.engine.proxy.setWakeHandler(self._wake)
+        await self._call(self.engine.startLoop, False)
+        self._runner = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stops speaking, ends the run loop and releases the worker thread."""
+        # wait_for may swallow a cancellation that races with a wakeup, so the
+        # runner is asked to stop instead of being cancelled
+        self._closing = True
+        self._woken.set()
+        await self._runner
+        self.engine.proxy.setWakeHandler(None)
+        await self._call(self.engine.endLoop)
+        for token in self._tokens:
+            self.engine.disconnect(token)
+        self._tokens = []
+        self._worker.shutdown()
+
+    def _wake(self) -> None:
+        # called from the worker or a synthesizer thread
+        self._loop.call_soon_threadsafe(self._woken.set)
+
+    async def _run(self) -> None:
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._woken.wait(), self.poll_interval)
+            if self._closing:
+                return
+            self._woken.clear()
+            await self._call(self.engine.iterate)
+
+    def _callback(self, topic: str):
+        def callback(**kwargs) -> None:
+            self._loop.call_soon_threadsafe(self._onEvent, topic, kwargs)
+
+        return callback
+
+    def _onEvent(self, topic: str, kwargs: dict) -> None:
+        for queue in self._subscribers:
+            queue.put_nowait((topic, kwargs))
+
+    def _queueUtterance(self, method, *args) -> asyncio.Future:
+        future = self._loop.create_future()
+        self._utterances.add(future)
+        future.add_done_callback(self._utterances.discard)
+        queued = self._loop.run_in_executor(self._worker, method, *args)
+        queued.add_done_callback(functools.partial(self._onQueued, future))
+        return future
+
+    def _onQueued(self, future, queued) -> None:
+        """
+        Makes the future follow the handle of the queued utterance, or fails
+        it when the engine refused to queue the utterance.
+        """
+        error = queued.exception()
+        if error is None and isinstance(queued.result(), str):
+            error = ValueError(queued.result())
+        if error is not None:
+            if not future.done():
+                future.set_exception(error)
+            return
+        handle = asyncio.wrap_future(queued.result(), loop=self._loop)
+        handle.add_done_callback(functools.partial(self._onHandled, future))
+
+    @staticmethod
+    def _onHandled(future, handle) -> None:
+        """Resolves the future like the utterance handle, or to False when it was dropped."""
+        if future.done():
+            return
+        if handle.cancelled():
+            future.set_result(False)
+        elif handle.exception() is not None:
+            future.set_exception(handle.exception())
+        else:
+            future.set_result(handle.result())
+
+    def say(self, text: str, name: str | None = None) -> asyncio.Future:
+        """
+        Queues an utterance to speak.
+
+        @param text: Text to speak
+        @type text: unicode
+        @param name: Name to associate with this utterance. Included in
+            notifications about this utterance.
+        @type name: str
+        @return: Future resolving to True once the utterance was spoken
+            completely, or to False when it was stopped or dropped. Fails with
+            ValueError when the text is empty.
+        @rtype: asyncio.Future
+        """
+        return self._queueUtterance(self.engine.say, text, name)
+
+    def save_to_file(self, text: str, filename: str, name: str | None = None) -> asyncio.Future:
+        """
+        Queues an utterance to save to a file.
+
+        @param text: Text to speak
+        @type text: unicode
+        @param filename: Name of the file to save to
+        @type filename: str
+        @param name: Name to associate with this utterance
+        @type name: str
+        @return: Future resolving like the one returned by L{say}
+        @rtype: asyncio.Future
+        """
+        return self._queueUtterance(self.engine.save_to_file, text, filename, name)
+
+    async def setProperty(self, name: str, value) -> None:
+        """Queues a property change, see L{engine.Engine.setProperty}."""
+        await self._call(self.engine.setProperty, name, value)
+
+    async def getProperty(self, name: str):
+        """Gets a property value, see L{engine.Engine.getProperty}."""
+        return await self._call(self.engine.getProperty, name)
+
+    async def stop(self) -> None:
+        """
+        Stops the current utterance and drops all queued ones. Their futures
+        resolve to False.
+        """
+        await self._call(self.engine.stop)
+
+    async def drain(self) -> None:
+        """Waits until every utterance queued so far has finished or was dropped."""
+        if self._utterances:
+            await asyncio.wait(set(self._utterances))
+
+    async def events(self) -> AsyncIterator[tuple[str, dict]]:
+        """
+        Yields every notification fired after the iteration starts as a
+        (topic, values) pair, with the values documented in
+        L{engine.Engine.connect}.
+        """
+        queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers.remove(queue)
@@ -0,0 +1,621 @@
+from __future__ import annotations
+
+import array
+import contextlib
+import dataclasses
+import math
+import os
+import queue
+import sys
+import threading
+import wave
+
+_MEMORYVIEW_FORMATS = {1: "B", 2: "h", 4: "i"}
+_NUMPY_DTYPES = {1: "uint8", 2: "int16", 4: "int32"}
+# full scale of a sample and the value of silence, by sample width
+_SCALES = {1: 128, 2: 32768, 4: 2147483648}
+_OFFSETS = {1: 128, 2: 0, 4: 0}
+# frames converted at a time without NumPy, to bound memory
+_CHUNK_FRAMES = 4096
+# cutoff of the low-pass filter applied before lowering the sample rate, as
+# a fraction of the target rate, and number of zero crossings of its sinc on
+# either side of the centre
+_CUTOFF = 0.45
+_FILTER_ZEROS = 8
+
+
+@dataclasses.dataclass(frozen=True)
+class AudioFormat:
+    """
+    Format of raw little-endian PCM audio.
+
+    @ivar sample_rate: Number of frames per second
+    @type sample_rate: int
+    @ivar sample_width: Number of bytes per sample: 1 for unsigned 8-bit,
+        2 for signed 16-bit or 4 for signed 32-bit samples
+    @type sample_width: int
+    @ivar channels: Number of interleaved channels per frame
+    @type channels: int
+    """
+
+    sample_rate: int
+    sample_width: int = 2
+    channels: int = 1
+
+    def __post_init__(self) -> None:
+        if self.sample_width not in _SCALES:
+            msg = f"unsupported sample width {self.sample_width}"
+            raise ValueError(msg)
+        if self.sample_rate <= 0 or self.channels <= 0:
+            msg = f"invalid audio format {self}"
+            raise ValueError(msg)
+
+
+def _lowPass(cutoff: float) -> list:
+    """
+    Designs a low-pass filter as a sinc windowed by a Blackman window.
+
+    @param cutoff: Cutoff frequency, as a fraction of the sample rate
+    @type cutoff: float
+    @return: Odd number of coefficients, adding up to 1
+    @rtype: list
+    """
+    half = math.ceil(_FILTER_ZEROS / (2 * cutoff))
+    width = 2 * half
+    taps = []
+    for k in range(width + 1):
+        phase = 2 * math.pi * cutoff * (k - half)
+        angle = 2 * math.pi * k / width
+        window = 0.42 - 0.5 * math.cos(angle) + 0.08 * math.cos(2 * angle)
+        taps.append(2 * cutoff * (math.sin(phase) / phase if phase else 1.0) * window)
+    total = math.fsum(taps)
+    return [tap / total for tap in taps]
+
+
+def _numpy():
+    """@return: The numpy module, or None when it is not installed"""
+    try:
+        import numpy as np  # noqa: PLC0415  # NumPy is an optional dependency
+    except ImportError:
+        return None
+    return np
+
+
+class FormatConverter:
+    """
+    Converts a stream of PCM chunks to another sample rate, sample width and
+    number of channels. Channels are averaged down to mono or copied up from
+    mono. The sample rate is converted by linear interpolation between
+    neighbouring frames, at positions counted in whole frames so that no
+    rounding error builds up over a long stream. Before lowering the sample
+    rate, a windowed-sinc low-pass filter removes the frequencies the target
+    rate cannot hold, which would otherwise alias. The frames each chunk
+    needs from its neighbours are kept between chunks, so a stream
+    converted chunk by chunk matches the stream converted at once. Uses
+    NumPy when it is installed, and plain Python on chunks of frames
+    otherwise; both do the same floating point operations in the same
+    order and produce the same bytes.
+
+    @ivar source: Format of the chunks passed to L{convert}
+    @type source: L{AudioFormat}
+    @ivar target: Format of the chunks returned by L{convert}
+    @type target: L{AudioFormat}
+    @ivar _channels: Number of channels the sample rate is converted in
+    @type _channels: int
+    @ivar _taps: Coefficients of the low-pass filter, or None when the sample
+        rate is not lowered
+    @type _taps: list
+    @ivar _history: Last source frames of the previous chunks, which the
+        filter has not finished with, by channel
+    @type _history: list or numpy.ndarray
+    @ivar _seen: Number of frames passed to the interpolation so far
+    @type _seen: int
+    @ivar _produced: Number of target frames interpolated so far
+    @type _produced: int
+    @ivar _last: Last frame passed to the interpolation, by channel
+    @type _last: list or numpy.ndarray
+    @ivar _partial: Bytes of an incomplete frame at the end of the previous
+        chunk
+    @type _partial: bytes
+    """
+
+    def __init__(self, source: AudioFormat, target: AudioFormat, use_numpy: bool | None = None):
+        """
+        @param source: Format of the input
+        @type source: L{AudioFormat}
+        @param target: Format to convert to
+        @type target: L{AudioFormat}
+        @param use_numpy: Whether to use NumPy, or None to use it when it is
+            installed
+        @type use_numpy: bool
+        @raise ValueError: When the channels cannot be converted
+        """
+        if source.channels != target.channels and 1 not in (source.channels, target.channels):
+            msg = f"cannot convert {source.channels} channels to {target.channels}"
+            raise ValueError(msg)
+        self.source = source
+        self.target = target
+        self._np = _numpy() if use_numpy is not False else None
+        if use_numpy and self._np is None:
+            msg = "NumPy is not installed"
+            raise ImportError(msg)
+        self._channels = min(source.channels, target.channels)
+        self._taps = None
+        if target.sample_rate < source.sample_rate:
+            self._taps = _lowPass(_CUTOFF * target.sample_rate / source.sample_rate)
+            # centres the filter on the first frame
+            self._history = self._silence(len(self._taps) // 2)
+        self._seen = 0
+        self._produced = 0
+        self._last = None
+        self._partial = b""
+
+    def convert(self, data) -> bytes:
+        """
+        @param data: Raw PCM in the source format, possibly ending with part
+            of a frame that is completed by the next chunk
+        @type data: bytes-like
+        @return: Raw PCM in the target format
+        @rtype: bytes
+        """
+        source = self.source
+        frameSize = source.sample_width * source.channels
+        data = self._partial + bytes(data)
+        whole = len(data) - len(data) % frameSize
+        data, self._partial = data[:whole], data[whole:]
+        if source == self.target:
+            return data
+        if self._np is not None:
+            return self._convertArray(data)
+        frames = _CHUNK_FRAMES * frameSize
+        return b"".join(
+            self._convertList(data[start : start + frames]) for start in range(0, len(data), frames)
+        )
+
+    def flush(self) -> bytes:
+        """
+        Ends the stream. The low-pass filter holds back the last few frames
+        until it has seen the frames after them, so the audio converted when
+        lowering the sample rate is only complete with the bytes returned
+        here.
+
+        @return: Raw PCM in the target format ending the stream
+        @rtype: bytes
+        """
+        self._partial = b""
+        if self._taps is None:
+            return b""
+        # pushes the last frames through the filter as if silence followed
+        silence = self._silence(len(self._taps) // 2)
+        if self._np is not None:
+            return self._encodeArray(self._resampleArray(silence))
+        return self._encodeList(self._resampleList(silence))
+
+    def _silence(self, count: int):
+        """@return: count frames of silence, as an array or by channel"""
+        if self._np is not None:
+            return self._np.zeros((count, self._channels))
+        return [[0.0] * count for _ in range(self._channels)]
+
+    def _convertArray(self, data) -> bytes:
+        np = self._np
+        source, target = self.source, self.target
+        dtype = np.dtype(_NUMPY_DTYPES[source.sample_width]).newbyteorder("<")
+        samples = np.frombuffer(data, dtype=dtype).astype(np.float64)
+        samples = (samples - _OFFSETS[source.sample_width]) / _SCALES[source.sample_width]
+        frames = samples.reshape(-1, source.channels)
+        if target.channels == 1 and source.channels > 1:
+            # added up in order rather than with mean(), like the plain Python
+            mixed = frames[:, 0]
+            for channel in range(1, source.channels):
+                mixed = mixed + frames[:, channel]
+            frames = (mixed / source.channels)[:, np.newaxis]
+        return self._encodeArray(self._resampleArray(frames))
+
+    def _resampleArray(self, frames):
+        np = self._np
+        source, target = self.source, self.target
+        if source.sample_rate == target.sample_rate:
+            return frames
+        if self._taps is not None:
+            frames = np.concatenate((self._history, frames))
+            count = len(frames) - (len(self._taps) - 1)
+            self._history = frames[max(count, 0) :]
+            if count <= 0:
+                return frames[:0]
+            filtered = self._taps[0] * frames[:count]
+            for k in range(1, len(self._taps)):
+                filtered = filtered + self._taps[k] * frames[k : k + count]
+            frames = filtered
+        if not len(frames):
+            return frames
+        base = self._seen
+        if self._last is not None:
+            frames = np.concatenate((self._last[np.newaxis], frames))
+            base -= 1
+        self._seen = base + len(frames)
+        stop = (self._seen - 1) * target.sample_rate // source.sample_rate + 1
+        positions = np.arange(self._produced, stop, dtype=np.int64) * source.sample_rate
+        self._produced = max(self._produced, stop)
+        self._last = frames[-1]
+        index = positions // target.sample_rate - base
+        following = np.minimum(index + 1, len(frames) - 1)
+        weight = ((positions % target.sample_rate) / target.sample_rate)[:, np.newaxis]
+        return frames[index] * (1 - weight) + frames[following] * weight
+
+    def _encodeArray(self, frames) -> bytes:
+        np = self._np
+        target = self.target
+        if self._channels < target.channels:
+            frames = np.repeat(frames, target.channels, axis=1)
+        scale, offset = _SCALES[target.sample_width], _OFFSETS[target.sample_width]
+        samples = np.rint(frames.reshape(-1) * scale) + offset
+        samples = np.clip(samples, offset - scale, offset + scale - 1)
+        dtype = np.dtype(_NUMPY_DTYPES[target.sample_width]).newbyteorder("<")
+        return samples.astype(dtype).tobytes()
+
+    def _convertList(self, data) -> bytes:
+        source, target = self.source, self.target
+        samples = array.array(_MEMORYVIEW_FORMATS[source.sample_width], data)
+        if sys.byteorder == "big" and source.sample_width > 1:
+            samples.byteswap()
+        scale, offset = _SCALES[source.sample_width], _OFFSETS[source.sample_width]
+        channels = [
+            [(sample - offset) / scale for sample in samples[channel :: source.channels]]
+            for channel in range(source.channels)
+        ]
+        if target.channels == 1 and source.channels > 1:
+            # added up in order rather than with sum(), which compensates
+            # for rounding since Python 3.12
+            mixed = channels[0]
+            for channel in channels[1:]:
+                mixed = [a + b for a, b in zip(mixed, channel, strict=True)]
+            channels = [[value / source.channels for value in mixed]]
+        return self._encodeList(self._resampleList(channels))
+
+    def _resampleList(self, channels) -> list:
+        source, target = self.source, self.target
+        if source.sample_rate == target.sample_rate:
+            return channels
+        if self._taps is not None:
+            taps = self._taps
+            channels = [
+                [*history, *channel]
+                for history, channel in zip(self._history, channels, strict=True)
+            ]
+            count = len(channels[0]) - (len(taps) - 1)
+            self._history = [channel[max(count, 0) :] for channel in channels]
+            if count <= 0:
+                return [[] for _ in channels]
+            filtered = []
+            for channel in channels:
+                values = [taps[0] * value for value in channel[:count]]
+                for k in range(1, len(taps)):
+                    tap = taps[k]
+                    values = [
+                        a + tap * b for a, b in zip(values, channel[k : k + count], strict=True)
+                    ]
+                filtered.append(values)
+            channels = filtered
+        if not channels[0]:
+            return channels
+        base = self._seen
+        if self._last is not None:
+            channels = [
+                [last, *channel] for last, channel in zip(self._last, channels, strict=True)
+            ]
+            base -= 1
+        count = len(channels[0])
+        self._seen = base + count
+        stop = (self._seen - 1) * target.sample_rate // source.sample_rate + 1
+        weights = []
+        for n in range(self._produced, stop):
+            position = n * source.sample_rate
+            index = position // target.sample_rate - base
+            following = min(index + 1, count - 1)
+            weights.append((index, following, (position % target.sample_rate) / target.sample_rate))
+        self._produced = max(self._produced, stop)
+        self._last = [channel[-1] for channel in channels]
+        return [
+            [channel[i] * (1 - w) + channel[j] * w for i, j, w in weights] for channel in channels
+        ]
+
+    def _encodeList(self, channels) -> bytes:
+        target = self.target
+        if self._channels < target.channels:
+            channels = channels * target.channels
+        scale, offset = _SCALES[target.sample_width], _OFFSETS[target.sample_width]
+        low, high = offset - scale, offset + scale - 1
+        out = array.array(
+            _MEMORYVIEW_FORMATS[target.sample_width],
+            (
+                min(max(round(value * scale) + offset, low), high)
+                for frame in zip(*channels, strict=True)
+                for value in frame
+            ),
+        )
+        if sys.byteorder == "big" and target.sample_width > 1:
+            out.byteswap()
+        return out.tobytes()
+
+
+class AudioBuffer:
+    """
+    Synthesized PCM audio held in memory. Chunks are appended in place to a
+    growable bytearray, so accumulating a long recording costs linear time.
+
+    @ivar sample_rate: Number of frames per second
+    @type sample_rate: int
+    @ivar sample_width: Number of bytes per sample
+    @type sample_width: int
+    @ivar channels: Number of interleaved channels per frame
+    @type channels: int
+    """
+
+    def __init__(
+        self, data: bytes = b"", sample_rate: int = 22050, sample_width: int = 2, channels: int = 1
+    ) -> None:
+        """
+        Constructs a buffer holding a copy of raw little-endian PCM data.
+
+        @param data: Raw PCM data
+        @type data: bytes
+        @param sample_rate: Number of frames per second
+        @type sample_rate: int
+        @param sample_width: Number of bytes per sample
+        @type sample_width: int
+        @param channels: Number of interleaved channels per frame
+        @type channels: int
+        """
+        self._data = bytearray(data)
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.channels = channels
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(<{len(self)} bytes>, sample_rate={self.sample_rate}, "
+            f"sample_width={self.sample_width}, channels={self.channels})"
+        )
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __bytes__(self) -> bytes:
+        return bytes(self._data)
+
+    @classmethod
+    def read_wav(cls, f) -> AudioBuffer:
+        """
+        Reads a WAV file into a new buffer.
+
+        @param f: File name or binary file object to read from
+        @type f: str or file
+        @rtype: L{AudioBuffer}
+        """
+        with wave.open(f, "rb") as w:
+            return cls(
+                w.readframes(w.getnframes()),
+                sample_rate=w.getframerate(),
+                sample_width=w.getsampwidth(),
+                channels=w.getnchannels(),
+            )
+
+    def copy(self) -> AudioBuffer:
+        """
+        @return: Independent copy of this buffer
+        @rtype: L{AudioBuffer}
+        """
+        return AudioBuffer(self._data, self.sample_rate, self.sample_width, self.channels)
+
+    def append(self, chunk) -> None:
+        """
+        Appends raw PCM data to the end of the buffer. Must not be called
+        while a view returned by L{as_memoryview} or L{as_array} is alive.
+
+        @param chunk: Raw PCM data in the format of this buffer
+        @type chunk: bytes-like
+        """
+        self._data += chunk
+
+    def clear(self) -> None:
+        """Discards all PCM data in the buffer."""
+        self._data = bytearray()
+
+    def write_wav(self, f) -> None:
+        """
+        Writes the buffer out as a WAV file.
+
+        @param f: File name or binary file object to write to
+        @type f: str or file
+        """
+        with wave.open(f, "wb") as w:
+            w.setnchannels(self.channels)
+            w.setsampwidth(self.sample_width)
+            w.setframerate(self.sample_rate)
+            w.writeframes(self._data)
+
+    @property
+    def frames(self) -> int:
+        """Number of frames in the buffer."""
+        return len(self._data) // (self.sample_width * self.channels)
+
+    @property
+    def duration(self) -> float:
+        """Length of the audio in seconds."""
+        return self.frames / self.sample_rate
+
+    @property
+    def format(self) -> AudioFormat:
+        """Format of the audio in the buffer."""
+        return AudioFormat(self.sample_rate, self.sample_width, self.channels)
+
+    def convert(self, audio_format: AudioFormat) -> AudioBuffer:
+        """
+        @param audio_format: Format to convert to
+        @type audio_format: L{AudioFormat}
+        @return: New buffer holding the audio converted with a
+            L{FormatConverter}, or a copy when it is in that format already
+        @rtype: L{AudioBuffer}
+        """
+        converter = FormatConverter(self.format, audio_format)
+        data = converter.convert(self._data) + converter.flush()
+        return AudioBuffer(
+            data, audio_format.sample_rate, audio_format.sample_width, audio_format.channels
+        )
+
+    def as_memoryview(self) -> memoryview:
+        """
+        @return: Zero-copy view of the samples, typed by sample width
+        @rtype: memoryview
+        """
+        return memoryview(self._data).cast(_MEMORYVIEW_FORMATS[self.sample_width])
+
+    def as_array(self):
+        """
+        @return: Zero-copy NumPy view of the samples, shaped (frames, channels)
+            when there is more than one channel
+        @rtype: numpy.ndarray
+        @raise ImportError: When NumPy is not installed
+        """
+        import numpy as np  # noqa: PLC0415  # NumPy is an optional dependency
+
+        samples = np.frombuffer(self._data, dtype=_NUMPY_DTYPES[self.sample_width])
+        if self.channels > 1:
+            samples = samples.reshape(-1, self.channels)
+        return samples
+
+
+class WavWriter:
+    """
+    Streams PCM to a WAV file as it is produced. A writer thread does the
+    file I/O, so L{write} only queues the data and blocks only while
+    max_pending chunks are waiting. The header is written with a zero length
+    and patched with the real sizes by L{close}, so memory use stays at a
+    few chunks however long the recording is.
+
+    @ivar filename: Path of the file being written
+    @type filename: str
+    @ivar audio_format: Format of the PCM written
+    @type audio_format: L{AudioFormat}
+    @ivar source: Format of the PCM passed to L{write}
+    @type source: L{AudioFormat}
+    @ivar frames: Number of frames queued so far, in the L{source} format
+    @type frames: int
+    @ivar _converter: Converter from the L{source} format on the writer
+        thread, or None when the PCM is written as it is
+    @type _converter: L{FormatConverter}
+    @ivar _pending: Chunks waiting for the writer thread, ended by None
+    @type _pending: queue.Queue
+    @ivar _error: Exception the writer thread failed with, or None
+    @type _error: Exception
+    @ivar _aborted: Set by L{abort} so further writes are dropped
+    @type _aborted: threading.Event
+    """
+
+    def __init__(
+        self,
+        filename,
+        audio_format: AudioFormat,
+        max_pending: int = 8,
+        source: AudioFormat | None = None,
+    ) -> None:
+        """
+        Creates the file and starts the writer thread.
+
+        @param filename: Path of the file to write
+        @type filename: str
+        @param audio_format: Format of the PCM to write
+        @type audio_format: L{AudioFormat}
+        @param max_pending: Most chunks queued before L{write} blocks
+        @type max_pending: int
+        @param source: Format of the PCM passed to L{write}, which the writer
+            thread converts to audio_format, or None when it is in that
+            format already
+        @type source: L{AudioFormat}
+        @raise OSError: When the file cannot be created
+        """
+        self.filename = filename
+        self.audio_format = audio_format
+        self.source = source or audio_format
+        self.frames = 0
+        self._converter = None
+        if self.source != audio_format:
+            self._converter = FormatConverter(self.source, audio_format)
+        self._wav = wave.open(filename, "wb")  # noqa: SIM115  # closed by the writer thread
+        self._wav.setnchannels(audio_format.channels)
+        self._wav.setsampwidth(audio_format.sample_width)
+        self._wav.setframerate(audio_format.sample_rate)
+        self._pending = queue.Queue(maxsize=max_pending)
+        self._error = None
+        self._aborted = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="pyttsx3-wav-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            while (chunk := self._pending.get()) is not None:
+                self._write(chunk)
+            self._write(b"", end=True)
+        finally:
+            try:
+                self._wav.close()
+            except Exception as e:  # reported by close()
+                self._error = self._error or e
+
+    def _write(self, chunk, end: bool = False) -> None:
+        """Converts and writes a chunk, or the end of the stream, on the writer thread."""
+        if self._error is not None or self._aborted.is_set():
+            return
+        try:
+            if self._converter is not None:
+                chunk = self._converter.flush() if end else self._converter.convert(chunk)
+            # the header is patched once, on close
+            self._wav.writeframesraw(chunk)
+        except Exception as e:  # reported by close()
+            self._error = e
+
+    def _put(self, item) -> None:
+        # give up waiting for room once aborted, as the thread may be gone
+        while True:
+            with contextlib.suppress(queue.Full):
+                self._pending.put(item, timeout=0.1)
+                return
+            if self._aborted.is_set():
+                return
+
+    def write(self, data) -> None:
+        """
+        Queues PCM to append to the file.
+
+        @param data: Raw PCM in the L{source} format
+        @type data: bytes-like
+        """
+        if self._aborted.is_set():
+            return
+        data = bytes(data)
+        frame_size = self.source.sample_width * self.source.channels
+        self.frames += len(data) // frame_size
+        self._put(data)
+
+    def close(self) -> None:
+        """
+        Waits until all queued PCM is written and completes the header.
+
+        @raise Exception: The error writing the file failed with, if any
+        """
+        self._put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def abort(self) -> None:
+        """Drops the PCM still queued, closes the file and removes it."""
+        self._aborted.set()
+        with contextlib.suppress(queue.Empty):
+            while True:
+                self._pending.get_nowait()
+        self._pending.put(None)
+        self._thread.join()
+        with contextlib.suppress(OSError):
+            os.remove(self.filename)  # noqa: PTH107
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import collections
+import contextlib
+import hashlib
+import os
+import re
+import tempfile
+import threading
+
+from .audio import AudioBuffer
+
+# Whitespace following sentence-final punctuation
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_sentences(text: str) -> list[str]:
+    """
+    Splits text into sentences at whitespace following ".", "!" or "?".
+
+    @param text: Text to split
+    @type text: str
+    @return: Non-empty sentences in order
+    @rtype: list
+    """
+    return [sentence for sentence in _SENTENCE_BREAK.split(text.strip()) if sentence]
+
+
+class SynthesisCache:
+    """
+    Content-addressed cache of synthesized audio. Entries are keyed by a hash
+    of everything that determines the audio: driver, voice settings, text and
+    synthesizer version. Recently used entries are kept in memory up to
+    max_bytes; when a directory is given, every entry is also stored there as
+    a WAV file so it survives eviction and restarts.
+
+    In sentence mode, texts are cached per sentence instead, so texts that
+    only share some of their sentences still reuse them and only the missing
+    sentences are synthesized.
+
+    @ivar hits: Number of lookups served from memory or disk
+    @type hits: int
+    @ivar disk_hits: Number of hits that had to be read from disk
+    @type disk_hits: int
+    @ivar misses: Number of lookups that found nothing
+    @type misses: int
+    @ivar evictions: Number of entries dropped from memory to stay in budget
+    @type evictions: int
+    @ivar sentences: Whether texts are cached per sentence
+    @type sentences: bool
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        directory: str | None = None,
+        sentences: bool = False,
+    ) -> None:
+        """
+        @param max_bytes: Memory budget for cached PCM in bytes
+        @type max_bytes: int
+        @param directory: Directory of the on-disk tier, or None for memory only
+        @type directory: str
+        @param sentences: Cache texts per sentence and stitch the audio together
+        @type sentences: bool
+        """
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.sentences = sentences
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)  # noqa: PTH103
+        self._entries = collections.OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(*parts) -> str:
+        """
+        Builds a cache key from the values that determine the audio.
+
+        @return: Hex digest identifying the audio
+        @rtype: str
+        """
+        return hashlib.sha256("\x1f".join(map(repr, parts)).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.wav")  # noqa: PTH118
+
+    def get(self, key: str) -> AudioBuffer | None:
+        """
+        Looks up cached audio. The returned buffer is shared with the cache
+        and must not be modified.
+
+        @param key: Key built by L{key}
+        @type key: str
+        @return: Cached audio or None on a miss
+        @rtype: L{audio.AudioBuffer}
+        """
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return audio
+        if self.directory is not None:
+            with contextlib.suppress(OSError, EOFError):
+                audio = AudioBuffer.read_wav(self._path(key))
+        with self._lock:
+            if audio is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, audio)
+        return audio
+
+    def put(self, key: str, audio: AudioBuffer) -> None:
+        """
+        Stores a copy of synthesized audio.
+
+        @param key: Key built by L{key}
+        @type key: str
+        @param audio: Audio to store
+        @type audio: L{audio.AudioBuffer}
+        """
+        audio = audio.copy()
+        with self._lock:
+            self._remember(key, audio)
+        if self.directory is not None:
+            self._store(key, audio)
+
+    def _remember(self, key: str, audio: AudioBuffer) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= len(old)
+        if len(audio) > self.max_bytes:
+            return
+        self._entries[key] = audio
+        self._size += len(audio)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self.evictions += 1
+
+    def _store(self, key: str, audio: AudioBuffer) -> None:
+        # write under a temporary name so readers never see a partial file
+        fd, temp_name = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                audio.write_wav(f)
+            os.replace(temp_name, self._path(key))  # noqa: PTH105
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.remove(temp_name)  # noqa: PTH107
+
+    def clear(self) -> None:
+        """Empties the memory tier. Files in the disk tier are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        """
+        @return: Counters for monitoring: hits, disk_hits, misses, evictions,
+            entries and bytes held in memory
+        @rtype: dict
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._size,
+            }
@@ -1,8 +1,267 @@
+import collections
+import concurrent.futures
 import contextlib
+import functools
+import heapq
 import importlib
+import itertools
+import math
+import queue
+import threading
+import time
 import traceback
 import weakref
 
+from .audio import AudioBuffer, AudioFormat, FormatConverter
+from .cache import split_sentences
+from .utterance import Utterance
+from .voice import VoiceRegistry
+
+
+class _CommandQueue:
+    """
+    Priority queue of driver commands. Commands run by decreasing priority and
+    in the order they were queued within a priority. Commands are held in
+    heaps of segments, each but the last ending with an end-of-loop marker, so
+    a stop can drop a whole segment at once. Commands of the default priority
+    stay behind the markers queued before them; those of a higher priority
+    join the first segment, to run in the current loop.
+
+    Commands queued with a group key one after another, at the same priority,
+    form a batch in which the commands of a group run together, in the order
+    the groups first appeared.
+
+    Removed commands stay in the heaps until they reach the top, or until
+    they outnumber the queued ones, so that dropping a command takes
+    constant time.
+
+    @ivar chars: Total number of characters of the queued commands
+    @type chars: int
+    @ivar _live: Entry of each queued command, by id of the command
+    @type _live: dict
+    @ivar _droppable: Entries of the commands that may be dropped, in the
+        order they were queued, by priority
+    @type _droppable: dict
+    @ivar _stale: Number of entries left in the heaps or in L{_droppable}
+        since the last compaction whose command is no longer queued
+    @type _stale: int
+    @ivar _batch: Rank of each group in the batch at the end of the queue
+    @type _batch: dict
+    @ivar _batchKey: Sort key of the commands in that batch
+    @type _batchKey: float
+    """
+
+    def __init__(self) -> None:
+        self._segments = collections.deque([[]])
+        self._order = itertools.count()
+        self.chars = 0
+        self._live = {}
+        self._droppable = {}
+        self._stale = 0
+        self._batch = {}
+        self._batchKey = None
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def append(  # noqa: PLR0913
+        self,
+        command,
+        priority=0,
+        *,
+        marker=False,
+        first=False,
+        chars=0,
+        group=None,
+        droppable=False,
+    ) -> None:
+        """
+        @param command: Command to run after all queued commands of the same
+            or a higher priority
+        @type command: tuple
+        @param priority: Commands with a higher priority run first
+        @type priority: int
+        @param marker: True when the command ends a run loop
+        @type marker: bool
+        @param first: True to run the command before the commands of the same
+            priority instead of after them
+        @type first: bool
+        @param chars: Number of characters of text the command outputs
+        @type chars: int
+        @param group: Key of the group the command may run with, ahead of the
+            commands of other groups queued before it, or None to keep order
+        @type group: object
+        @param droppable: True when L{oldest} may return the command
+        @type droppable: bool
+        """
+        order = next(self._order)
+        # markers sort after everything else in their segment
+        key = math.inf if marker else -priority
+        rank = -order if first else order
+        index = 0 if first or (priority > 0 and not marker) else -1
+        if group is None or first or index == 0 or key != self._batchKey:
+            # anything else ends the batch
+            self._batch = {}
+            self._batchKey = None
+        if group is not None and not first and index == -1:
+            rank = self._batch.setdefault(group, order)
+            self._batchKey = key
+        entry = (key, rank, order, command, chars)
+        segment = self._segments[index]
+        heapq.heappush(segment, entry)
+        if marker:
+            self._segments.append([])
+        self._live[id(command)] = entry
+        if droppable:
+            self._droppable.setdefault(priority, collections.deque()).append(entry)
+        self.chars += chars
+
+    def _isLive(self, entry) -> bool:
+        return self._live.get(id(entry[3])) is entry
+
+    def _forget(self, entry) -> None:
+        """Accounts for a command leaving the queue."""
+        del self._live[id(entry[3])]
+        self.chars -= entry[4]
+        self._stale += 1
+
+    def _prune(self) -> None:
+        """
+        Drops removed commands from the top of the first segment, and the
+        segment once it is empty, so that its top is the next command.
+        Compacts the heaps when removed commands outnumber queued ones.
+        """
+        if self._stale > len(self._live) + 64:
+            self._compact()
+        while True:
+            segment = self._segments[0]
+            while segment and not self._isLive(segment[0]):
+                heapq.heappop(segment)
+            if segment or len(self._segments) == 1:
+                return
+            self._segments.popleft()
+
+    def _compact(self) -> None:
+        """Rebuilds the heaps and the index without the removed commands."""
+        for segment in self._segments:
+            segment[:] = [entry for entry in segment if self._isLive(entry)]
+            heapq.heapify(segment)
+        for priority, entries in list(self._droppable.items()):
+            live = collections.deque(entry for entry in entries if self._isLive(entry))
+            if live:
+                self._droppable[priority] = live
+            else:
+                del self._droppable[priority]
+        self._stale = 0
+
+    def head(self):
+        """
+        @return: The command L{popleft} would return, or None when empty
+        @rtype: tuple
+        """
+        segment = self._segments[0]
+        return segment[0][3] if segment else None
+
+    def popleft(self):
+        """
+        @return: The next command
+        @rtype: tuple
+        @raise IndexError: When the queue is empty
+        """
+        entry = heapq.heappop(self._segments[0])
+        self._forget(entry)
+        self._prune()
+        return entry[3]
+
+    def peek(self, count):
+        """
+        @param count: Most commands to return
+        @type count: int
+        @return: The next commands, in the order L{popleft} would return them,
+            up to the end of the current loop
+        @rtype: list
+        """
+        live = filter(self._isLive, self._segments[0])
+        return [entry[3] for entry in heapq.nsmallest(count, live)]
+
+    def oldest(self, lowest=False):
+        """
+        Looks for a command to drop when the queue is full, among those
+        queued as droppable.
+
+        @param lowest: Only consider the commands of the lowest priority
+        @type lowest: bool
+        @return: The droppable command queued first, or None
+        @rtype: tuple
+        """
+        heads = []
+        for priority, entries in list(self._droppable.items()):
+            while entries and not self._isLive(entries[0]):
+                entries.popleft()
+            if entries:
+                heads.append((priority, entries[0]))
+            else:
+                del self._droppable[priority]
+        if not heads:
+            return None
+        if lowest:
+            return min(heads, key=lambda head: (head[0], head[1][2]))[1][3]
+        return min(heads, key=lambda head: head[1][2])[1][3]
+
+    def remove(self, command) -> bool:
+        """
+        Drops a single command, leaving the others queued.
+
+        @param command: Queued command, compared by identity
+        @type command: tuple
+        @return: False when the command is not queued
+        @rtype: bool
+        """
+        entry = self._live.get(id(command))
+        if entry is None:
+            return False
+        self._forget(entry)
+        self._prune()
+        return True
+
+    def clearToMarker(self):
+        """
+        Drops all commands queued before the first end-of-loop marker.
+
+        @return: The dropped commands
+        @rtype: list
+        """
+        segment = [entry for entry in self._segments[0] if self._isLive(entry)]
+        if len(self._segments) > 1:
+            # keep the marker closing this segment
+            marker = max(segment)
+            segment.remove(marker)
+            self._segments[0] = [marker]
+        else:
+            self._segments[0] = []
+        for entry in segment:
+            self._forget(entry)
+        self._batch = {}
+        self._batchKey = None
+        return [entry[3] for entry in segment]
+
+    def clear(self):
+        """
+        Drops all commands.
+
+        @return: The dropped commands
+        @rtype: list
+        """
+        commands = [entry[3] for entry in self._live.values()]
+        self._segments = collections.deque([[]])
+        self.chars = 0
+        self._live = {}
+        self._droppable = {}
+        self._stale = 0
+        self._batch = {}
+        self._batchKey = None
+        return commands
+
 
 class DriverProxy:
     """
@@ -13,16 +272,85 @@ class DriverProxy:
     @ivar _engine: Reference to the engine that owns the driver
     @type _engine: L{engine.Engine}
     @ivar _queue: Queue of commands outstanding for the driver
-    @type _queue: list
+    @type _queue: L{_CommandQueue}
     @ivar _busy: True when the driver is busy processing a command, False when
         not
     @type _busy: bool
     @ivar _name: Name associated with the current utterance
     @type _name: str
+    @ivar _utterance: Handle of the current utterance
+    @type _utterance: L{utterance.Utterance}
     @ivar _debug: Debugging output enabled or not
     @type _debug: bool
     @ivar _iterator: Driver iterator to invoke when in an external run loop
     @type _iterator: iterator
+    @ivar cache: Cache of synthesized audio, or None to always synthesize
+    @type cache: L{cache.SynthesisCache}
+    @ivar _pendingKey: Cache key of the utterance the driver is synthesizing
+    @type _pendingKey: str
+    @ivar _wakeup: Condition a driver loop blocks on between events
+    @type _wakeup: threading.Condition
+    @ivar _woken: True when the driver loop was woken since it last waited
+    @type _woken: bool
+    @ivar _wakeHandler: Called on every wake so an external loop can iterate
+    @type _wakeHandler: callable
+    @ivar _lock: Serializes queue changes and command execution across threads
+    @type _lock: threading.RLock
+    @ivar _idle: Condition on L{_lock} notified when the queue runs empty
+    @type _idle: threading.Condition
+    @ivar _owner: Only thread allowed to run commands, or None for any thread
+    @type _owner: threading.Thread
+    @ivar _pumping: True while L{_pump} runs commands
+    @type _pumping: bool
+    @ivar _looper: Thread that started the running event loop, or None
+    @type _looper: threading.Thread
+    @ivar expiry: What happens to an utterance whose deadline passed before
+        it started: "drop" cancels its handle without a notification, "error"
+        fires an error notification and "finish" a finished-utterance one
+        with completed False
+    @type expiry: str
+    @ivar expired: Number of utterances that expired before they started
+    @type expired: int
+    @ivar max_queued: Most commands the queue holds, or None for no limit
+    @type max_queued: int
+    @ivar max_queued_chars: Most characters of text the queue holds, or None
+        for no limit
+    @type max_queued_chars: int
+    @ivar overflow: What a command queued while the queue is full does:
+        "block" waits for room, "reject" fails, "drop-oldest" drops the
+        utterance queued first and "drop-lowest" the one queued first among
+        those of the lowest priority
+    @type overflow: str
+    @ivar overflow_timeout: Longest time in seconds to block for room, or None
+    @type overflow_timeout: float
+    @ivar dropped: Number of utterances dropped to make room
+    @type dropped: int
+    @ivar rejected: Number of commands refused because the queue was full
+    @type rejected: int
+    @ivar _space: Condition on L{_lock} notified when commands leave the queue
+    @type _space: threading.Condition
+    @ivar _tail: Command queued last, while it is still queued
+    @type _tail: tuple
+    @ivar _applied: Property values the driver was last given
+    @type _applied: dict
+    @ivar _overridden: Values set through the engine of the properties the
+        last utterance overrode, to restore before the next one
+    @type _overridden: dict
+    @ivar batch: True to group utterances queued one after another by voice
+    @type batch: bool
+    @ivar _voices: Catalogue of the driver's voices, for drivers without one
+    @type _voices: L{voice.VoiceRegistry}
+    @ivar output_format: Format to convert synthesized audio to before it is
+        returned or saved, or None to keep the driver's own format
+    @type output_format: L{audio.AudioFormat}
+    @ivar lookahead: Number of queued utterances to synthesize while the
+        current one is output, or 0 to synthesize each when it is due
+    @type lookahead: int
+    @ivar _ahead: Future of the audio synthesized ahead and the event that
+        stops its synthesis, by utterance
+    @type _ahead: dict
+    @ivar _executor: Thread synthesizing ahead, started on first use
+    @type _executor: concurrent.futures.ThreadPoolExecutor
     """
 
     def __init__(self, engine, driverName: str, debug: bool) -> None:
@@ -43,18 +371,51 @@ class DriverProxy:
         self._driver = self._module.buildDriver(weakref.proxy(self))
         # initialize refs
         self._engine = engine
-        self._queue = []
+        self._queue = _CommandQueue()
         self._busy = True
         self._name = None
+        self._utterance = None
         self._iterator = None
         self._debug = debug
         self._current_text = ""
+        self.cache = None
+        self._pendingKey = None
+        self._wakeup = threading.Condition()
+        self._woken = False
+        self._wakeHandler = None
+        self._lock = threading.RLock()
+        self._idle = threading.Condition(self._lock)
+        self._owner = None
+        self._pumping = False
+        self._looper = None
+        self.expiry = "drop"
+        self.expired = 0
+        self.max_queued = None
+        self.max_queued_chars = None
+        self.overflow = "block"
+        self.overflow_timeout = None
+        self.dropped = 0
+        self.rejected = 0
+        self._space = threading.Condition(self._lock)
+        self._tail = None
+        self._applied = {}
+        self._overridden = {}
+        self.batch = False
+        self._voices = None
+        self.output_format = None
+        self.lookahead = 0
+        self._ahead = {}
+        self._executor = None
 
     def __del__(self) -> None:
         with contextlib.suppress(AttributeError, TypeError):
+            self._stopAhead()
+            if self._executor is not None:
+                # may run on the look-ahead thread, which cannot join itself
+                self._executor.shutdown(wait=False)
             self._driver.destroy()
 
-    def _push(self, mtd, args, name=None) -> None:
+    def _push(self, mtd, args, name=None, utterance=None, first=False) -> None:
         """
         Adds a command to the queue.
 
@@ -64,24 +425,228 @@ class DriverProxy:
         @type args: tuple
         @param name: Name associated with the command
         @type name: str
+        @param utterance: Handle of the utterance the command outputs, whose
+            priority the command is queued with
+        @type utterance: L{utterance.Utterance}
+        @param first: True to run the command before the queued commands of
+            the same priority
+        @type first: bool
         """
-        self._queue.append((mtd, args, name))
-        self._pump()
+        command = (mtd, args, name, utterance)
+        marker = mtd in {self._engine.endLoop, self._endRun}
+        priority = chars = 0
+        group = None
+        if utterance is not None:
+            utterance._command = command
+            priority = utterance.priority
+            chars = len(utterance.text)
+            if self.batch and mtd == self._say:
+                # utterances without a voice keep the one set before them
+                group = utterance.properties.get("voice", "")
+        with self._lock:
+            # the end of a loop and the rest of a preempted utterance are
+            # never refused
+            if not (marker or first) and not self._admit(utterance, chars):
+                return
+            # the rest of a preempted utterance has started already
+            droppable = utterance is not None and not first
+            self._queue.append(
+                command,
+                priority,
+                marker=marker,
+                first=first,
+                chars=chars,
+                group=group,
+                droppable=droppable,
+            )
+            self._tail = command
+            current = self._utterance
+            if (
+                current is not None
+                and priority > current.priority
+                and self._queue.head() is command
+                and hasattr(self._driver, "preempt")
+            ):
+                # only preempt for a command that runs next, not one held
+                # behind the end of the running loop
+                self._driver.preempt()
+            self._pump()
+        self.wake()
+
+    def _fits(self, chars) -> bool:
+        """
+        @return: True when a command outputting chars characters fits in the
+            queue limits
+        @rtype: bool
+        """
+        if self.max_queued is not None and len(self._queue) >= self.max_queued:
+            return False
+        return self.max_queued_chars is None or self._queue.chars + chars <= self.max_queued_chars
+
+    def _admit(self, utterance, chars) -> bool:
+        """
+        Makes room for a command according to the L{overflow} policy. Must be
+        called with L{_lock} held.
+
+        @param utterance: Handle of the utterance the command outputs, or None
+        @type utterance: L{utterance.Utterance}
+        @param chars: Number of characters of text the command outputs
+        @type chars: int
+        @return: False when the command itself was dropped instead
+        @rtype: bool
+        @raise queue.Full: When the command was refused
+        """
+        if self._fits(chars):
+            return True
+        if self.max_queued_chars is not None and chars > self.max_queued_chars:
+            self.rejected += 1
+            msg = f"utterance of {chars} characters exceeds the queue limit"
+            raise queue.Full(msg)
+        if self.overflow == "block":
+            # only another thread running commands can make room; the thread
+            # running them, or any thread while no loop runs, would wait forever
+            runner = self._owner or self._looper
+            if (
+                runner is not None
+                and runner is not threading.current_thread()
+                and self._space.wait_for(lambda: self._fits(chars), self.overflow_timeout)
+            ):
+                return True
+        elif self.overflow in {"drop-oldest", "drop-lowest"}:
+            lowest = self.overflow == "drop-lowest"
+            while not self._fits(chars):
+                victim = self._queue.oldest(lowest)
+                if victim is None:
+                    break
+                if lowest and utterance is not None and utterance.priority < victim[3].priority:
+                    # the new utterance has the lowest priority of all
+                    self.dropped += 1
+                    concurrent.futures.Future.cancel(utterance)
+                    return False
+                self._queue.remove(victim)
+                self.dropped += 1
+                concurrent.futures.Future.cancel(victim[3])
+            else:
+                return True
+        self.rejected += 1
+        msg = "command queue is full"
+        raise queue.Full(msg)
+
+    def limitQueue(self, depth=None, chars=None, overflow="block", timeout=None) -> None:
+        """
+        Called by the engine to bound the command queue.
+
+        @param depth: Most commands the queue holds, or None for no limit
+        @type depth: int
+        @param chars: Most characters of text the queue holds, or None for no
+            limit
+        @type chars: int
+        @param overflow: Policy for commands queued while the queue is full,
+            see L{overflow}
+        @type overflow: str
+        @param timeout: Longest time in seconds to block for room, or None
+        @type timeout: float
+        """
+        with self._lock:
+            self.max_queued = depth
+            self.max_queued_chars = chars
+            self.overflow = overflow
+            self.overflow_timeout = timeout
+            # blocked producers may fit under the new limits
+            self._space.notify_all()
 
     def _pump(self) -> None:
         """
         Attempts to process the next command in the queue if one exists and the
-        driver is not currently busy.
+        driver is not currently busy. Does nothing outside the owner thread, if
+        there is one.
         """
-        while (not self._busy) and len(self._queue):
-            cmd = self._queue.pop(0)
-            self._name = cmd[2]
+        if self._owner is not None and threading.current_thread() is not self._owner:
+            return
+        with self._lock:
+            # a command finishing synchronously calls setBusy(False) and so
+            # re-enters here; leave the next command to the outer loop instead
+            # of recursing once per queued command
+            if self._pumping:
+                return
+            self._pumping = True
             try:
-                cmd[0](*cmd[1])
-            except Exception as e:
-                self.notify("error", exception=e)
-                if self._debug:
-                    traceback.print_exc()
+                while (not self._busy) and len(self._queue):
+                    cmd = self._queue.popleft()
+                    self._space.notify_all()
+                    if cmd is self._tail:
+                        self._tail = None
+                    self._name = cmd[2]
+                    self._utterance = cmd[3]
+                    if not self._expire(cmd):
+                        self._run(cmd)
+            finally:
+                self._pumping = False
+            if not self._busy:
+                self._idle.notify_all()
+
+    def _run(self, command) -> None:
+        """
+        Runs a command popped from the queue. A driver that output its
+        utterance before returning without going busy or notifying, like a
+        synchronous save_to_file, completed it.
+
+        @param command: Command popped from the queue
+        @type command: tuple
+        """
+        try:
+            command[0](*command[1])
+        except Exception as e:
+            self.notify("error", exception=e)
+            if self._debug:
+                traceback.print_exc()
+        if not self._busy and self._utterance is not None:
+            utterance, self._utterance = self._utterance, None
+            if not utterance.done():
+                utterance.set_result(True)
+
+    def _expire(self, command) -> bool:
+        """
+        Applies the L{expiry} policy to a command about to run if it outputs
+        an utterance whose deadline has passed. A preempted utterance that is
+        resumed has started already and does not expire.
+
+        @param command: Command popped from the queue
+        @type command: tuple
+        @return: True when the command expired and must not run
+        @rtype: bool
+        """
+        utterance = command[3]
+        if utterance is None or utterance.deadline is None or command[0] == self._resume:
+            return False
+        late = time.monotonic() - utterance.deadline
+        if late <= 0:
+            return False
+        self.expired += 1
+        if self.expiry == "error":
+            msg = f"utterance expired {late:.3f} s before it could start"
+            self.notify("error", exception=TimeoutError(msg))
+        elif self.expiry == "finish":
+            self.notify("finished-utterance", completed=False)
+        else:
+            self._utterance = None
+            concurrent.futures.Future.cancel(utterance)
+        return True
+
+    def stats(self) -> dict:
+        """
+        @return: Counters for monitoring: expired, dropped, rejected, and the
+            number of queued commands and characters
+        @rtype: dict
+        """
+        with self._lock:
+            return {
+                "expired": self.expired,
+                "dropped": self.dropped,
+                "rejected": self.rejected,
+                "queued": len(self._queue),
+                "queued_chars": self._queue.chars,
+            }
 
     def notify(self, topic, **kwargs) -> None:
         """
@@ -95,6 +660,81 @@ class DriverProxy:
         if "name" not in kwargs or kwargs["name"] is None:  # Avoid overwriting
             kwargs["name"] = self._name
         self._engine._notify(topic, **kwargs)
+        if topic in {"finished-utterance", "error"} and self._utterance is not None:
+            utterance, self._utterance = self._utterance, None
+            if topic == "error":
+                utterance.set_exception(kwargs["exception"])
+            else:
+                utterance.set_result(kwargs["completed"])
+
+    def preempted(self, position, audio) -> None:
+        """
+        Called by the driver when it cut the current utterance short at a
+        word boundary because L{preempt} was requested, before notifying that
+        it finished. Requeues the rest of the utterance if it was queued to
+        be resumed; its handle then stays pending until the rest is output.
+
+        @param position: Number of the word the utterance was cut at, counted
+            from 1
+        @type position: int
+        @param audio: Audio of the utterance before the cut when it has not
+            been output yet, or None
+        @type audio: L{audio.AudioBuffer}
+        """
+        utterance = self._utterance
+        if utterance is None or not utterance.resume:
+            return
+        with self._lock:
+            self._utterance = None
+            args = (utterance.text, position, audio)
+            self._push(self._resume, args, utterance.name, utterance, first=True)
+
+    def _resume(self, text, position, audio) -> None:
+        """Hands the driver the rest of a preempted utterance."""
+        self._awaitAhead()
+        self._pendingKey = None
+        self._overrideProperties(self._utterance.properties)
+        self._driver.resume(text, position, audio)
+
+    def reportAudio(self, samples, sample_rate) -> None:
+        """
+        Called by the driver before finishing an utterance, or a part of it
+        that was preempted, with the amount of audio it output, to be reported
+        on the utterance's handle.
+
+        @param samples: Number of frames output
+        @type samples: int
+        @param sample_rate: Number of frames per second
+        @type sample_rate: int
+        """
+        utterance = self._utterance
+        if utterance is not None:
+            # a preempted utterance that was resumed reports each part
+            utterance.samples = (utterance.samples or 0) + samples
+            utterance.duration = utterance.samples / sample_rate
+
+    def detachUtterance(self):
+        """
+        Called by the driver when it is done with the current utterance while
+        its output has yet to end, such as audio still playing on another
+        thread. The driver may then go idle and take the next command, and
+        reports the end of the utterance through the returned callable, from
+        any thread.
+
+        @return: Callable taking the completed flag, which fires the
+            finished-utterance notification and resolves the handle of the
+            detached utterance
+        @rtype: callable
+        """
+        name, utterance = self._name, self._utterance
+        self._utterance = None
+
+        def finish(completed) -> None:
+            self._engine._notify("finished-utterance", name=name, completed=completed)
+            if utterance is not None and not utterance.done():
+                utterance.set_result(completed)
+
+        return finish
 
     def setBusy(self, busy) -> None:
         """
@@ -105,7 +745,76 @@ class DriverProxy:
         """
         self._busy = busy
         if not self._busy:
+            if self._utterance is not None:
+                # idle without finishing it, so the driver dropped the utterance
+                utterance, self._utterance = self._utterance, None
+                concurrent.futures.Future.cancel(utterance)
             self._pump()
+        self.wake()
+
+    def wake(self) -> None:
+        """
+        Wakes a driver loop blocked in L{waitForWake}. Called on every queued
+        command and busy state change, and by drivers when their synthesizer
+        reports an event the loop has to handle, such as the end of an
+        utterance. Safe to call from any thread, including synthesizer
+        callbacks.
+        """
+        with self._wakeup:
+            self._woken = True
+            self._wakeup.notify_all()
+        if self._wakeHandler is not None:
+            self._wakeHandler()
+
+    def setWakeHandler(self, handler) -> None:
+        """
+        Called by the engine's owner to learn when an external run loop should
+        call iterate() again.
+
+        @param handler: Callable without arguments, called from any thread, or
+            None to remove the handler
+        @type handler: callable
+        """
+        self._wakeHandler = handler
+
+    def waitForWake(self, timeout=None) -> bool:
+        """
+        Called by the driver loop to block until L{wake} is called. Returns at
+        once if it was called since the last wait, so no wakeup is lost.
+
+        @param timeout: Maximum number of seconds to wait, or None for no limit
+        @type timeout: float
+        @return: True when woken, False on timeout
+        @rtype: bool
+        """
+        with self._wakeup:
+            woken = self._wakeup.wait_for(lambda: self._woken, timeout)
+            self._woken = False
+            return woken
+
+    def setOwner(self, thread) -> None:
+        """
+        Called by the engine to run commands only on the given thread. Other
+        threads still queue commands, which the owner runs on its next
+        L{iterate}.
+
+        @param thread: Thread running the loop, or None to allow any thread
+        @type thread: threading.Thread
+        """
+        self._owner = thread
+
+    def waitUntilIdle(self, timeout=None) -> bool:
+        """
+        Blocks until all queued commands have run and the driver is no longer
+        busy. Safe to call from any thread but the one running the loop.
+
+        @param timeout: Maximum number of seconds to wait, or None for no limit
+        @type timeout: float
+        @return: True when idle, False on timeout
+        @rtype: bool
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._busy and not len(self._queue), timeout)
 
     def isBusy(self):
         """
@@ -114,34 +823,206 @@ class DriverProxy:
         """
         return self._busy
 
-    def say(self, text, name) -> None:
+    def say(  # noqa: PLR0913
+        self, text, name, *, priority=0, resume=False, deadline=None, properties=None
+    ) -> None:
         """
-        Called by the engine to push a say command onto the queue.
+        Called by the engine to push a say command onto the queue. A command
+        of a higher priority than the current utterance asks the driver to
+        preempt it, if the driver supports that. In L{batch} mode, utterances
+        queued one after another at the same priority are output grouped by
+        voice.
 
         @param text: Text to speak
         @type text: unicode
         @param name: Name to associate with the utterance
         @type name: str
+        @param priority: Utterances with a higher priority are output first
+        @type priority: int
+        @param resume: Whether to resume the utterance when it is preempted
+        @type resume: bool
+        @param deadline: time.monotonic() value after which the utterance
+            expires if it has not started, or None
+        @type deadline: float
+        @param properties: Property values to output this utterance with
+            instead of those set through the engine
+        @type properties: dict
+        @return: Handle of the queued utterance
+        @rtype: L{utterance.Utterance}
         """
         self._current_text = text
-        self._push(self._driver.say, (text,), name)
+        utterance = Utterance(
+            self,
+            text,
+            name,
+            priority=priority,
+            resume=resume,
+            deadline=deadline,
+            properties=properties,
+        )
+        self._push(self._say, (text,), name, utterance)
+        return utterance
+
+    def _say(self, text) -> None:
+        """
+        Hands the driver cached audio if there is some, or the text to
+        synthesize. With a L{lookahead}, the driver is handed the audio
+        synthesized ahead instead, and the next utterances are synthesized
+        while it outputs this one.
+        """
+        utterance = self._utterance
+        ahead = self._ahead.get(utterance)
+        if ahead is None:
+            # nothing synthesized ahead may see the settings change under it
+            self._awaitAhead()
+        self._overrideProperties(utterance.properties)
+        if ahead is None and self.lookahead > 0 and self._canLookAhead():
+            ahead = self._ahead[utterance] = self._synthesizeAhead(text)
+        if ahead is None:
+            audio = self._cachedAudio(text)
+            if audio is None:
+                self._driver.say(text)
+            else:
+                self._driver.play(audio)
+            return
+        self._pendingKey = None
+        if self.lookahead > 0:
+            self._lookAhead(utterance.properties)
+        # the driver waits for the audio when the utterance is due
+        self._driver.play(ahead[0].result)
+
+    def _canLookAhead(self) -> bool:
+        """
+        @return: True when the driver can synthesize to memory and output
+            given audio, as looking ahead requires
+        @rtype: bool
+        """
+        return hasattr(self._driver, "play") and hasattr(self._driver, "synthesize_iter")
+
+    def _lookAhead(self, properties) -> None:
+        """
+        Starts synthesizing the next L{lookahead} queued utterances. Stops at
+        the first command that is not an utterance, or at an utterance with
+        other properties, as the driver's settings change there.
+
+        @param properties: Property values of the current utterance
+        @type properties: dict
+        """
+        for utterance in [utterance for utterance in self._ahead if utterance.done()]:
+            self._ahead.pop(utterance)[1].set()
+        for command in self._queue.peek(self.lookahead):
+            utterance = command[3]
+            if command[0] != self._say or utterance.properties != properties:
+                break
+            if utterance not in self._ahead:
+                self._ahead[utterance] = self._synthesizeAhead(command[1][0])
+
+    def _synthesizeAhead(self, text):
+        """
+        Queues the synthesis of text on the look-ahead thread.
+
+        @return: Future of the audio, and the event that stops its synthesis
+        @rtype: tuple
+        """
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="pyttsx3-lookahead"
+            )
+        stopped = threading.Event()
+        return self._executor.submit(self._renderAhead, text, stopped), stopped
+
+    def _renderAhead(self, text, stopped):
+        """
+        Runs on the look-ahead thread. Synthesizes text, using the cache like
+        L{synthesize_iter} does, until stopped is set.
+
+        @return: The audio synthesized until then
+        @rtype: L{audio.AudioBuffer}
+        """
+        audio = AudioBuffer(sample_rate=self._nativeFormat().sample_rate)
+        if stopped.is_set():
+            return audio
+        chunks = self._synthesizeChunks(text)
+        try:
+            for chunk in chunks:
+                if stopped.is_set():
+                    break
+                audio.append(chunk)
+        finally:
+            # abandons the rest of a stopped synthesis
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+        return audio
+
+    def _awaitAhead(self) -> None:
+        """
+        Waits for the look-ahead thread to finish with the driver before the
+        driver's settings change or it synthesizes on its own. Must be called
+        with L{_lock} held.
+        """
+        if self._ahead:
+            concurrent.futures.wait([future for future, _ in self._ahead.values()])
+
+    def _stopAhead(self, utterances=None) -> None:
+        """
+        Stops synthesizing ahead for the given utterances, or all of them. A
+        driver waiting for the audio of a stopped utterance gets what was
+        synthesized until then, which it discards as the utterance stopped.
+        Safe to call without L{_lock}, as it only sets events.
+        """
+        for utterance in list(self._ahead if utterances is None else utterances):
+            ahead = self._ahead.get(utterance)
+            if ahead is not None:
+                ahead[1].set()
 
     def stop(self) -> None:
         """
         Called by the engine to stop the current utterance and clear the queue
         of commands.
         """
+        # a command may hold the lock waiting for the synthesis ahead, so
+        # end that first
+        self._stopAhead()
         # clear queue up to first end loop command
-        while True:
-            try:
-                mtd, _args, _name = self._queue[0]
-            except IndexError:
-                break
-            if mtd == self._engine.endLoop:
-                break
-            self._queue.pop(0)
+        with self._lock:
+            self._cancelAll(self._queue.clearToMarker())
+            self._space.notify_all()
+            self._tail = None
+            self._stopAhead()
         self._driver.stop()
 
+    def cancel(self, utterance) -> bool:
+        """
+        Called by an utterance handle to drop its command from the queue, or
+        to stop the driver while it outputs the utterance.
+
+        @param utterance: Handle returned by L{say} or L{save_to_file}
+        @type utterance: L{utterance.Utterance}
+        @return: False when the utterance has already finished
+        @rtype: bool
+        """
+        self._stopAhead((utterance,))
+        with self._lock:
+            if utterance.done():
+                return False
+            if utterance is self._utterance:
+                self._driver.stop()
+                return True
+            if not self._queue.remove(utterance._command):
+                return False
+            self._space.notify_all()
+        concurrent.futures.Future.cancel(utterance)
+        self.wake()
+        return True
+
+    @staticmethod
+    def _cancelAll(commands) -> None:
+        """Cancels the utterances of commands dropped from the queue."""
+        for command in commands:
+            if command[3] is not None:
+                concurrent.futures.Future.cancel(command[3])
+
     def save_to_file(self, text, filename, name) -> None:
         """
         Called by the engine to push a say command onto the queue.
@@ -150,20 +1031,300 @@ class DriverProxy:
         @type text: unicode
         @param name: Name to associate with the utterance
         @type name: str
+        @return: Handle of the queued utterance
+        @rtype: L{utterance.Utterance}
+        """
+        utterance = Utterance(self, text, name)
+        self._push(self._save_to_file, (text, filename), name, utterance)
+        return utterance
+
+    def _save_to_file(self, text, filename) -> None:
+        """Hands the driver cached audio if there is some, or the text to synthesize."""
+        self._awaitAhead()
+        # the file is saved with the values set through the engine
+        self._overrideProperties({})
+        audio = self._cachedAudio(text)
+        if self.output_format is not None and hasattr(self._driver, "save_audio_to_file"):
+            if audio is None:
+                # the driver converts the audio as it streams it to the file
+                self._driver.save_to_file(text, filename, self.output_format)
+            else:
+                convert = functools.partial(self._convertedAudio, audio, self.output_format)
+                self._driver.save_audio_to_file(convert, filename)
+        elif audio is None:
+            self._driver.save_to_file(text, filename)
+        else:
+            self._driver.save_audio_to_file(audio, filename)
+
+    def _cachedAudio(self, text):
+        """
+        @return: Cached audio for a queued utterance, a callable stitching it
+            together from cached sentences, or None when it must be synthesized
+        """
+        sentences = self._sentences(text)
+        if sentences is not None:
+            self._pendingKey = None
+            return functools.partial(self._stitchSentences, sentences)
+        self._pendingKey, audio = self._cacheLookup(text)
+        return audio
+
+    def _convertedAudio(self, audio, audio_format):
+        """
+        Converts cached audio for a saved utterance.
+
+        @param audio: Cached audio, or a callable returning it
+        @type audio: L{audio.AudioBuffer}
+        @param audio_format: Format to convert to
+        @type audio_format: L{audio.AudioFormat}
+        @rtype: L{audio.AudioBuffer}
+        """
+        if callable(audio):
+            audio = audio()
+        return audio.convert(audio_format)
+
+    def _nativeFormat(self):
+        """
+        @return: Format of the audio the driver synthesizes to memory
+        @rtype: L{audio.AudioFormat}
+        """
+        return AudioFormat(self._driver.getProperty("sample_rate"))
+
+    def audioFormat(self):
+        """
+        Called by the engine for the format of the audio it returns or saves.
+
+        @return: The L{output_format}, or the driver's own format
+        @rtype: L{audio.AudioFormat}
+        @raise NotImplementedError: When the driver cannot synthesize to memory
+        """
+        if self.output_format is not None:
+            return self.output_format
+        self._synthesisMethod("synthesize")
+        return self._nativeFormat()
+
+    def _convertingIter(self, chunks):
+        """Converts chunks of PCM in the driver's format to the L{output_format}."""
+        converter = FormatConverter(self._nativeFormat(), self.output_format)
+        try:
+            for chunk in chunks:
+                converted = converter.convert(chunk)
+                if converted:
+                    yield converted
+            converted = converter.flush()
+            if converted:
+                yield converted
+        finally:
+            # closing early abandons the synthesis, as for the driver's stream
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+
+    def _cacheLookup(self, text):
+        """
+        Looks up audio for text as the driver would currently synthesize it.
+        Caching requires a driver that can play back and save given audio.
+
+        @return: Cache key, or None when caching is off, and the cached audio
+            or None
+        @rtype: tuple
+        """
+        if self.cache is None or not hasattr(self._driver, "play"):
+            return None, None
+        names = ("voice", "rate", "volume", "pitch", "version")
+        settings = [self._driver.getProperty(name) for name in names]
+        key = self.cache.key(self._module.__name__, text, *settings)
+        return key, self.cache.get(key)
+
+    def _sentences(self, text):
+        """
+        @return: Sentences of text when it is cached per sentence, otherwise None
+        @rtype: list
+        """
+        if self.cache is None or not self.cache.sentences or not hasattr(self._driver, "play"):
+            return None
+        sentences = split_sentences(text)
+        return sentences if len(sentences) > 1 else None
+
+    def _stitchSentences(self, sentences):
+        """
+        Joins the audio of consecutive sentences, synthesizing only those
+        missing from the cache. Each sentence is synthesized with espeak's
+        end-of-text pause, which matches the pause between sentences of a
+        single synthesis, so the audio can simply be concatenated.
+
+        @rtype: L{audio.AudioBuffer}
         """
-        self._push(self._driver.save_to_file, (text, filename), name)
+        audio = AudioBuffer(sample_rate=self._driver.getProperty("sample_rate"))
+        for sentence in sentences:
+            key, part = self._cacheLookup(sentence)
+            if part is None:
+                part = self._driver.synthesize(sentence)
+                self.cache.put(key, part)
+            audio.append(part.as_memoryview())
+        return audio
+
+    def _sentenceChunks(self, sentences):
+        """Streaming counterpart of L{_stitchSentences}."""
+        for sentence in sentences:
+            key, part = self._cacheLookup(sentence)
+            if part is None:
+                yield from self._cachingIter(key, self._driver.synthesize_iter(sentence))
+            else:
+                yield bytes(part)
+
+    def wantsAudio(self) -> bool:
+        """
+        Called by the driver before synthesizing a say or save_to_file
+        command, to learn whether to keep the complete audio for
+        L{synthesized} even when it streams it elsewhere, such as to a file.
+
+        @return: True when the audio would be cached
+        @rtype: bool
+        """
+        return self._pendingKey is not None
+
+    def synthesized(self, audio) -> None:
+        """
+        Called by the driver with the complete audio it synthesized for a say
+        or save_to_file command so it can be cached.
+
+        @param audio: Synthesized audio
+        @type audio: L{audio.AudioBuffer}
+        """
+        key, self._pendingKey = self._pendingKey, None
+        if key is not None and self.cache is not None:
+            self.cache.put(key, audio)
+
+    def synthesize_iter(self, text):
+        """
+        Called by the engine to synthesize text straight to PCM chunks. Runs
+        immediately instead of going through the command queue.
+
+        @param text: Text to synthesize
+        @type text: unicode
+        @return: Iterator of raw PCM chunks
+        @rtype: iterator
+        @raise NotImplementedError: When the driver cannot synthesize to memory
+        """
+        with self._lock:
+            self._overrideProperties({})
+        chunks = self._synthesizeChunks(text)
+        if self.output_format is None:
+            return chunks
+        return self._convertingIter(chunks)
+
+    def _synthesizeChunks(self, text):
+        """L{synthesize_iter} in the driver's own format."""
+        synthesize_iter = self._synthesisMethod("synthesize_iter")
+        sentences = self._sentences(text)
+        if sentences is not None:
+            chunks = self._sentenceChunks(sentences)
+            # start synthesizing now so a busy driver is reported by this call
+            return itertools.chain([next(chunks, b"")], chunks)
+        key, audio = self._cacheLookup(text)
+        if audio is not None:
+            return iter((bytes(audio),))
+        if key is None:
+            return synthesize_iter(text)
+        return self._cachingIter(key, synthesize_iter(text))
+
+    def _cachingIter(self, key, chunks):
+        """Passes chunks through and caches them once the stream is complete."""
+        audio = AudioBuffer(sample_rate=self._driver.getProperty("sample_rate"))
+        for chunk in chunks:
+            audio.append(chunk)
+            yield chunk
+        self.cache.put(key, audio)
+
+    def synthesize(self, text, properties=None):
+        """
+        Called by the engine to synthesize text into an in-memory buffer. Runs
+        immediately instead of going through the command queue.
+
+        @param text: Text to synthesize
+        @type text: unicode
+        @param properties: Property values to synthesize with instead of
+            those set through the engine, as for an utterance
+        @type properties: dict
+        @return: Synthesized audio
+        @rtype: L{audio.AudioBuffer}
+        @raise NotImplementedError: When the driver cannot synthesize to memory
+        """
+        synthesize = self._synthesisMethod("synthesize")
+        with self._lock:
+            # also restores the values the last utterance overrode
+            self._overrideProperties(properties or {})
+        sentences = self._sentences(text)
+        if sentences is not None:
+            audio = self._stitchSentences(sentences)
+        else:
+            key, audio = self._cacheLookup(text)
+            if audio is not None:
+                audio = audio.copy()
+            else:
+                audio = synthesize(text)
+                if key is not None:
+                    self.cache.put(key, audio)
+        if self.output_format is None:
+            return audio
+        return audio.convert(self.output_format)
+
+    def _synthesisMethod(self, name):
+        """
+        Looks up an optional in-memory synthesis method on the driver.
+
+        @param name: Name of the driver method
+        @type name: str
+        @raise NotImplementedError: When the driver does not implement it
+        """
+        try:
+            return getattr(self._driver, name)
+        except AttributeError:
+            msg = f"{self._module.__name__} does not support in-memory synthesis"
+            raise NotImplementedError(msg)
 
     def getProperty(self, name):
         """
-        Called by the engine to get a driver property value.
+        Called by the engine to get a driver property value. A value an
+        utterance overrode is reported as set through the engine.
 
         @param name: Name of the property
         @type name: str
         @return: Property value
         @rtype: object
         """
+        overridden = self._overridden
+        if name in overridden:
+            return overridden[name]
         return self._driver.getProperty(name)
 
+    def _voiceRegistry(self):
+        """
+        @return: The driver's catalogue of voices, or one built from its voices
+            property when the driver has none
+        @rtype: L{voice.VoiceRegistry}
+        """
+        voices = getattr(self._driver, "voices", None)
+        if voices is not None:
+            return voices
+        if self._voices is None:
+            self._voices = VoiceRegistry(lambda: self._driver.getProperty("voices"))
+        return self._voices
+
+    def findVoices(self, language=None, gender=None, age=None):
+        """
+        Called by the engine to look up voices. Runs immediately instead of
+        going through the command queue.
+
+        @return: Voices matching all the given criteria
+        @rtype: list
+        """
+        return self._voiceRegistry().find(language, gender, age)
+
+    def invalidateVoices(self) -> None:
+        """Called by the engine to list the driver's voices again on next use."""
+        self._voiceRegistry().invalidate()
+
     def setProperty(self, name, value) -> None:
         """
         Called by the engine to set a driver property value.
@@ -173,27 +1334,131 @@ class DriverProxy:
         @param value: Property value
         @type value: object
         """
-        self._push(self._driver.setProperty, (name, value))
+        self.setProperties({name: value})
+
+    def setProperties(self, properties) -> None:
+        """
+        Called by the engine to set several driver property values in one
+        command. Property values queued right after each other are merged
+        into the same command, the last value of each property winning.
+
+        @param properties: Property values by name
+        @type properties: dict
+        """
+        with self._lock:
+            tail = self._tail
+            if tail is not None and tail[0] == self._setProperties:
+                queued = tail[1][0]
+                for name, value in properties.items():
+                    # keep the order of the last sets, which may matter when
+                    # one property resets another
+                    queued.pop(name, None)
+                    queued[name] = value
+                return
+            self._push(self._setProperties, (dict(properties),))
+
+    def _setProperties(self, properties) -> None:
+        """Applies property values set through the engine."""
+        self._awaitAhead()
+        self._applyProperties(properties)
+        # the new values are the ones to restore after an override
+        for name in properties:
+            self._overridden.pop(name, None)
+
+    def _overrideProperties(self, properties) -> None:
+        """
+        Applies the property values of the utterance about to be output over
+        those set through the engine, and restores the values the previous
+        utterance overrode, unless this one overrides them too. Consecutive
+        utterances with the same values do not change the driver's settings.
+
+        @param properties: Property values of the utterance
+        @type properties: dict
+        """
+        overridden = {}
+        for name in properties:
+            if name in self._overridden:
+                overridden[name] = self._overridden[name]
+            else:
+                overridden[name] = self._driver.getProperty(name)
+        values = {name: value for name, value in self._overridden.items() if name not in properties}
+        values.update(properties)
+        # a driver may reset the other properties when the voice changes
+        values = dict(sorted(values.items(), key=lambda item: item[0] != "voice"))
+        self._applyProperties(values)
+        self._overridden = overridden
+
+    def _applyProperties(self, properties) -> None:
+        """
+        Hands the driver the property values that differ from those it was
+        last given. When one fails, the values set before it are restored.
+        """
+        changed = []
+        try:
+            for name, value in properties.items():
+                if name in self._applied and self._applied[name] == value:
+                    continue
+                previous = self._driver.getProperty(name)
+                self._driver.setProperty(name, value)
+                changed.append((name, previous))
+                if name == "voice":
+                    # a driver may reset other properties to the voice's own
+                    self._applied.clear()
+                self._applied[name] = value
+        except Exception:
+            for name, previous in reversed(changed):
+                self._applied.pop(name, None)
+                with contextlib.suppress(Exception):
+                    self._driver.setProperty(name, previous)
+            raise
 
     def runAndWait(self) -> None:
         """
         Called by the engine to start an event loop, process all commands in
         the queue at the start of the loop, and then exit the loop.
         """
-        self._push(self._engine.endLoop, ())
+        # hold the queue until the loop starts pumping it, or an idle proxy
+        # would run the end marker before there is a loop to end
+        with self._lock:
+            self._busy = True
+            self._push(self._endRun, ())
+            self._looper = threading.current_thread()
         self._driver.startLoop()
 
+    def _endRun(self) -> None:
+        """
+        Ends the loop of L{runAndWait} once its commands have run. Unlike
+        L{endLoop}, lets the driver finish outputting audio that is still
+        playing instead of stopping it.
+        """
+        self._engine._inLoop = False
+        self.endLoop(True, stop=False)
+
     def startLoop(self, useDriverLoop) -> None:
         """Called by the engine to start an event loop."""
+        self._looper = threading.current_thread()
         if useDriverLoop:
             self._driver.startLoop()
         else:
             self._iterator = self._driver.iterate()
 
-    def endLoop(self, useDriverLoop) -> None:
-        """Called by the engine to stop an event loop."""
-        self._queue = []
-        self._driver.stop()
+    def endLoop(self, useDriverLoop, stop=True) -> None:
+        """
+        Called by the engine to stop an event loop.
+
+        @param stop: False to let the driver finish its output rather than
+            stopping it
+        @type stop: bool
+        """
+        self._stopAhead()
+        with self._lock:
+            self._cancelAll(self._queue.clear())
+            self._space.notify_all()
+            self._tail = None
+            self._looper = None
+            self._stopAhead()
+        if stop:
+            self._driver.stop()
         if useDriverLoop:
             self._driver.endLoop()
         else:
@@ -205,5 +1470,7 @@ class DriverProxy:
         Called by the engine to iterate driver commands and notifications from
         within an external event loop.
         """
+        # run commands other threads queued while the driver was idle
+        self._pump()
         with contextlib.suppress(StopIteration):
             next(self._iterator)
@@ -1,3 +1,4 @@
+import os
 import time
 from ctypes import (
     CFUNCTYPE,
@@ -17,50 +18,127 @@ from ctypes import (
 )
 
 
-def cfunc(name, dll, result, *args):
-    """Build and apply a ctypes prototype complete with parameter flags."""
-    atypes = []
-    aflags = []
-    for arg in args:
-        atypes.append(arg[1])
-        aflags.append((arg[2], arg[0], *arg[3:]))
-    return CFUNCTYPE(result, *atypes)((name, dll), tuple(aflags))
-
+def cfunc(name, result, *args):
+    """
+    Declare a ctypes prototype complete with parameter flags. It is bound to
+    the library on its first call, so importing this module neither loads
+    the library nor builds any prototype.
+    """
+    return _Function(name, result, args)
+
+
+class _Function:
+    """Function of the espeak library, bound on its first call."""
+
+    def __init__(self, name, result, args) -> None:
+        self.name = name
+        self._result = result
+        self._args = args
+        self._func = None
+
+    def _bind(self):
+        atypes = []
+        aflags = []
+        for arg in self._args:
+            atypes.append(arg[1])
+            aflags.append((arg[2], arg[0], *arg[3:]))
+        prototype = CFUNCTYPE(self._result, *atypes)
+        self._func = prototype((self.name, library()), tuple(aflags))
+        return self._func
+
+    def __call__(self, *args, **kwargs):
+        func = self._func or self._bind()
+        return func(*args, **kwargs)
+
+
+LIBRARY_ENV = "PYTTSX3_ESPEAK_LIBRARY"
+
+# tried after find_library, which does not search these install locations
+# and may miss a library only the dynamic loader knows; bare sonames are
+# found by dlopen through LD_LIBRARY_PATH, the rpath or the loader cache
+_LIBRARY_PATHS = (
+    # macOS paths
+    "/opt/homebrew/lib/libespeak-ng.1.dylib",
+    "/usr/local/lib/libespeak-ng.1.dylib",
+    "/usr/local/lib/libespeak.dylib",
+    # Linux paths
+    "libespeak-ng.so.1",
+    "/usr/local/lib/libespeak-ng.so.1",
+    "libespeak.so.1",
+    # Windows paths
+    r"C:\Program Files\eSpeak NG\libespeak-ng.dll",
+    r"C:\Program Files (x86)\eSpeak NG\libespeak-ng.dll",
+)
 
 dll = None
+# path the library was loaded by; it is loaded once per process, so the
+# lookup, which runs ldconfig or a compiler, is too
+_path = None
 
 
-def load_library() -> bool:
-    global dll  # noqa: PLW0603
-    paths = (
-        # macOS paths
-        "/opt/homebrew/lib/libespeak-ng.1.dylib",
-        "/usr/local/lib/libespeak-ng.1.dylib",
-        "/usr/local/lib/libespeak.dylib",
-        # Linux paths
-        "libespeak-ng.so.1",
-        "/usr/local/lib/libespeak-ng.so.1",
-        "libespeak.so.1",
-        # Windows paths
-        r"C:\Program Files\eSpeak NG\libespeak-ng.dll",
-        r"C:\Program Files (x86)\eSpeak NG\libespeak-ng.dll",
-    )
+def library_paths():
+    """
+    Lists where to load the espeak library from: only the path in the
+    PYTTSX3_ESPEAK_LIBRARY environment variable if it is set, otherwise
+    espeak-ng and espeak as found by ctypes.util.find_library, then the
+    usual install locations and sonames.
+
+    @return: Paths or names to try loading the library by, in order
+    @rtype: iterator
+    """
+    override = os.environ.get(LIBRARY_ENV)
+    if override:
+        yield override
+        return
+    # ctypes.util imports subprocess, so only pay for it when needed
+    import ctypes.util  # noqa: PLC0415
 
-    for path in paths:
-        try:
-            dll = cdll.LoadLibrary(path)
-            return True
-        except Exception:  # noqa: PERF203
-            continue  # Try the next path
-    return False
+    found = [ctypes.util.find_library(name) for name in ("espeak-ng", "espeak")]
+    found = [path for path in found if path is not None]
+    yield from found
+    yield from (path for path in _LIBRARY_PATHS if path not in found)
 
 
-try:
-    if not load_library():
+def library_path():
+    """
+    @return: Path or name the library was loaded by, or None while it is not
+        loaded
+    @rtype: str
+    """
+    return _path
+
+
+def load_library() -> bool:
+    """
+    Loads the library from the first of L{library_paths} that loads, unless
+    it is loaded already.
+
+    @return: True when the library is loaded
+    @rtype: bool
+    """
+    global dll, _path  # noqa: PLW0603
+    if dll is None:
+        for path in library_paths():
+            try:
+                dll = cdll.LoadLibrary(path)
+            except OSError:
+                continue
+            _path = path
+            break
+    return dll is not None
+
+
+def library():
+    """
+    @return: The espeak library, loaded on first use
+    @rtype: ctypes.CDLL
+    @raise RuntimeError: When the library cannot be loaded
+    """
+    if dll is None and not load_library():
         msg = "This means you probably do not have eSpeak or eSpeak-ng installed!"
         raise RuntimeError(msg)
-except Exception:
-    raise
+    return dll
+
 
 # constants and such from speak_lib.h
 
@@ -102,7 +180,6 @@ EE_NOT_FOUND = 2
 
 Initialize = cfunc(
     "espeak_Initialize",
-    dll,
     c_int,
     ("output", c_int, 1, AUDIO_OUTPUT_PLAYBACK),
     ("bufflength", c_int, 1, 100),
@@ -119,9 +196,7 @@ Initialize.__doc__ = """Must be called before any synthesis functions are called
 
 t_espeak_callback = CFUNCTYPE(c_int, POINTER(c_short), c_int, POINTER(EVENT))
 
-cSetSynthCallback = cfunc(
-    "espeak_SetSynthCallback", dll, None, ("SynthCallback", t_espeak_callback, 1)
-)
+cSetSynthCallback = cfunc("espeak_SetSynthCallback", None, ("SynthCallback", t_espeak_callback, 1))
 SynthCallback = None
 
 
@@ -155,7 +230,7 @@ int SynthCallback(short *wav, int numsamples, espeak_EVENT *events);
 
 t_UriCallback = CFUNCTYPE(c_int, c_int, c_char_p, c_char_p)
 
-cSetUriCallback = cfunc("espeak_SetUriCallback", dll, None, ("UriCallback", t_UriCallback, 1))
+cSetUriCallback = cfunc("espeak_SetUriCallback", None, ("UriCallback", t_UriCallback, 1))
 UriCallback = None
 
 
@@ -224,7 +299,6 @@ def Synth(  # noqa: PLR0913
 
 cSynth = cfunc(
     "espeak_Synth",
-    dll,
     c_int,
     ("text", c_char_p, 1),
     ("size", c_long, 1),
@@ -286,7 +360,6 @@ def Synth_Mark(text, index_mark, end_position=0, flags=CHARS_AUTO) -> None:
 
 cSynth_Mark = cfunc(
     "espeak_Synth_Mark",
-    dll,
     c_int,
     ("text", c_char_p, 1),
     ("size", c_ulong, 1),
@@ -309,7 +382,7 @@ Synth_Mark.__doc__ = """Synthesize speech for the specified text.  Similar to es
              you may try after a while to call the function again.
                 EE_INTERNAL_ERROR."""
 
-Key = cfunc("espeak_Key", dll, c_int, ("key_name", c_char_p, 1))
+Key = cfunc("espeak_Key", c_int, ("key_name", c_char_p, 1))
 Key.__doc__ = """Speak the name of a keyboard key.
    Currently this just speaks the "key_name" as given
 
@@ -318,7 +391,7 @@ Key.__doc__ = """Speak the name of a keyboard key.
              you may try after a while to call the function again.
            EE_INTERNAL_ERROR."""
 
-Char = cfunc("espeak_Char", dll, c_int, ("character", c_wchar, 1))
+Char = cfunc("espeak_Char", c_int, ("character", c_wchar, 1))
 Char.__doc__ = """Speak the name of the given character
 
    Return: EE_OK: operation achieved
@@ -343,7 +416,6 @@ PUNCT_SOME = 2
 
 SetParameter = cfunc(
     "espeak_SetParameter",
-    dll,
     c_int,
     ("parameter", c_int, 1),
     ("value", c_int, 1),
@@ -378,11 +450,13 @@ SetParameter.__doc__ = """Sets the value of the specified parameter.
              you may try after a while to call the function again.
            EE_INTERNAL_ERROR."""
 
-GetParameter = cfunc("espeak_GetParameter", dll, c_int, ("parameter", c_int, 1))
+GetParameter = cfunc(
+    "espeak_GetParameter", c_int, ("parameter", c_int, 1), ("current", c_int, 1, 1)
+)
 GetParameter.__doc__ = """current=0  Returns the default value of the specified parameter.
    current=1  Returns the current value of the specified parameter, as set by SetParameter()"""
 
-SetPunctuationList = cfunc("espeak_SetPunctuationList", dll, c_int, ("punctlist", c_wchar, 1))
+SetPunctuationList = cfunc("espeak_SetPunctuationList", c_int, ("punctlist", c_wchar, 1))
 SetPunctuationList.__doc__ = """Specified a list of punctuation characters whose names are
 to be spoken when the value of the Punctuation parameter is set to "some".
 
@@ -394,7 +468,7 @@ to be spoken when the value of the Punctuation parameter is set to "some".
             EE_INTERNAL_ERROR."""
 
 SetPhonemeTrace = cfunc(
-    "espeak_SetPhonemeTrace", dll, None, ("value", c_int, 1), ("stream", c_void_p, 1)
+    "espeak_SetPhonemeTrace", None, ("value", c_int, 1), ("stream", c_void_p, 1)
 )
 SetPhonemeTrace.__doc__ = """Controls the output of phoneme symbols for the text
    value=0  No phoneme output (default)
@@ -404,7 +478,7 @@ SetPhonemeTrace.__doc__ = """Controls the output of phoneme symbols for the text
    stream   output stream for the phoneme symbols (and trace).  If stream=NULL then it uses stdout."""
 
 CompileDictionary = cfunc(
-    "espeak_CompileDictionary", dll, None, ("path", c_char_p, 1), ("log", c_void_p, 1)
+    "espeak_CompileDictionary", None, ("path", c_char_p, 1), ("log", c_void_p, 1)
 )
 CompileDictionary.__doc__ = """Compile pronunciation dictionary for a language which corresponds to the currently
    selected voice.  The required voice should be selected before calling this function.
@@ -433,9 +507,7 @@ class VOICE(Structure):
         return f"{self.__class__.__name__}({res})"
 
 
-cListVoices = cfunc(
-    "espeak_ListVoices", dll, POINTER(POINTER(VOICE)), ("voice_spec", POINTER(VOICE), 1)
-)
+cListVoices = cfunc("espeak_ListVoices", POINTER(POINTER(VOICE)), ("voice_spec", POINTER(VOICE), 1))
 cListVoices.__doc__ = """Reads the voice files from espeak-data/voices and creates an array of espeak_VOICE pointers.
    The list is terminated by a NULL pointer
 
@@ -461,7 +533,7 @@ def ListVoices(voice_spec=None):
     return res
 
 
-SetVoiceByName = cfunc("espeak_SetVoiceByName", dll, c_int, ("name", c_char_p, 1))
+SetVoiceByName = cfunc("espeak_SetVoiceByName", c_int, ("name", c_char_p, 1))
 SetVoiceByName.__doc__ = """Searches for a voice with a matching "name" field.  Language is not considered.
    "name" is a UTF8 string.
 
@@ -471,7 +543,7 @@ SetVoiceByName.__doc__ = """Searches for a voice with a matching "name" field.
              EE_INTERNAL_ERROR."""
 
 SetVoiceByProperties = cfunc(
-    "espeak_SetVoiceByProperties", dll, c_int, ("voice_spec", POINTER(VOICE), 1)
+    "espeak_SetVoiceByProperties", c_int, ("voice_spec", POINTER(VOICE), 1)
 )
 SetVoiceByProperties.__doc__ = """An espeak_VOICE structure is used to pass criteria to select a voice.  Any of the following
    fields may be set:
@@ -490,13 +562,12 @@ SetVoiceByProperties.__doc__ = """An espeak_VOICE structure is used to pass crit
 
 GetCurrentVoice = cfunc(
     "espeak_GetCurrentVoice",
-    dll,
     POINTER(VOICE),
 )
 GetCurrentVoice.__doc__ = """Returns the espeak_VOICE data for the currently selected voice.
    This is not affected by temporary voice changes caused by SSML elements such as <voice> and <s>"""
 
-Cancel = cfunc("espeak_Cancel", dll, c_int)
+Cancel = cfunc("espeak_Cancel", c_int)
 Cancel.__doc__ = """Stop immediately synthesis and audio output of the current text. When this
    function returns, the audio output is fully stopped and the synthesizer is ready to
    synthesize a new message.
@@ -504,20 +575,20 @@ Cancel.__doc__ = """Stop immediately synthesis and audio output of the current t
    Return:  EE_OK: operation achieved
             EE_INTERNAL_ERROR."""
 
-IsPlaying = cfunc("espeak_IsPlaying", dll, c_int)
+IsPlaying = cfunc("espeak_IsPlaying", c_int)
 IsPlaying.__doc__ = """Returns 1 if audio is played, 0 otherwise."""
 
-Synchronize = cfunc("espeak_Synchronize", dll, c_int)
+Synchronize = cfunc("espeak_Synchronize", c_int)
 Synchronize.__doc__ = """This function returns when all data have been spoken.
    Return:  EE_OK: operation achieved
                 EE_INTERNAL_ERROR."""
 
-Terminate = cfunc("espeak_Terminate", dll, c_int)
+Terminate = cfunc("espeak_Terminate", c_int)
 Terminate.__doc__ = """last function to be called.
    Return:  EE_OK: operation achieved
                 EE_INTERNAL_ERROR."""
 
-Info = cfunc("espeak_Info", dll, c_char_p, ("ptr", c_void_p, 1, 0))
+Info = cfunc("espeak_Info", c_char_p, ("ptr", c_void_p, 1, 0))
 Info.__doc__ = """Returns the version number string.
 The parameter is for future use, and should be set to NULL"""
 
@@ -22,7 +22,7 @@ from AVFoundation import (
 from CoreFoundation import CFRunLoopRunInMode, kCFRunLoopDefaultMode
 from Foundation import NSObject
 
-from pyttsx3.voice import Voice
+from pyttsx3.voice import Voice, VoiceRegistry
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
@@ -61,6 +61,7 @@ class AVSpeechDriver(NSObject):
         instance._volume = 1.0
         instance._queue = []
         instance._should_stop_loop = False
+        instance.voices = VoiceRegistry(instance._listVoices)
         return instance
 
     @objc.python_method
@@ -111,6 +112,9 @@ class AVSpeechDriver(NSObject):
             utterance.setVoice_(self._current_voice)
         utterance.setRate_(self._rate)
         utterance.setVolume_(self._volume)
+        # busy until it finishes, so the proxy hands over one utterance at a
+        # time and reports each to its own handle
+        self._proxy.setBusy(True)
         self._queue.append((self._tts.speakUtterance_, (utterance,)))
         logging.debug("Queued utterance: %s", text)
 
@@ -149,20 +153,25 @@ class AVSpeechDriver(NSObject):
             CFRunLoopRunInMode(kCFRunLoopDefaultMode, 0.01, False)
             yield
 
+    @objc.python_method
+    def _listVoices(self) -> list[Voice]:
+        """List the voices of the synthesizer."""
+        return [
+            Voice(
+                id=voice.identifier(),
+                name=voice.name(),
+                languages=[voice.language()],
+                gender=None,
+                age=None,
+            )
+            for voice in AVSpeechSynthesisVoice.speechVoices()
+        ]
+
     @objc.python_method
     def getProperty(self, name: str) -> str | float | list[Voice]:
         """Get the value of the given property."""
         if name == "voices":
-            return [
-                Voice(
-                    id=voice.identifier(),
-                    name=voice.name(),
-                    languages=[voice.language()],
-                    gender=None,
-                    age=None,
-                )
-                for voice in AVSpeechSynthesisVoice.speechVoices()
-            ]
+            return list(self.voices)
         if name == "voice":
             return self._current_voice.identifier() if self._current_voice else None
         if name == "rate":
@@ -1,7 +1,6 @@
 import contextlib
-import time
 
-from pyttsx3.voice import Voice
+from pyttsx3.voice import Voice, VoiceRegistry
 
 
 def buildDriver(proxy):
@@ -26,6 +25,9 @@ class DummyDriver:
     @type _config: dict
     @ivar _looping: True when in the dummy event loop, False when not
     @ivar _looping: bool
+    @ivar voices: Catalogue of the voices of the engine, which the proxy
+        queries to find voices
+    @type voices: L{voice.VoiceRegistry}
     """
 
     def __init__(self, proxy) -> None:
@@ -47,9 +49,10 @@ class DummyDriver:
         self._config = {
             "rate": 200,
             "volume": 1.0,
-            "voice": voices[0],
+            "voice": voices[0].id,
             "voices": voices,
         }
+        self.voices = VoiceRegistry(lambda: self._config["voices"])
 
     def destroy(self) -> None:
         """
@@ -66,22 +69,22 @@ class DummyDriver:
         @precondition: There was no previous successful call to L{startLoop}
             without an intervening call to L{stopLoop}.
         """
-        first = True
         self._looping = True
+        self._proxy.setBusy(False)
         while self._looping:
-            if first:
-                self._proxy.setBusy(False)
-                first = False
-            time.sleep(0.5)
+            # block until a command is queued, the busy state changes or the
+            # synthesizer reports an event through the proxy
+            self._proxy.waitForWake()
 
     def endLoop(self) -> None:
         """
         Stops a previously started run loop.
 
         @precondition: A previous call to L{startLoop} succeeded and there was
-            no intervening call to L{endLoop}.
+            no intervening call to L{endLoop}. May be called from any thread.
         """
         self._looping = False
+        self._proxy.wake()
 
     def iterate(self):
         """Iterates from within an external run loop."""
@@ -164,8 +167,10 @@ class DummyDriver:
         @raise ValueError: When the value cannot be coerced to fit the property
         """
         if name == "voice":
-            v = filter(lambda v: v.id == value, self._config["voices"])
-            self._config["voice"] = v[0]
+            if self.voices.get(value) is None:
+                msg = f"unknown voice id {value}"
+                raise ValueError(msg)
+            self._config["voice"] = value
         elif name == "rate":
             self._config["rate"] = value
         elif name == "volume":
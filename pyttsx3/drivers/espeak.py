@@ -1,16 +1,13 @@
+import collections
 import ctypes
 import logging
-import os
-import platform
-import subprocess
+import queue
+import threading
 import time
-import wave
-from tempfile import NamedTemporaryFile
 
-if platform.system() == "Windows":
-    import winsound
-
-from pyttsx3.voice import Voice
+from pyttsx3.audio import AudioBuffer, AudioFormat, WavWriter
+from pyttsx3.playback import QueuedSink, default_sink
+from pyttsx3.voice import Voice, VoiceRegistry
 
 from . import _espeak
 
@@ -20,41 +17,120 @@ def buildDriver(proxy):
     return EspeakDriver(proxy)
 
 
+class _PCMStream:
+    """
+    Iterator over the PCM chunks of one synthesize_iter() call. Closing it, or
+    dropping it, before the end lets the synth callback abort the synthesis.
+    """
+
+    def __init__(self, chunks, aborted) -> None:
+        self._chunks = chunks
+        # this stream's own flag, so closing it after its synthesis ended
+        # leaves the next one alone
+        self._aborted = aborted
+        self._finished = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        if self._finished:
+            raise StopIteration
+        chunk = self._chunks.get()
+        if chunk is None:
+            self._finished = True
+            raise StopIteration
+        return chunk
+
+    def close(self) -> None:
+        if not self._finished:
+            # let the callback run to EVENT_MSG_TERMINATED without data
+            self._aborted.set()
+            while self._chunks.get() is not None:
+                pass
+            self._finished = True
+
+    def __del__(self) -> None:
+        self.close()
+
+
 # noinspection PyPep8Naming
 class EspeakDriver:
     _moduleInitialized = False
     _defaultVoice = ""
+    _sampleRate = 22050
+    _callbackOwner = None
 
     def __init__(self, proxy):
         if not EspeakDriver._moduleInitialized:
-            # espeak cannot initialize more than once per process and has
-            # issues when terminating from python (assert error on close)
-            # so just keep it alive and init once
-            rate = _espeak.Initialize(_espeak.AUDIO_OUTPUT_RETRIEVAL, 1000)
-            if rate == -1:
-                msg = "could not initialize espeak"
-                raise RuntimeError(msg)
-            current_voice = _espeak.GetCurrentVoice()
-            if current_voice and current_voice.contents.name:
-                EspeakDriver._defaultVoice = current_voice.contents.name.decode("utf-8")
-            else:
-                # Fallback to a known default if no voice is set
-                EspeakDriver._defaultVoice = "gmw/en"  # Adjust this as needed
-            EspeakDriver._moduleInitialized = True
+            EspeakDriver._initModule()
         self._proxy = proxy
         self._looping = False
         self._stopping = False
         self._speaking = False
+        # held to start a synthesis, so the loop and synthesize_iter() on
+        # another thread never both start one; notified when espeak ends a
+        # synthesis played or saved by the loop
+        self._synthEnded = threading.Condition()
         self._text_to_say = None
-        self._data_buffer = b""
+        self._data_buffer = AudioBuffer(sample_rate=EspeakDriver._sampleRate)
         self._numerise_buffer = []
         self._save_file = None
+        self._save_format = None
+        self._writer = None
+        # the audio streamed to the writer is also kept, for the cache
+        self._teeFile = False
+        self._stream = None
+        self._stream_aborted = threading.Event()
+        self._sink = default_sink()
+        # playback runs on its own thread, never in the synth callback
+        self._output = QueuedSink(self._sink)
+        self._streaming = False
+        self._jitterBuffer = 0.2
+        self._sinkStarted = False
+        self._cached_audio = None
+        self._parameters = {}
+        self._pending = False
+        self._finished = False
+        self._samples = 0
+        self._outputting = False
+        # audio was queued for the output thread since it was last drained
+        self._playing = False
+        # utterances the output thread finished playing, for the loop to report
+        self._playedOut = collections.deque()
+        self._aborting = False
+        self._preempting = False
+        self._words = 0
+        self._cutAt = None
+        self._resumeAt = 0
+        self._prefix = None
+        self._synthStart = 0
+        self.voices = VoiceRegistry(self._listVoices)
 
         _espeak.SetSynthCallback(self._onSynth)
+        EspeakDriver._callbackOwner = self
         self.setProperty("voice", EspeakDriver._defaultVoice)
         self.setProperty("rate", 200)
         self.setProperty("volume", 1.0)
 
+    @staticmethod
+    def _initModule():
+        # espeak cannot initialize more than once per process and has
+        # issues when terminating from python (assert error on close)
+        # so just keep it alive and init once
+        rate = _espeak.Initialize(_espeak.AUDIO_OUTPUT_RETRIEVAL, 1000)
+        if rate == -1:
+            msg = "could not initialize espeak"
+            raise RuntimeError(msg)
+        EspeakDriver._sampleRate = rate
+        current_voice = _espeak.GetCurrentVoice()
+        if current_voice and current_voice.contents.name:
+            EspeakDriver._defaultVoice = current_voice.contents.name.decode("utf-8")
+        else:
+            # Fallback to a known default if no voice is set
+            EspeakDriver._defaultVoice = "gmw/en"  # Adjust this as needed
+        EspeakDriver._moduleInitialized = True
+
     def numerise(self, data):
         self._numerise_buffer.append(data)
         return ctypes.c_void_p(len(self._numerise_buffer))
@@ -62,56 +138,101 @@ class EspeakDriver:
     def decode_numeric(self, data):
         return self._numerise_buffer[int(data) - 1]
 
-    @staticmethod
-    def destroy():
-        _espeak.SetSynthCallback(None)
+    def destroy(self):
+        if self._speaking:
+            # a stopped synthesis may still be winding down; its callback
+            # must not outlive the proxy
+            _espeak.Cancel()
+        # the callback is process-wide; leave a newer driver's callback alone
+        if EspeakDriver._callbackOwner is self:
+            _espeak.SetSynthCallback(None)
+            EspeakDriver._callbackOwner = None
+        self._output.close()
 
     def stop(self):
-        if _espeak.IsPlaying():
+        active = self._speaking or self._pending or self._outputting
+        if active:
+            # set before touching the sink, see _play()
             self._stopping = True
-            _espeak.Cancel()
+        if self._outputting or self._playing or (self._speaking and self._sinkStarted):
+            # silence playback now instead of when the loop gets to it, also
+            # of earlier utterances that are still playing, which are then
+            # reported incomplete
+            self._playing = False
+            self._output.abort()
+        if active:
+            self._proxy.wake()
+
+    def preempt(self):
+        """
+        Cuts the utterance being spoken short at the next word the synth
+        callback sees. The audio before that word which has not reached the
+        sink is handed to the proxy instead of being played. Files being saved
+        and audio that is already synthesized are not preempted.
+        """
+        if (self._speaking or self._pending) and self._save_file is None:
+            self._preempting = True
 
     @staticmethod
-    def getProperty(name: str):
-        if name == "voices":
-            voices = []
-            for v in _espeak.ListVoices(None):
-                # Use identifier as the unique ID
-                voice_id = v.identifier.decode(
-                    "utf-8"
-                ).lower()  # Identifier corresponds to the "File" in espeak --voices
-                kwargs = {
-                    "id": voice_id,  # Use "identifier" as the ID
-                    "name": v.name.decode("utf-8"),  # Nice name
-                }
-                if v.languages:
-                    try:
-                        language_code_bytes = v.languages[1:]
-                        language_code = language_code_bytes.decode("utf-8", errors="ignore")
-                        kwargs["languages"] = [language_code]
-                    except UnicodeDecodeError:
-                        kwargs["languages"] = ["Unknown"]
-                genders = [None, "Male", "Female"]
-                kwargs["gender"] = genders[v.gender]
-                kwargs["age"] = v.age or None
-                voices.append(Voice(**kwargs))
-            return voices
-        if name == "voice":
-            voice = _espeak.GetCurrentVoice()
-            if voice and voice.contents.name:
-                return voice.contents.identifier.decode("utf-8").lower()
-            return None
-        if name == "rate":
-            return _espeak.GetParameter(_espeak.RATE)
-        if name == "volume":
-            return _espeak.GetParameter(_espeak.VOLUME) / 100.0
-        if name == "pitch":
-            return _espeak.GetParameter(_espeak.PITCH)
-        msg = f"unknown property {name}"
-        raise KeyError(msg)
+    def _listVoices():
+        voices = []
+        for v in _espeak.ListVoices(None):
+            # Use identifier as the unique ID
+            voice_id = v.identifier.decode(
+                "utf-8"
+            ).lower()  # Identifier corresponds to the "File" in espeak --voices
+            kwargs = {
+                "id": voice_id,  # Use "identifier" as the ID
+                "name": v.name.decode("utf-8"),  # Nice name
+            }
+            if v.languages:
+                try:
+                    language_code_bytes = v.languages[1:]
+                    language_code = language_code_bytes.decode("utf-8", errors="ignore")
+                    kwargs["languages"] = [language_code]
+                except UnicodeDecodeError:
+                    kwargs["languages"] = ["Unknown"]
+            genders = [None, "Male", "Female"]
+            kwargs["gender"] = genders[v.gender]
+            kwargs["age"] = v.age or None
+            voices.append(Voice(**kwargs))
+        return voices
 
     @staticmethod
-    def setProperty(name: str, value):  # noqa: C901,PLR0912
+    def _currentVoice():
+        voice = _espeak.GetCurrentVoice()
+        if voice and voice.contents.name:
+            return voice.contents.identifier.decode("utf-8").lower()
+        return None
+
+    def _getParameter(self, name, parameter):
+        # espeak applies SetParameter on its synthesis thread, so GetParameter
+        # can lag behind; report the value last set when there is one
+        if name in self._parameters:
+            return self._parameters[name]
+        return _espeak.GetParameter(parameter)
+
+    def getProperty(self, name: str):
+        getters = {
+            "voices": lambda: list(self.voices),
+            "voice": self._currentVoice,
+            "rate": lambda: self._getParameter("rate", _espeak.RATE),
+            "volume": lambda: self._getParameter("volume", _espeak.VOLUME) / 100.0,
+            "pitch": lambda: self._getParameter("pitch", _espeak.PITCH),
+            "sample_rate": lambda: EspeakDriver._sampleRate,
+            "version": lambda: _espeak.Info(None).decode("utf-8"),
+            "sink": lambda: self._sink,
+            "streaming": lambda: self._streaming,
+            "jitter_buffer": lambda: self._jitterBuffer,
+        }
+        try:
+            getter = getters[name]
+        except KeyError:
+            msg = f"unknown property {name}"
+            raise KeyError(msg)
+        return getter()
+
+    def setProperty(self, name: str, value):  # noqa: C901,PLR0912,PLR0915
         if name == "voice":
             if value is None:
                 return
@@ -141,146 +262,568 @@ class EspeakDriver:
                 _espeak.SetParameter(_espeak.RATE, value, 0)
             except ctypes.ArgumentError as e:
                 raise ValueError(str(e))
+            self._parameters["rate"] = value
         elif name == "volume":
             try:
-                _espeak.SetParameter(_espeak.VOLUME, int(round(value * 100, 2)), 0)
+                volume = int(round(value * 100, 2))
             except TypeError as e:
                 raise ValueError(str(e))
+            _espeak.SetParameter(_espeak.VOLUME, volume, 0)
+            self._parameters["volume"] = volume
         elif name == "pitch":
             try:
-                _espeak.SetParameter(_espeak.PITCH, int(value), 0)
+                pitch = int(value)
+            except TypeError as e:
+                raise ValueError(str(e))
+            _espeak.SetParameter(_espeak.PITCH, pitch, 0)
+            self._parameters["pitch"] = pitch
+        elif name == "sink":
+            self._output.close()
+            self._sink = value
+            self._output = QueuedSink(value)
+        elif name == "streaming":
+            self._streaming = bool(value)
+        elif name == "jitter_buffer":
+            try:
+                self._jitterBuffer = max(0.0, float(value))
             except TypeError as e:
                 raise ValueError(str(e))
         else:
             msg = f"unknown property {name}"
             raise KeyError(msg)
 
-    def save_to_file(self, text, filename):
+    def save_to_file(self, text, filename, audio_format=None):
         """
-        Save the synthesized speech to the specified filename.
+        Save the synthesized speech to the specified filename, converted to
+        audio_format as it is streamed to the file when it is given.
         """
         self._save_file = filename
+        self._save_format = audio_format
         self._text_to_say = text
+        self._cached_audio = None
+        self._queueUtterance()
 
-    def _start_synthesis(self, text):
+    def play(self, audio):
+        """
+        Outputs already synthesized audio like say() does, without running
+        espeak. Used by the proxy to serve cached utterances. The audio may
+        also be a callable returning it, which is called when the utterance
+        is due and may synthesize with synthesize().
+        """
+        self._save_file = None
+        self._cached_audio = audio
+        self._queueUtterance()
+
+    def save_audio_to_file(self, audio, filename):
+        """
+        Saves already synthesized audio like save_to_file() does, without
+        running espeak. Used by the proxy to serve cached utterances.
+        """
+        self._save_file = filename
+        self._cached_audio = audio
+        self._queueUtterance()
+
+    def _queueUtterance(self):
+        """
+        Leaves the utterance for the driver loop to start, so commands never
+        start synthesis on the thread that queued them.
+        """
+        self._pending = True
+        self._stopping = False
+        # the proxy requests preemption under its lock, which it holds while
+        # queuing, so a late request cannot leak into the next utterance
+        self._preempting = False
+        self._resumeAt = 0
+        self._prefix = None
         self._proxy.setBusy(True)
+
+    def _writeOutput(self, audio):
+        """Saves or plays the complete audio of an utterance."""
+        if self._save_file:
+            try:
+                audio.write_wav(self._save_file)
+                print(f"Audio saved to {self._save_file}")
+            except Exception as e:
+                msg = f"Error saving WAV file: {e}"
+                raise RuntimeError(msg)
+        else:
+            # Playback functionality (for say method). Not drained here, so
+            # the loop synthesizes the next utterance while this one plays.
+            self._outputting = True
+            try:
+                self._play(audio)
+            except Exception as e:
+                print(f"Playback error: {e}")
+            finally:
+                self._outputting = False
+
+    def _drainOutput(self):
+        """Waits for the queued audio to be played when the loop ends, and reports it."""
+        if self._playing:
+            self._playing = False
+            try:
+                self._output.drain()
+            except Exception as e:
+                print(f"Playback error: {e}")
+        self._reportPlayed()
+
+    def _onPlayed(self, finish, completed):
+        """Runs on the output thread; leaves reporting the utterance to the loop."""
+        self._playedOut.append((finish, completed))
+        self._proxy.wake()
+
+    def _reportPlayed(self):
+        """Reports the utterances the output thread played, or discarded, since the last step."""
+        while self._playedOut:
+            finish, completed = self._playedOut.popleft()
+            finish(completed)
+
+    def _play(self, audio):
+        """
+        Queues audio for the output thread unless the utterance was stopped.
+        stop() sets _stopping before aborting the output, so a write racing
+        with it is aborted again here instead of restarting playback.
+        """
+        if self._stopping:
+            return
+        self._playing = True
+        self._output.play(audio)
+        if self._stopping:
+            self._output.abort()
+
+    def _endOutput(self):
+        """
+        Reports the end of an output utterance, incomplete if stop() cut its
+        playback. Audio queued for the output thread is reported by the loop
+        once it has been played, while the loop goes on to the next utterance.
+        """
+        completed = not self._stopping
+        self._stopping = False
+        if completed and self._playing and not self._save_file:
+            finish = self._proxy.detachUtterance()
+            self._output.when_played(lambda completed: self._onPlayed(finish, completed))
+        else:
+            self._proxy.notify("finished-utterance", completed=completed)
+        self._proxy.setBusy(False)
+
+    def _startUtterance(self):
+        """Starts the pending utterance unless a started-utterance callback stopped it."""
+        synthesizing = self._cached_audio is None
+        if synthesizing and not self._reserve():
+            # synthesize_iter() took espeak first; its end wakes the loop
+            return
+        # still pending while notifying, so stop() from a callback is honoured
         self._proxy.notify("started-utterance")
-        self._speaking = True
-        self._data_buffer = b""  # Ensure buffer is cleared before starting
+        self._pending = False
+        if self._stopping:
+            if synthesizing:
+                self._release()
+            self._stopping = False
+            self._cached_audio = None
+            self._proxy.notify("finished-utterance", completed=False)
+            self._proxy.setBusy(False)
+        elif self._cached_audio is not None:
+            self._outputCachedAudio()
+        else:
+            self._start_synthesis(self._text_to_say)
+
+    def _outputCachedAudio(self):
+        audio, self._cached_audio = self._cached_audio, None
+        if callable(audio):
+            # the audio may be synthesized on another thread meanwhile; waiting
+            # for it counts as output, so stop() applies
+            self._outputting = True
+            try:
+                audio = audio()
+            except Exception as e:
+                self._outputting = False
+                self._proxy.notify("error", exception=e)
+                self._proxy.setBusy(False)
+                raise
+        self._writeOutput(audio)
+        self._proxy.reportAudio(audio.frames, audio.sample_rate)
+        self._endOutput()
+
+    def _finishUtterance(self):
+        """Outputs a completed synthesis. Runs on the loop, not in the callback."""
+        if self._writer is not None:
+            self._finishFile()
+            return
+        # Streaming playback has already consumed part of the buffer, so only
+        # complete audio is offered to the proxy's cache
+        if not self._sinkStarted:
+            self._proxy.synthesized(self._data_buffer)
+        self._writeOutput(self._data_buffer)
+        self._data_buffer.clear()
+        self._proxy.reportAudio(self._samples, EspeakDriver._sampleRate)
+        self._endOutput()
+
+    def _finishFile(self):
+        """Completes a file the synthesis was streamed to."""
+        writer, self._writer = self._writer, None
+        tee, self._teeFile = self._teeFile, False
         try:
-            _espeak.Synth(str(text).encode("utf-8"), flags=_espeak.ENDPAUSE | _espeak.CHARS_UTF8)
+            writer.close()
         except Exception as e:
+            # runs on the loop, which must go on to the next utterance
+            msg = f"Error saving WAV file: {e}"
+            self._proxy.notify("error", exception=RuntimeError(msg))
             self._proxy.setBusy(False)
+            return
+        print(f"Audio saved to {writer.filename}")
+        if tee:
+            self._proxy.synthesized(self._data_buffer)
+            self._data_buffer.clear()
+        self._proxy.reportAudio(self._samples, EspeakDriver._sampleRate)
+        self._endOutput()
+
+    def _abortFile(self):
+        """Removes the partial file of a stopped synthesis."""
+        writer, self._writer = self._writer, None
+        self._teeFile = False
+        if writer is not None:
+            writer.abort()
+
+    def _finishPreempted(self):
+        """Ends an utterance cut short by preempt(), offering the proxy its unplayed audio."""
+        word, self._cutAt = self._cutAt, None
+        audio = None
+        if self._sinkStarted:
+            # streaming playback has the audio up to the cut already
+            self._writeOutput(self._data_buffer)
+            self._proxy.reportAudio(self._samples, EspeakDriver._sampleRate)
+        else:
+            audio = self._data_buffer.copy()
+        self._data_buffer.clear()
+        self._proxy.preempted(word, audio)
+        self._stopping = False
+        self._proxy.notify("finished-utterance", completed=False)
+        self._proxy.setBusy(False)
+
+    def _reserve(self):
+        """
+        Claims espeak for the loop unless a synthesis is running.
+
+        @return: False when espeak is busy
+        """
+        with self._synthEnded:
+            if self._speaking:
+                return False
+            self._speaking = True
+            return True
+
+    def _release(self):
+        """Gives up espeak without having started a synthesis."""
+        with self._synthEnded:
+            self._speaking = False
+            self._synthEnded.notify_all()
+
+    def _start_synthesis(self, text):
+        """Synthesizes text once L{_reserve} has claimed espeak."""
+        self._data_buffer.clear()  # Ensure buffer is cleared before starting
+        if self._prefix is not None:
+            # a resumed utterance is played after the audio of its first words
+            self._data_buffer.append(self._prefix.as_memoryview())
+            self._prefix = None
+        self._samples = self._synthStart = self._data_buffer.frames
+        self._words = max(self._resumeAt - 1, 0)
+        self._cutAt = None
+        self._sinkStarted = False
+        try:
+            if self._save_file:
+                # frames go to disk as they are synthesized, not at the end
+                audio_format = AudioFormat(EspeakDriver._sampleRate)
+                self._writer = WavWriter(
+                    self._save_file, self._save_format or audio_format, source=audio_format
+                )
+                self._teeFile = self._proxy.wantsAudio()
+            _espeak.Synth(
+                str(text).encode("utf-8"),
+                position=self._resumeAt,
+                position_type=_espeak.POS_WORD,
+                flags=_espeak.ENDPAUSE | _espeak.CHARS_UTF8,
+            )
+        except Exception as e:
+            self._release()
+            self._abortFile()
             self._proxy.notify("error", exception=e)
+            self._proxy.setBusy(False)
             raise
 
-    def _onSynth(self, wav, numsamples, events):  # noqa: C901,PLR0912,PLR0915
+    def synthesize_iter(self, text, max_chunks=8):
         """
-        TODO: Refactor this function because it is too complex by several measures.
+        Synthesizes text and yields the raw 16-bit mono PCM as espeak hands
+        each buffer to the synth callback. Nothing is played or saved and no
+        notifications are sent.
+
+        At most max_chunks buffers are held ahead of the consumer; after that
+        espeak waits for the consumer. Closing the generator early aborts the
+        synthesis.
+        """
+        # a stopped synthesis ends at its next callback, so wait for it
+        # rather than failing a synthesis right after a stop
+        with self._synthEnded:
+            self._synthEnded.wait_for(lambda: not self._windingDown(), timeout=1.0)
+            if self._speaking:
+                msg = "espeak is busy with another utterance"
+                raise RuntimeError(msg)
+            chunks = queue.Queue(maxsize=max_chunks)
+            self._stream = chunks
+            self._stream_aborted = threading.Event()
+            self._speaking = True
+        try:
+            _espeak.Synth(str(text).encode("utf-8"), flags=_espeak.ENDPAUSE | _espeak.CHARS_UTF8)
+        except Exception:
+            with self._synthEnded:
+                self._stream = None
+                self._speaking = False
+            raise
+        return _PCMStream(chunks, self._stream_aborted)
+
+    def synthesize(self, text):
+        """
+        Synthesizes text into an in-memory L{AudioBuffer} without touching
+        the filesystem or the audio device.
+        """
+        audio = AudioBuffer(sample_rate=EspeakDriver._sampleRate)
+        for chunk in self.synthesize_iter(text, max_chunks=0):
+            audio.append(chunk)
+        return audio
+
+    def _onStreamSynth(self, wav, numsamples, events):
+        stream, aborted = self._stream, self._stream_aborted
+        if numsamples > 0 and not aborted.is_set():
+            stream.put(ctypes.string_at(wav, numsamples * ctypes.sizeof(ctypes.c_short)))
+        i = 0
+        while events[i].type != _espeak.EVENT_LIST_TERMINATED:
+            if events[i].type == _espeak.EVENT_MSG_TERMINATED:
+                self._stream = None
+                self._speaking = False
+                stream.put(None)
+                # the loop may hold an utterance back until espeak is free
+                self._proxy.wake()
+                return 0
+            i += 1
+        return 1 if aborted.is_set() else 0
+
+    def _onSynth(self, wav, numsamples, events):
+        """
+        Runs on espeak's thread. Only collects audio and sends word events;
+        the finished utterance is handed to the driver loop, which must not be
+        re-entered from here.
         """
         if not self._speaking:
             return 0
-
+        if self._stream is not None:
+            return self._onStreamSynth(wav, numsamples, events)
         # Process each event in the current callback
+        terminated = False
+        keep = numsamples if self._cutAt is None else 0
         i = 0
         while True:
             event = events[i]
             if event.type == _espeak.EVENT_LIST_TERMINATED:
                 break
             if event.type == _espeak.EVENT_WORD:
-                if self._text_to_say:
-                    start_index = event.text_position - 1
-                    end_index = start_index + event.length
-                    word = self._text_to_say[start_index:end_index]
-                else:
-                    word = "Unknown"
-                self._proxy.notify(
-                    "started-word",
-                    name=word,
-                    location=event.text_position,
-                    length=event.length,
-                )
-
+                keep = self._onWord(event, keep)
             elif event.type == _espeak.EVENT_MSG_TERMINATED:
-                # Final event indicating synthesis completion
-                if self._save_file:
-                    try:
-                        with wave.open(self._save_file, "wb") as f:
-                            f.setnchannels(1)  # Mono
-                            f.setsampwidth(2)  # 16-bit samples
-                            f.setframerate(22050)  # 22,050 Hz sample rate
-                            f.writeframes(self._data_buffer)
-                        print(f"Audio saved to {self._save_file}")
-                    except Exception as e:
-                        msg = f"Error saving WAV file: {e}"
-                        raise RuntimeError(msg)
-                else:
-                    try:
-                        with NamedTemporaryFile(suffix=".wav", delete=False) as temp_wav:
-                            with wave.open(temp_wav, "wb") as f:
-                                f.setnchannels(1)  # Mono
-                                f.setsampwidth(2)  # 16-bit samples
-                                f.setframerate(22050)  # 22,050 Hz sample rate
-                                f.writeframes(self._data_buffer)
-
-                            temp_wav_name = temp_wav.name
-                            temp_wav.flush()
-
-                        # Playback functionality (for say method)
-                        if platform.system() == "Darwin":  # macOS
-                            subprocess.run(["afplay", temp_wav_name], check=True)
-                        elif platform.system() == "Linux":
-                            os.system(f"aplay {temp_wav_name} -q")
-                        elif platform.system() == "Windows":
-                            winsound.PlaySound(temp_wav_name, winsound.SND_FILENAME)
-
-                        # Remove the file after playback
-                        os.remove(temp_wav_name)  # noqa: PTH107
-                    except Exception as e:
-                        print(f"Playback error: {e}")
-
-                # Clear the buffer and mark as finished
-                self._data_buffer = b""
-                self._speaking = False
-                self._proxy.notify("finished-utterance", completed=True)
-                self._proxy.setBusy(False)
-                self.endLoop()
+                terminated = True
                 break
 
             i += 1
 
+        # once stopped, returning 1 makes espeak drop the rest of the text and
+        # confirm at once with EVENT_MSG_TERMINATED, much sooner than Cancel()
+        abort = self._stopping or self._aborting or self._cutAt is not None
+        if self._stopping or self._aborting:
+            keep = 0
+
         # Accumulate audio data if available
-        if numsamples > 0:
-            self._data_buffer += ctypes.string_at(wav, numsamples * ctypes.sizeof(ctypes.c_short))
+        if keep > 0:
+            self._collect(wav, keep)
 
-        return 0
+        if terminated:
+            self._speaking = False
+            self._finished = True
+            with self._synthEnded:
+                self._synthEnded.notify_all()
+            self._proxy.wake()
+        return 1 if abort else 0
+
+    def _collect(self, wav, frames):
+        """
+        Accumulates synthesized frames, queuing them for playback when
+        streaming, or for the writer of the file being saved. Both encode and
+        output the audio on their own threads, so the callback only copies.
+        """
+        self._samples += frames
+        data = ctypes.string_at(wav, frames * ctypes.sizeof(ctypes.c_short))
+        if self._writer is not None:
+            self._writer.write(data)
+            if not self._teeFile:
+                return
+        self._data_buffer.append(data)
+        if self._streaming and not self._save_file:
+            self._feedSink()
+
+    def _onWord(self, event, keep):
+        """
+        Notifies a word, or cuts the utterance short before it when preempt()
+        was requested. A word callback may stop or preempt the utterance, so
+        this is checked before each word.
+
+        @return: Number of frames of the current buffer to keep
+        """
+        self._words += 1
+        if self._stopping or self._aborting or self._cutAt is not None:
+            return keep
+        if not self._preempting:
+            self._notifyWord(event)
+            return keep
+        # keep the audio before this word, which starts at audio_position ms
+        # into this synthesis
+        self._cutAt = self._words
+        start = event.audio_position * EspeakDriver._sampleRate // 1000
+        return min(max(start - (self._samples - self._synthStart), 0), keep)
+
+    def _notifyWord(self, event):
+        if self._text_to_say:
+            start_index = event.text_position - 1
+            end_index = start_index + event.length
+            word = self._text_to_say[start_index:end_index]
+        else:
+            word = "Unknown"
+        self._proxy.notify(
+            "started-word",
+            name=word,
+            location=event.text_position,
+            length=event.length,
+        )
+
+    def _feedSink(self):
+        """
+        Streaming playback: queues buffered PCM for the sink as soon as the
+        jitter buffer has filled, instead of waiting for the whole utterance.
+        """
+        if self._sinkStarted or self._data_buffer.duration >= self._jitterBuffer:
+            # marked first, so stop() aborts the output of the queued audio
+            self._sinkStarted = True
+            try:
+                self._play(self._data_buffer)
+            except Exception as e:
+                print(f"Playback error: {e}")
+            self._data_buffer.clear()
 
     def endLoop(self):
         self._looping = False
+        self._proxy.wake()
 
     def startLoop(self):
-        first = True
         self._looping = True
+        if not self._pending:
+            self._proxy.setBusy(False)
         while self._looping:
-            if not self._looping:
-                break
-            if first:
-                self._proxy.setBusy(False)
-                first = False
-                if self._text_to_say:
-                    self._start_synthesis(self._text_to_say)
-            self.iterate()
-            time.sleep(0.01)
+            self._step()
+            if self._looping:
+                self._proxy.waitForWake()
+        self._settle()
+        self._drainOutput()
 
     def iterate(self):
-        if not self._looping:
-            return
+        """Iterates from within an external run loop without blocking."""
+        self._looping = True
+        if not self._pending:
+            self._proxy.setBusy(False)
+        try:
+            while True:
+                self._step()
+                yield
+        finally:
+            # the external loop dropped this iterator, so act on a stop
+            # request from endLoop now instead of on a next step
+            self._looping = False
+            if self._stopping:
+                self._cancel()
+            self._settle()
+            self._drainOutput()
+
+    def _settle(self, timeout=1.0):
+        """
+        Waits for espeak to confirm the abort of a stopped synthesis when the
+        loop is left, so the synth callback cannot run after the loop, which
+        hangs if the interpreter is exiting by then. Gives up after timeout
+        seconds in case the callback is blocked on the thread leaving the loop.
+        """
+        deadline = time.monotonic() + timeout
+        while self._windingDown():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._proxy.waitForWake(remaining)
+
+    def _windingDown(self):
+        """@return: True while espeak has yet to confirm the abort of a stopped synthesis"""
+        return self._speaking and self._stream is None and (self._stopping or self._aborting)
+
+    def _step(self):
+        """
+        Handles whatever woke the loop: a stop request, a finished synthesis,
+        played audio or a newly queued utterance.
+        """
+        self._reportPlayed()
         if self._stopping:
-            _espeak.Cancel()
-            self._stopping = False
+            self._cancel()
+        if self._finished:
+            self._finished = False
+            if self._aborting:
+                # espeak confirmed the abort of an utterance already reported
+                self._aborting = False
+                self._data_buffer.clear()
+                self._abortFile()
+            elif self._cutAt is not None:
+                self._finishPreempted()
+            else:
+                self._finishUtterance()
+        # audio synthesized ahead is output while espeak streams the next one
+        streaming = self._stream is not None and self._cached_audio is not None
+        if self._pending and (not self._speaking or streaming):
+            self._startUtterance()
+
+    def _cancel(self):
+        """Abandons the current or pending utterance."""
+        self._pending = False
+        self._cached_audio = None
+        self._cutAt = None
+        report = self._stream is None and not self._aborting and (self._speaking or self._finished)
+        if report:
+            if self._speaking:
+                # report the utterance as stopped now; the synth callback aborts
+                # espeak and _step() discards the remains once espeak confirms.
+                # Until then _speaking keeps the next utterance from starting.
+                self._aborting = True
+            else:
+                self._finished = False
+                self._data_buffer.clear()
+                self._abortFile()
+        # cleared only now, so the synth callback always sees one of the flags
+        self._stopping = False
+        if report:
             self._proxy.notify("finished-utterance", completed=False)
-            self._proxy.setBusy(False)
-            self.endLoop()
+        self._proxy.setBusy(False)
 
     def say(self, text):
+        self._save_file = None
         self._text_to_say = text
+        self._cached_audio = None
+        self._queueUtterance()
+
+    def resume(self, text, position, audio):
+        """
+        Speaks text from the given word on, like say() does, after the audio
+        of the words before it when that has not been output yet. Used by the
+        proxy to resume a preempted utterance without synthesizing it again
+        from the start.
+        """
+        self.say(text)
+        self._resumeAt = position
+        self._prefix = audio
@@ -7,7 +7,7 @@ from PyObjCTools import AppHelper
 # noinspection PyProtectedMember
 from PyObjCTools.AppHelper import PyObjCAppHelperRunLoopStopper
 
-from pyttsx3.voice import Voice
+from pyttsx3.voice import Voice, VoiceRegistry
 
 
 # noinspection PyUnresolvedReferences
@@ -36,6 +36,7 @@ class NSSpeechDriver(NSObject):
         self._tts = None
         self._completed = False
         self._current_text = ""
+        self.voices = None
 
     @objc.python_method
     def initWithProxy(self, proxy):
@@ -47,6 +48,7 @@ class NSSpeechDriver(NSObject):
             self._proxy = proxy
             self._tts = NSSpeechSynthesizer.alloc().initWithVoice_(None)
             self._tts.setDelegate_(self)
+            self.voices = VoiceRegistry(self._listVoices)
             # default rate
             self._tts.setRate_(200)
             self._completed = True
@@ -108,13 +110,17 @@ class NSSpeechDriver(NSObject):
             attr.get("VoiceAge"),
         )
 
+    @objc.python_method
+    def _listVoices(self):
+        return [
+            self._toVoice(NSSpeechSynthesizer.attributesForVoice_(v))
+            for v in list(NSSpeechSynthesizer.availableVoices())
+        ]
+
     @objc.python_method
     def getProperty(self, name):
         if name == "voices":
-            return [
-                self._toVoice(NSSpeechSynthesizer.attributesForVoice_(v))
-                for v in list(NSSpeechSynthesizer.availableVoices())
-            ]
+            return list(self.voices)
         if name == "voice":
             return self._tts.voice()
         if name == "rate":
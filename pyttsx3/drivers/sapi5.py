@@ -14,12 +14,12 @@ except ImportError:
 import locale
 import math
 import os
-import time
 import weakref
 
 import pythoncom
+import win32event
 
-from pyttsx3.voice import Voice
+from pyttsx3.voice import Voice, VoiceRegistry
 
 # common voices
 MSSAM = "HKEY_LOCAL_MACHINE\\SOFTWARE\\Microsoft\\Speech\\Voices\\Tokens\\MSSam"
@@ -55,11 +55,15 @@ class SAPI5Driver:
         self._advise = comtypes.client.GetEvents(self._tts, self._event_sink)
         self._proxy = proxy
         self._looping = False
+        # signalled by endLoop to wake the loop out of its message wait
+        self._wakeEvent = win32event.CreateEvent(None, False, False, None)
         self._speaking = False
         self._stopping = False
         self._current_text = ""
         # initial rate
         self._rateWpm = 200
+        self._tokens = {}
+        self.voices = VoiceRegistry(self._loadVoices)
         self.setProperty("voice", self.getProperty("voice"))
 
     def destroy(self) -> None:
@@ -120,17 +124,23 @@ class SAPI5Driver:
         # Create and return the Voice object with additional attributes
         return Voice(id=voice_id, name=voice_name, languages=languages, gender=gender, age=age)
 
+    def _loadVoices(self):
+        tokens = list(self._tts.GetVoices())
+        self._tokens = {token.Id: token for token in tokens}
+        return [self._toVoice(token) for token in tokens]
+
     def _tokenFromId(self, id_):
-        tokens = self._tts.GetVoices()
-        for token in tokens:
-            if token.Id == id_:
-                return token
+        if self.voices.get(id_) is None:
+            # the voice may have been installed since the voices were listed
+            self.voices.invalidate()
+        if self.voices.get(id_) is not None:
+            return self._tokens[id_]
         msg = "unknown voice id %s"
         raise ValueError(msg, id_)
 
     def getProperty(self, name):
         if name == "voices":
-            return [self._toVoice(attr) for attr in self._tts.GetVoices()]
+            return list(self.voices)
         if name == "voice":
             return self._tts.Voice.Id
         if name == "rate":
@@ -169,17 +179,19 @@ class SAPI5Driver:
             raise KeyError(msg)
 
     def startLoop(self) -> None:
-        first = True
         self._looping = True
+        self._proxy.setBusy(False)
         while self._looping:
-            if first:
-                self._proxy.setBusy(False)
-                first = False
             pythoncom.PumpWaitingMessages()
-            time.sleep(0.05)
+            if self._looping:
+                # block until SAPI posts an event message or endLoop is called
+                win32event.MsgWaitForMultipleObjects(
+                    (self._wakeEvent,), False, win32event.INFINITE, win32event.QS_ALLINPUT
+                )
 
     def endLoop(self) -> None:
         self._looping = False
+        win32event.SetEvent(self._wakeEvent)
 
     def iterate(self):
         self._proxy.setBusy(False)
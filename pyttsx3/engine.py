@@ -1,11 +1,22 @@
 from __future__ import annotations
 
 import sys
+import threading
+import time
 import traceback
 import weakref
+from typing import TYPE_CHECKING
 
 from . import driver
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from .audio import AudioBuffer, AudioFormat
+    from .cache import SynthesisCache
+    from .utterance import Utterance
+    from .voice import Voice
+
 # https://docs.python.org/3/library/sys.html#sys.platform
 # The keys are values of Python sys.platform, the values are tuples of engine names.
 # The first engine in the value tuple is the default engine for that platform.
@@ -43,6 +54,10 @@ class Engine:
     @type _driverLoop: bool
     @ivar _debug: Print exceptions or not
     @type _debug: bool.
+    @ivar _worker: Thread running the event loop started by L{startWorker}
+    @type _worker: threading.Thread
+    @ivar _workerEnding: Set by L{endWorker} to end the worker loop
+    @type _workerEnding: bool
     """
 
     def __init__(self, driverName: str | None = None, debug: bool = False) -> None:
@@ -61,6 +76,8 @@ class Engine:
         self._debug = debug
         self._driverLoop = True
         self._inLoop = False
+        self._worker = None
+        self._workerEnding = False
 
     def __repr__(self) -> str:
         """repr(pyttsx3.init('nsss')) -> "pyttsx3.engine.Engine('nsss', debug=False)"."""
@@ -71,6 +88,147 @@ class Engine:
         """str(pyttsx3.init('nsss')) -> 'nsss'."""
         return self.driver_name
 
+    @property
+    def cache(self) -> SynthesisCache | None:
+        """
+        Cache of synthesized audio consulted by say(), save_to_file(),
+        synthesize() and synthesize_iter(), or None (the default) to always
+        synthesize. Only drivers that can replay audio use it.
+        """
+        return self.proxy.cache
+
+    @cache.setter
+    def cache(self, cache: SynthesisCache | None) -> None:
+        self.proxy.cache = cache
+
+    @property
+    def output_format(self) -> AudioFormat | None:
+        """
+        Format that synthesize(), synthesize_iter() and save_to_file()
+        convert the audio to, or None (the default) to keep the driver's own
+        format. Only drivers that synthesize to memory convert saved files.
+        """
+        return self.proxy.output_format
+
+    @output_format.setter
+    def output_format(self, output_format: AudioFormat | None) -> None:
+        self.proxy.output_format = output_format
+
+    @property
+    def audio_format(self) -> AudioFormat:
+        """
+        Format of the audio synthesize() and synthesize_iter() return: the
+        L{output_format} when set, otherwise the driver's own format with the
+        sample rate the synthesizer actually runs at.
+
+        @raise NotImplementedError: When the driver cannot synthesize to memory
+        """
+        return self.proxy.audioFormat()
+
+    @property
+    def expiry(self) -> str:
+        """
+        What happens to an utterance whose deadline passed before it started:
+        "drop" (the default) cancels its handle without a notification,
+        "error" fires an error notification with a TimeoutError and "finish"
+        fires finished-utterance with completed False.
+        """
+        return self.proxy.expiry
+
+    @expiry.setter
+    def expiry(self, expiry: str) -> None:
+        if expiry not in {"drop", "error", "finish"}:
+            msg = f"unknown expiry policy {expiry}"
+            raise ValueError(msg)
+        self.proxy.expiry = expiry
+
+    @property
+    def batch(self) -> bool:
+        """
+        Whether utterances queued one after another at the same priority are
+        order-independent, so that they may be spoken grouped by voice, the
+        groups in the order their voices first appear. Any other command,
+        such as a property change or the end of a L{runAndWait}, ends the
+        batch. False (the default) speaks utterances in the order they were
+        queued.
+        """
+        return self.proxy.batch
+
+    @batch.setter
+    def batch(self, batch: bool) -> None:
+        self.proxy.batch = batch
+
+    @property
+    def lookahead(self) -> int:
+        """
+        Number of queued utterances synthesized in the background while the
+        current one is spoken, so the next one can start as soon as the
+        current one ends. Looking ahead stops at any command other than an
+        utterance and at utterances with other per-utterance properties.
+        0 (the default) synthesizes each utterance when it is due. Only
+        drivers that synthesize to memory look ahead.
+        """
+        return self.proxy.lookahead
+
+    @lookahead.setter
+    def lookahead(self, lookahead: int) -> None:
+        if lookahead < 0:
+            msg = f"lookahead must not be negative, got {lookahead}"
+            raise ValueError(msg)
+        self.proxy.lookahead = int(lookahead)
+
+    def limitQueue(
+        self,
+        depth: int | None = None,
+        chars: int | None = None,
+        overflow: str = "block",
+        timeout: float | None = None,
+    ) -> None:
+        """
+        Bounds the command queue so bursts of commands take bounded memory.
+        A command queued while the queue is full is handled by the overflow
+        policy:
+
+          - "block" waits up to timeout seconds for room and raises
+            queue.Full after that. It only waits while another thread runs
+            the loop, such as a worker started by L{startWorker}, and
+            raises queue.Full at once otherwise.
+          - "reject" raises queue.Full at once.
+          - "drop-oldest" cancels the utterance queued first.
+          - "drop-lowest" cancels the utterance queued first among those of
+            the lowest priority, which may be the new one.
+
+        Ends of loops queued by L{runAndWait} are always accepted, and only
+        utterances are dropped. An utterance longer than chars is rejected.
+
+        @param depth: Most commands the queue holds, or None for no limit
+        @type depth: int
+        @param chars: Most characters of utterance text the queue holds, or
+            None for no limit
+        @type chars: int
+        @param overflow: "block", "reject", "drop-oldest" or "drop-lowest"
+        @type overflow: str
+        @param timeout: Longest time in seconds to block for room, or None to
+            wait indefinitely
+        @type timeout: float
+        @raise ValueError: When the overflow policy is unknown
+        """
+        if overflow not in {"block", "reject", "drop-oldest", "drop-lowest"}:
+            msg = f"unknown overflow policy {overflow}"
+            raise ValueError(msg)
+        self.proxy.limitQueue(depth, chars, overflow, timeout)
+
+    def stats(self) -> dict:
+        """
+        @return: Counters for monitoring: expired, the number of utterances
+            not spoken because their deadline passed before they started;
+            dropped and rejected, the number of utterances and commands
+            L{limitQueue} dropped or refused; queued and queued_chars, the
+            number of commands and characters of text currently queued
+        @rtype: dict
+        """
+        return self.proxy.stats()
+
     def _notify(self, topic: str, **kwargs) -> None:
         """
         Invokes callbacks for an event topic.
@@ -124,26 +282,88 @@ class Engine:
         if len(arr) == 0:
             del self._connects[topic]
 
-    def say(self, text: str | None, name: str | None = None) -> str | None:
+    def say(  # noqa: PLR0913
+        self,
+        text: str | None,
+        name: str | None = None,
+        *,
+        priority: int = 0,
+        resume: bool = False,
+        deadline: float | None = None,
+        ttl: float | None = None,
+        voice: str | None = None,
+        rate: int | None = None,
+        volume: float | None = None,
+        pitch: int | None = None,
+    ) -> Utterance | str:
         """
         Adds an utterance to speak to the event queue.
 
+        Utterances of a higher priority are spoken before those queued with a
+        lower one. When the utterance being spoken has a lower priority, the
+        driver is asked to cut it short at the next word boundary so this one
+        starts at once; an utterance queued with resume then continues from
+        that word once no higher priority utterance is left.
+
+        An utterance that has not started by its deadline is not spoken any
+        more; L{expiry} decides how that is reported.
+
+        The voice, rate, volume and pitch apply to this utterance only, and
+        override the properties set with L{setProperty} without queuing
+        commands to change them. The driver's settings only change between
+        utterances that differ, so consecutive utterances in the same voice
+        load it once, and in L{batch} mode once per batch.
+
         @param text: Text to speak
         @type text: unicode
         @param name: Name to associate with this utterance. Included in
             notifications about this utterance.
         @type name: str
+        @param priority: Utterances with a higher priority are spoken first
+        @type priority: int
+        @param resume: Whether to speak the rest of this utterance after a
+            higher priority utterance preempted it
+        @type resume: bool
+        @param deadline: time.monotonic() value by which the utterance must
+            have started
+        @type deadline: float
+        @param ttl: Number of seconds from now within which the utterance
+            must have started. The earlier of deadline and ttl applies.
+        @type ttl: float
+        @param voice: String ID of the voice to speak the utterance in
+        @type voice: str
+        @param rate: Integer speech rate in words per minute
+        @type rate: int
+        @param volume: Floating point volume in the range [0.0, 1.0]
+        @type volume: float
+        @param pitch: Pitch of the voice, for drivers that support it
+        @type pitch: int
+        @return: Handle to wait for or cancel the utterance, or an error
+            message when the text is empty
+        @rtype: L{utterance.Utterance}
+        @raise queue.Full: When the queue is full, see L{limitQueue}
         """
+        if ttl is not None:
+            expires = time.monotonic() + ttl
+            deadline = expires if deadline is None else min(deadline, expires)
+        settings = {"voice": voice, "rate": rate, "volume": volume, "pitch": pitch}
+        properties = {key: value for key, value in settings.items() if value is not None}
         if str(text or "").strip():
-            self.proxy.say(text, name)
-            return None
+            return self.proxy.say(
+                text,
+                name,
+                priority=priority,
+                resume=resume,
+                deadline=deadline,
+                properties=properties,
+            )
         return "Argument value can't be None or empty"
 
     def stop(self) -> None:
         """Stops the current utterance and clears the event queue."""
         self.proxy.stop()
 
-    def save_to_file(self, text: str, filename: str, name: str | None = None) -> None:
+    def save_to_file(self, text: str, filename: str, name: str | None = None) -> Utterance:
         """
         Adds an utterance to speak to the event queue.
 
@@ -153,10 +373,50 @@ class Engine:
         @param name: Name to associate with this utterance. Included in
             notifications about this utterance.
         @type name: str
+        @return: Handle to wait for or cancel the utterance
+        @rtype: L{utterance.Utterance}
+        @raise queue.Full: When the queue is full, see L{limitQueue}
         """
         assert text
         assert filename
-        self.proxy.save_to_file(text, filename, name)
+        return self.proxy.save_to_file(text, filename, name)
+
+    def synthesize_iter(self, text: str) -> Iterator[bytes]:
+        """
+        Synthesizes text and yields the audio as raw 16-bit mono PCM chunks as
+        soon as the driver produces them. The text is not queued, spoken or
+        saved and no notifications are sent. Closing the iterator early
+        abandons the rest of the synthesis.
+
+        @param text: Text to synthesize
+        @type text: unicode
+        @return: Iterator of PCM chunks
+        @rtype: iterator
+        @raise NotImplementedError: When the driver cannot synthesize to memory
+        @raise RuntimeError: When the driver is busy with another utterance
+        """
+        assert text
+        return self.proxy.synthesize_iter(text)
+
+    def synthesize(self, text: str, properties: dict | None = None) -> AudioBuffer:
+        """
+        Synthesizes text into memory and returns the PCM together with its
+        sample rate and format. Like L{synthesize_iter}, this bypasses the
+        command queue and never touches the filesystem.
+
+        @param text: Text to synthesize
+        @type text: unicode
+        @param properties: voice, rate, volume and pitch values to synthesize
+            this text with instead of those set through the engine, as for
+            an utterance queued by L{say}
+        @type properties: dict
+        @return: Synthesized audio
+        @rtype: L{audio.AudioBuffer}
+        @raise NotImplementedError: When the driver cannot synthesize to memory
+        @raise RuntimeError: When the driver is busy with another utterance
+        """
+        assert text
+        return self.proxy.synthesize(text, properties)
 
     def isBusy(self) -> bool:
         """
@@ -186,6 +446,31 @@ class Engine:
         assert name
         return self.proxy.getProperty(name)
 
+    def find_voices(
+        self, language: str | None = None, gender: str | None = None, age: object = None
+    ) -> list[Voice]:
+        """
+        Looks up the voices of the driver matching all the given criteria.
+        The voices are listed once and kept; call L{invalidate_voices} after
+        installing or removing voices.
+
+        @param language: BCP-47 language tag the voice speaks, such as "en" or
+            "en-GB". A tag also matches its variants, so "en" matches voices
+            speaking "en-GB". Compared case-insensitively.
+        @type language: str
+        @param gender: Gender of the voice, compared case-insensitively
+        @type gender: str
+        @param age: Age of the voice, in the form the driver reports it
+        @type age: object
+        @return: Matching voices, in the order the driver lists them
+        @rtype: list
+        """
+        return self.proxy.findVoices(language, gender, age)
+
+    def invalidate_voices(self) -> None:
+        """Lists the voices of the driver again the next time they are needed."""
+        self.proxy.invalidateVoices()
+
     def setProperty(self, name: str, value: str | float) -> None:
         """
         Adds a property value to set to the event queue. Valid names and values
@@ -206,14 +491,33 @@ class Engine:
         """
         self.proxy.setProperty(name, value)
 
+    def setProperties(self, properties: dict) -> None:
+        """
+        Adds several property values to set at once to the event queue. They
+        are applied together, before any command queued after them. When one
+        of them is invalid, the values set before it are restored.
+
+        Property changes queued one after another are merged, and values equal
+        to those already set are not passed to the driver again.
+
+        @param properties: Property values by name, see L{setProperty}
+        @type properties: dict
+        @raise KeyError: When a property name is unknown
+        """
+        self.proxy.setProperties(properties)
+
     def runAndWait(self) -> None:
         """
         Runs an event loop until all commands queued up until this method call
         complete. Blocks during the event loop and returns when the queue is
-        cleared.
+        cleared. While a worker started by L{startWorker} runs the loop, just
+        waits until the worker has cleared the queue.
 
         @raise RuntimeError: When the loop is already running
         """
+        if self._worker is not None:
+            self.proxy.waitUntilIdle()
+            return
         if self._inLoop:
             msg = "run loop already started"
             raise RuntimeError(msg)
@@ -261,3 +565,52 @@ class Engine:
             msg = "iterate not valid in driver run loop"
             raise RuntimeError(msg)
         self.proxy.iterate()
+
+    def startWorker(self, poll_interval: float = 0.05) -> None:
+        """
+        Starts an event loop on a new worker thread owned by the engine. Until
+        L{endWorker}, any thread may call L{say}, L{save_to_file},
+        L{setProperty}, L{stop} and L{runAndWait}, and every command runs on
+        the worker thread in the order it was queued.
+
+        @param poll_interval: Longest time in seconds between iterations, for
+            drivers whose events do not wake the loop
+        @type poll_interval: float
+        @raise RuntimeError: When the loop is already running
+        """
+        if self._inLoop:
+            msg = "run loop already started"
+            raise RuntimeError(msg)
+        worker = threading.Thread(
+            target=self._runWorker, args=(poll_interval,), name="pyttsx3-worker", daemon=True
+        )
+        # from now on only the worker runs commands, even before it starts
+        self.proxy.setOwner(worker)
+        self.startLoop(False)
+        self._workerEnding = False
+        self._worker = worker
+        worker.start()
+
+    def _runWorker(self, poll_interval: float) -> None:
+        while not self._workerEnding:
+            self.iterate()
+            self.proxy.waitForWake(poll_interval)
+        self.endLoop()
+
+    def endWorker(self, timeout: float | None = None) -> None:
+        """
+        Stops speaking, ends the loop of the worker thread and waits for the
+        thread to exit.
+
+        @param timeout: Maximum number of seconds to wait, or None for no limit
+        @type timeout: float
+        @raise RuntimeError: When no worker is running
+        """
+        if self._worker is None:
+            msg = "worker not started"
+            raise RuntimeError(msg)
+        self._workerEnding = True
+        self.proxy.wake()
+        self._worker.join(timeout)
+        self._worker = None
+        self.proxy.setOwner(None)
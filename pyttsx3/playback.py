@@ -0,0 +1,422 @@
+from __future__ import annotations
+
+import contextlib
+import os
+import platform
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+from .audio import AudioBuffer
+
+_ALSA_FORMATS = {1: "U8", 2: "S16_LE", 4: "S32_LE"}
+_PULSE_FORMATS = {1: "u8", 2: "s16le", 4: "s32le"}
+
+
+def aplay_command(sample_rate: int, sample_width: int, channels: int) -> list[str]:
+    """Returns the command line of an ALSA aplay process reading raw PCM on stdin."""
+    return [
+        "aplay",
+        "-q",
+        "-t",
+        "raw",
+        "-f",
+        _ALSA_FORMATS[sample_width],
+        "-r",
+        str(sample_rate),
+        "-c",
+        str(channels),
+    ]
+
+
+def pacat_command(sample_rate: int, sample_width: int, channels: int) -> list[str]:
+    """Returns the command line of a PulseAudio pacat process reading raw PCM on stdin."""
+    return [
+        "pacat",
+        "--raw",
+        f"--format={_PULSE_FORMATS[sample_width]}",
+        f"--rate={sample_rate}",
+        f"--channels={channels}",
+    ]
+
+
+# Players that read raw PCM on stdin, in order of preference.
+_RAW_PLAYERS = {"aplay": aplay_command, "pacat": pacat_command}
+
+
+def default_sink() -> AudioSink:
+    """
+    Returns the best available playback sink for the current platform. Falls
+    back to an L{AudioSink} that discards audio when no player is found.
+    """
+    system = platform.system()
+    if system == "Windows":
+        return WinsoundSink()
+    if system == "Darwin":
+        return AfplaySink()
+    for name, command in _RAW_PLAYERS.items():
+        if shutil.which(name):
+            return ProcessSink(command)
+    return AudioSink()
+
+
+class AudioSink:
+    """
+    Destination for synthesized PCM. Documents the interface expected by the
+    drivers; this base implementation discards all audio.
+    """
+
+    def write(self, data, sample_rate: int, sample_width: int = 2, channels: int = 1) -> None:
+        """
+        Queues raw PCM for playback. May return before the audio is heard.
+
+        @param data: Raw little-endian PCM
+        @type data: bytes-like
+        @param sample_rate: Number of frames per second
+        @type sample_rate: int
+        @param sample_width: Number of bytes per sample
+        @type sample_width: int
+        @param channels: Number of interleaved channels per frame
+        @type channels: int
+        """
+
+    def play(self, audio: AudioBuffer) -> None:
+        """
+        Queues an L{AudioBuffer} for playback.
+
+        @param audio: Audio to play
+        @type audio: L{AudioBuffer}
+        """
+        if len(audio):
+            self.write(audio.as_memoryview(), audio.sample_rate, audio.sample_width, audio.channels)
+
+    def drain(self) -> None:
+        """Blocks until all queued audio has been played."""
+
+    def abort(self) -> None:
+        """
+        Discards queued audio and silences the output as soon as possible.
+        May be called from another thread while L{write} or L{drain} blocks,
+        which should then return early.
+        """
+
+    def close(self) -> None:
+        """Plays out queued audio and releases any resources held by the sink."""
+
+
+class ProcessSink(AudioSink):
+    """
+    Plays audio through a long-lived player process fed raw PCM on stdin, so
+    consecutive utterances reuse one process. The process is only restarted
+    when the sample format changes or after L{abort}.
+
+    @ivar _command: Builds the player command line for a sample format
+    @type _command: callable
+    @ivar _process: Running player process or None
+    @type _process: subprocess.Popen
+    @ivar _format: (sample_rate, sample_width, channels) of the running player
+    @type _format: tuple
+    @ivar _playedUntil: Monotonic time at which the queued audio ends
+    @type _playedUntil: float
+    @ivar _aborted: Set by L{abort} to end a running L{drain} early
+    @type _aborted: threading.Event
+    """
+
+    def __init__(self, command=aplay_command) -> None:
+        """
+        @param command: Callable taking (sample_rate, sample_width, channels)
+            and returning the argument list of a player reading raw PCM on stdin
+        @type command: callable
+        """
+        self._command = command
+        self._process = None
+        self._format = None
+        self._playedUntil = 0.0
+        self._aborted = threading.Event()
+
+    def _start(self, audio_format) -> None:
+        self.close()
+        self._process = subprocess.Popen(
+            self._command(*audio_format),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self._format = audio_format
+        self._aborted.clear()
+
+    def write(self, data, sample_rate: int, sample_width: int = 2, channels: int = 1) -> None:
+        audio_format = (sample_rate, sample_width, channels)
+        # abort() may replace the process from another thread meanwhile
+        process = self._process
+        if process is None or process.poll() is not None or audio_format != self._format:
+            self._start(audio_format)
+            process = self._process
+        # the player starts on this data as soon as it is written, and writing
+        # blocks in step with playback once the pipe is full
+        start = max(time.monotonic(), self._playedUntil)
+        try:
+            process.stdin.write(data)
+            process.stdin.flush()
+        except (BrokenPipeError, ValueError):
+            # the player died or was killed by abort()
+            if self._process is process:
+                self._process = None
+            return
+        if self._process is process:
+            self._playedUntil = start + memoryview(data).nbytes / (
+                sample_rate * sample_width * channels
+            )
+
+    def drain(self) -> None:
+        remaining = self._playedUntil - time.monotonic()
+        if remaining > 0:
+            self._aborted.wait(remaining)
+
+    def abort(self) -> None:
+        self._aborted.set()
+        process, self._process = self._process, None
+        if process is not None:
+            process.kill()
+            process.wait()
+        self._playedUntil = 0.0
+
+    def close(self) -> None:
+        if self._process is not None:
+            with contextlib.suppress(BrokenPipeError):
+                self._process.stdin.close()
+            self._process.wait()
+            self._process = None
+        self._playedUntil = 0.0
+
+
+class QueuedSink(AudioSink):
+    """
+    Hands audio to another sink on a worker thread. L{write} copies the PCM
+    into a bounded queue and returns, so a caller such as the espeak synth
+    callback is never held up by a player that blocks in step with playback.
+    Only blocks the caller once max_pending writes are waiting.
+
+    @ivar sink: Sink the audio is played through
+    @type sink: L{AudioSink}
+    @ivar _pending: Calls to the sink waiting for the worker, tagged with the
+        generation they were queued in; None stops the worker
+    @type _pending: queue.Queue
+    @ivar _outstanding: Number of writes queued or being played
+    @type _outstanding: int
+    @ivar _generation: Incremented by L{abort}, so the worker skips the writes
+        queued before it
+    @type _generation: int
+    @ivar _error: First exception raised by the sink since the last L{drain}
+    @type _error: Exception
+    """
+
+    def __init__(self, sink: AudioSink, max_pending: int = 32) -> None:
+        """
+        @param sink: Sink to play the audio through
+        @type sink: L{AudioSink}
+        @param max_pending: Number of writes queued before L{write} blocks
+        @type max_pending: int
+        """
+        self.sink = sink
+        self._pending = queue.Queue(maxsize=max_pending)
+        self._idle = threading.Condition()
+        self._outstanding = 0
+        self._generation = 0
+        self._error = None
+        self._thread = None
+
+    def write(self, data, sample_rate: int, sample_width: int = 2, channels: int = 1) -> None:
+        # copied, as callers reuse their buffers once this returns
+        self._queue(self.sink.write, bytes(data), sample_rate, sample_width, channels)
+
+    def play(self, audio: AudioBuffer) -> None:
+        self._queue(self.sink.play, audio.copy())
+
+    def _queue(self, method, *args) -> None:
+        """Queues a call to a method of the sink for the worker."""
+        with self._idle:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="pyttsx3-queued-sink", daemon=True
+                )
+                self._thread.start()
+            self._outstanding += 1
+            generation = self._generation
+        self._pending.put((generation, method, args))
+
+    def when_played(self, callback) -> None:
+        """
+        Calls callback on the worker thread once the audio queued so far has
+        been played, with True, or with False when L{abort} discarded it
+        first, in which case it may be called on the thread aborting.
+
+        @param callback: Callable taking the completed flag
+        @type callback: callable
+        """
+        self._queue(self._played, callback)
+
+    def _played(self, callback) -> None:
+        generation = self._generation
+        try:
+            self.sink.drain()
+        finally:
+            callback(generation == self._generation)
+
+    def _discard(self, method, args) -> None:
+        """Tells the caller of L{when_played} its audio was discarded."""
+        if method == self._played:
+            args[0](False)
+
+    def _run(self) -> None:
+        while (item := self._pending.get()) is not None:
+            generation, method, args = item
+            try:
+                if generation != self._generation:
+                    self._discard(method, args)
+                else:
+                    method(*args)
+                    if generation != self._generation:
+                        # abort() ran while the sink was starting this write
+                        self.sink.abort()
+            except Exception as e:
+                # reported to whoever drains the sink
+                self._error = self._error or e
+            finally:
+                with self._idle:
+                    self._outstanding -= 1
+                    self._idle.notify_all()
+
+    def drain(self) -> None:
+        with self._idle:
+            generation = self._generation
+            self._idle.wait_for(lambda: not self._outstanding or generation != self._generation)
+            aborted = generation != self._generation
+        if not aborted:
+            self.sink.drain()
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def abort(self) -> None:
+        discarded = []
+        with self._idle:
+            self._generation += 1
+            # frees a write blocked on a full queue
+            while True:
+                try:
+                    item = self._pending.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._pending.put_nowait(None)
+                    break
+                self._outstanding -= 1
+                discarded.append(item)
+            self._idle.notify_all()
+        self.sink.abort()
+        for _, method, args in discarded:
+            self._discard(method, args)
+
+    def close(self) -> None:
+        with self._idle:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._pending.put(None)
+            thread.join()
+        self._error = None
+        self.sink.close()
+
+
+class WinsoundSink(AudioSink):
+    """
+    Plays audio with winsound on Windows. winsound cannot play from memory
+    asynchronously, and a synchronous play cannot be stopped, so each write
+    goes through a temporary WAV file played asynchronously. L{write} still
+    returns once the audio has been played, or once L{abort} stopped it.
+
+    @ivar _aborts: Number of calls to L{abort}, so a write racing with one
+        does not start playing
+    @type _aborts: int
+    @ivar _aborted: Set by L{abort} to end a running L{write} early
+    @type _aborted: threading.Event
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._aborts = 0
+        self._aborted = threading.Event()
+
+    def write(self, data, sample_rate: int, sample_width: int = 2, channels: int = 1) -> None:
+        import winsound  # noqa: PLC0415  # Only available on Windows
+
+        aborts = self._aborts
+        audio = AudioBuffer(data, sample_rate, sample_width, channels)
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_wav:
+            audio.write_wav(temp_wav)
+        try:
+            with self._lock:
+                if aborts != self._aborts:
+                    return
+                self._aborted.clear()
+                winsound.PlaySound(temp_wav.name, winsound.SND_FILENAME | winsound.SND_ASYNC)
+            self._aborted.wait(audio.duration)
+        finally:
+            with contextlib.suppress(OSError):
+                os.remove(temp_wav.name)  # noqa: PTH107
+
+    def abort(self) -> None:
+        import winsound  # noqa: PLC0415  # Only available on Windows
+
+        with self._lock:
+            self._aborts += 1
+            self._aborted.set()
+            # stops the sound playing asynchronously
+            winsound.PlaySound(None, 0)
+
+
+class AfplaySink(AudioSink):
+    """
+    Plays audio with afplay on macOS. afplay cannot read from stdin, so each
+    write goes through a temporary WAV file. L{write} returns once the audio
+    has been played, or once L{abort} killed the player.
+
+    @ivar _process: Running afplay process or None
+    @type _process: subprocess.Popen
+    @ivar _aborts: Number of calls to L{abort}, so a write racing with one
+        does not start a player
+    @type _aborts: int
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._process = None
+        self._aborts = 0
+
+    def write(self, data, sample_rate: int, sample_width: int = 2, channels: int = 1) -> None:
+        aborts = self._aborts
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_wav:
+            AudioBuffer(data, sample_rate, sample_width, channels).write_wav(temp_wav)
+        try:
+            with self._lock:
+                if aborts != self._aborts:
+                    return
+                process = self._process = subprocess.Popen(["afplay", temp_wav.name])
+            returncode = process.wait()
+            with self._lock:
+                if self._process is process:
+                    self._process = None
+                if returncode and aborts == self._aborts:
+                    raise subprocess.CalledProcessError(returncode, process.args)
+        finally:
+            os.remove(temp_wav.name)  # noqa: PTH107
+
+    def abort(self) -> None:
+        with self._lock:
+            self._aborts += 1
+            process, self._process = self._process, None
+        if process is not None:
+            process.kill()
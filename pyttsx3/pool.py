@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import multiprocessing
+import secrets
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING
+
+from . import init
+from .audio import AudioBuffer
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from typing_extensions import Self
+
+    from .audio import AudioFormat
+
+# engine of a worker process, or the exception that kept it from starting
+_engine = None
+_failure = None
+
+
+def _initWorker(driverName, output_format) -> None:
+    """Runs once in each worker process to start its engine."""
+    global _engine, _failure  # noqa: PLW0603
+    try:
+        _engine = init(driverName)
+        _engine.output_format = output_format
+    except Exception as e:
+        # raised by each job instead, as a pool restarts workers that fail
+        # to start forever
+        _failure = e
+
+
+def _render(job):
+    """
+    Runs in a worker process. Synthesizes a job and saves the audio to its
+    file, or shares it with the pool's process.
+
+    @param job: Index, text, property values, and filename or None, and
+        name of the block to share the audio in
+    @type job: tuple
+    @return: Index, and the filename or the block sharing the audio
+    @rtype: tuple
+    """
+    if _failure is not None:
+        raise _failure
+    index, text, properties, filename, name = job
+    audio = _engine.synthesize(text, properties)
+    if filename is not None:
+        audio.write_wav(filename)
+        return index, filename, None
+    return index, None, _share(audio, name)
+
+
+def _share(audio: AudioBuffer, name: str | None = None) -> tuple:
+    """
+    Copies audio into a new block of shared memory, which the receiving
+    process releases.
+
+    @param name: Name of the block, or None for a new unique name
+    @type name: str
+    @return: Name of the block, number of bytes and format of the audio
+    @rtype: tuple
+    """
+    size = len(audio)
+    block = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+    try:
+        block.buf[:size] = audio.as_memoryview().cast("B")
+    except BaseException:
+        block.close()
+        block.unlink()
+        raise
+    block.close()
+    return block.name, size, audio.sample_rate, audio.sample_width, audio.channels
+
+
+def _receive(shared: tuple) -> AudioBuffer:
+    """
+    Copies the audio out of a block of shared memory made by L{_share} and
+    releases the block.
+
+    @rtype: L{audio.AudioBuffer}
+    """
+    name, size, sample_rate, sample_width, channels = shared
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        view = block.buf[:size]
+        try:
+            return AudioBuffer(view, sample_rate, sample_width, channels)
+        finally:
+            view.release()
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _unlink(name: str) -> None:
+    """Releases a block of shared memory, if it exists."""
+    try:
+        block = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    block.close()
+    block.unlink()
+
+
+class SynthesisPool:
+    """
+    Synthesizes many texts in parallel in worker processes. Each worker
+    starts its own engine once and keeps it, with the voice it loaded, for
+    all the jobs it runs, as espeak synthesizes one text at a time per
+    process. Audio comes back through shared memory rather than through
+    the pool's pipes.
+
+    A job is a text, or a (text, properties) or (text, properties, filename)
+    tuple. The properties are voice, rate, volume and pitch values to
+    synthesize the text with, over the pool's L{properties}. A job with a
+    filename is saved to that WAV file by the worker and yields the filename;
+    any other job yields an L{audio.AudioBuffer}.
+
+    @ivar properties: Property values every job is synthesized with unless
+        it sets its own
+    @type properties: dict
+    @ivar _pool: Worker processes
+    @type _pool: multiprocessing.pool.Pool
+    @ivar _blocks: Names of the blocks of shared memory handed out with jobs
+        whose audio has not been received. Workers create the blocks under
+        these names, so the pool can release those left behind by jobs whose
+        results were abandoned.
+    @type _blocks: set
+    """
+
+    def __init__(
+        self,
+        processes: int | None = None,
+        driverName: str | None = None,
+        properties: dict | None = None,
+        output_format: AudioFormat | None = None,
+        context: str = "spawn",
+    ) -> None:
+        """
+        @param processes: Number of worker processes, or None for one per CPU
+        @type processes: int
+        @param driverName: Name of the driver each worker uses. If None,
+            selects the default driver for the operating system.
+        @type driverName: str
+        @param properties: Property values every job is synthesized with
+        @type properties: dict
+        @param output_format: Format to convert the audio to, or None to keep
+            the driver's own format
+        @type output_format: L{audio.AudioFormat}
+        @param context: multiprocessing start method. Forking a process in
+            which a synthesizer runs its own threads is unsafe, so workers are
+            spawned by default.
+        @type context: str
+        """
+        self.properties = dict(properties or {})
+        self._blocks = set()
+        self._pool = multiprocessing.get_context(context).Pool(
+            processes, initializer=_initWorker, initargs=(driverName, output_format)
+        )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if exc_info[0] is None:
+            self.close()
+        else:
+            self.terminate()
+
+    def _jobs(self, jobs: Iterable, names: set) -> Iterator[tuple]:
+        """
+        @param names: Set the names of the blocks handed out are added to
+        @type names: set
+        """
+        for index, job in enumerate(jobs):
+            fields = (job,) if isinstance(job, str) else tuple(job)
+            text, properties, filename = (*fields, None, None)[:3]
+            name = None
+            if filename is None:
+                name = f"psm_{secrets.token_hex(8)}"
+                self._blocks.add(name)
+                names.add(name)
+            yield index, text, {**self.properties, **(properties or {})}, filename, name
+
+    def _result(self, result, names: set):
+        """@return: The index of a job and its filename or audio"""
+        index, filename, shared = result
+        if shared is None:
+            return index, filename
+        names.discard(shared[0])
+        self._blocks.discard(shared[0])
+        return index, _receive(shared)
+
+    @staticmethod
+    def _release(names: Iterable) -> None:
+        """Releases the blocks of jobs whose results will not be received."""
+        for name in tuple(names):
+            _unlink(name)
+
+    def map(self, jobs: Iterable, chunksize: int = 1) -> list:
+        """
+        Synthesizes all the jobs and waits for them.
+
+        @param jobs: Texts or tuples describing the jobs
+        @type jobs: iterable
+        @param chunksize: Number of jobs handed to a worker at once
+        @type chunksize: int
+        @return: Audio or filename of each job, in the order of the jobs
+        @rtype: list
+        """
+        names = set()
+        try:
+            return [
+                self._result(result, names)[1]
+                for result in self._pool.imap(_render, self._jobs(jobs, names), chunksize)
+            ]
+        finally:
+            # left behind by the jobs that finished after one failed
+            self._release(names)
+
+    def imap_unordered(self, jobs: Iterable, chunksize: int = 1) -> Iterator[tuple]:
+        """
+        Synthesizes the jobs and yields each as soon as it is done. Leaving
+        the iteration early does not stop the jobs already handed to the
+        workers; the audio of those finishing later is released by L{close}
+        or L{terminate}.
+
+        @param jobs: Texts or tuples describing the jobs
+        @type jobs: iterable
+        @param chunksize: Number of jobs handed to a worker at once
+        @type chunksize: int
+        @return: Iterator of (index, audio or filename) pairs, where index is
+            the position of the job in jobs
+        @rtype: iterator
+        """
+        names = set()
+        try:
+            for result in self._pool.imap_unordered(_render, self._jobs(jobs, names), chunksize):
+                yield self._result(result, names)
+        finally:
+            self._release(names)
+
+    def close(self) -> None:
+        """Lets the workers finish the jobs handed to them, then stops them."""
+        self._pool.close()
+        self._pool.join()
+        self._release(self._blocks)
+        self._blocks.clear()
+
+    def terminate(self) -> None:
+        """Stops the workers at once, abandoning their jobs."""
+        self._pool.terminate()
+        self._pool.join()
+        self._release(self._blocks)
+        self._blocks.clear()
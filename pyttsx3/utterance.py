@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import concurrent.futures
+import weakref
+
+
+class Utterance(concurrent.futures.Future):
+    """
+    Handle to a queued say or save_to_file command. Resolves to True once
+    the utterance was output completely, or to False when it was stopped
+    or preempted without resuming while being output. An utterance dropped
+    from the queue before it started, by L{cancel}, by L{engine.Engine.stop}
+    or because its deadline passed, is cancelled like any other future,
+    unless the L{driver.DriverProxy.expiry} policy reports it instead.
+
+    @ivar text: Text of the utterance
+    @type text: unicode
+    @ivar name: Name associated with the utterance
+    @type name: str
+    @ivar priority: Utterances with a higher priority are output first
+    @type priority: int
+    @ivar resume: Whether the rest of the utterance is output after it was
+        preempted by one of a higher priority
+    @type resume: bool
+    @ivar deadline: time.monotonic() value after which the utterance is no
+        longer output if it has not started, or None
+    @type deadline: float
+    @ivar properties: Property values the utterance is output with instead
+        of those set through the engine
+    @type properties: dict
+    @ivar samples: Number of frames of audio output, or None when the driver
+        does not report it
+    @type samples: int
+    @ivar duration: Length of the audio output in seconds, or None when the
+        driver does not report it
+    @type duration: float
+    @ivar _command: Command queued to output the utterance
+    @type _command: tuple
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        proxy,
+        text: str,
+        name: str | None = None,
+        *,
+        priority: int = 0,
+        resume: bool = False,
+        deadline: float | None = None,
+        properties: dict | None = None,
+    ) -> None:
+        """
+        @param proxy: Proxy to the driver the utterance is queued on
+        @type proxy: L{driver.DriverProxy}
+        @param text: Text of the utterance
+        @type text: unicode
+        @param name: Name associated with the utterance
+        @type name: str
+        @param priority: Utterances with a higher priority are output first
+        @type priority: int
+        @param resume: Whether to output the rest of the utterance after it
+            was preempted
+        @type resume: bool
+        @param deadline: time.monotonic() value after which the utterance
+            expires if it has not started, or None
+        @type deadline: float
+        @param properties: Property values to output the utterance with
+            instead of those set through the engine
+        @type properties: dict
+        """
+        super().__init__()
+        self._proxy = weakref.proxy(proxy)
+        self.text = text
+        self.name = name
+        self.priority = priority
+        self.resume = resume
+        self.deadline = deadline
+        self.properties = properties or {}
+        self.samples = None
+        self.duration = None
+        self._command = None
+
+    def cancel(self) -> bool:
+        """
+        Drops the utterance from the queue if it has not started yet, or
+        stops it while it is being output. Other queued commands are kept.
+
+        @return: False when the utterance has already finished
+        @rtype: bool
+        """
+        return self._proxy.cancel(self)
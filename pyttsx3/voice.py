@@ -1,14 +1,151 @@
+from __future__ import annotations
+
+import dataclasses
+import threading
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
 class Voice:
-    def __init__(self, id, name=None, languages=None, gender=None, age=None) -> None:
-        self.id = id
-        self.name = name
-        self.languages = languages or []
-        self.gender = gender
-        self.age = age
+    id: str
+    name: str | None = None
+    languages: tuple = ()
+    gender: str | None = None
+    age: object = None
+
+    def __post_init__(self) -> None:
+        # drivers pass lists; a tuple keeps the voice immutable and hashable
+        object.__setattr__(self, "languages", tuple(self.languages or ()))
 
     def __str__(self) -> str:
-        return """<Voice id={id}
-          name={name}
-          languages={languages}
-          gender={gender}
-          age={age}>""".format(**self.__dict__)
+        return f"""<Voice id={self.id}
+          name={self.name}
+          languages={list(self.languages)}
+          gender={self.gender}
+          age={self.age}>"""
+
+
+def _languageTag(language) -> str:
+    """@return: Language tag in lower case with BCP-47 separators"""
+    return str(language).replace("_", "-").lower()
+
+
+class VoiceRegistry:
+    """
+    Catalogue of the voices of a driver, loaded on first use and kept until
+    L{invalidate} is called, with indexes to look voices up by id, language,
+    gender and age.
+
+    @ivar _loader: Returns the voices of the driver
+    @type _loader: callable
+    @ivar _voices: Voices in the order the driver lists them, or None when
+        not loaded
+    @type _voices: tuple
+    @ivar _byId: Voices by id
+    @type _byId: dict
+    @ivar _byLanguage: Voices by primary language subtag in lower case
+    @type _byLanguage: dict
+    @ivar _byGender: Voices by gender in lower case
+    @type _byGender: dict
+    @ivar _byAge: Voices by age
+    @type _byAge: dict
+    """
+
+    def __init__(self, loader) -> None:
+        """
+        @param loader: Callable without arguments returning the voices of the
+            driver
+        @type loader: callable
+        """
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._voices = None
+        self._byId = {}
+        self._byLanguage = {}
+        self._byGender = {}
+        self._byAge = {}
+
+    def _load(self) -> tuple:
+        """@return: The voices, loading them first when they are not loaded"""
+        voices = self._voices
+        if voices is not None:
+            return voices
+        with self._lock:
+            if self._voices is None:
+                voices = tuple(self._loader())
+                byId, byLanguage, byGender, byAge = {}, {}, {}, {}
+                for voice in voices:
+                    byId.setdefault(voice.id, voice)
+                    tags = map(_languageTag, voice.languages)
+                    for primary in {tag.split("-")[0] for tag in tags}:
+                        byLanguage.setdefault(primary, []).append(voice)
+                    if voice.gender is not None:
+                        byGender.setdefault(str(voice.gender).lower(), []).append(voice)
+                    if voice.age is not None:
+                        byAge.setdefault(voice.age, []).append(voice)
+                self._byId, self._byLanguage = byId, byLanguage
+                self._byGender, self._byAge = byGender, byAge
+                self._voices = voices
+            return self._voices
+
+    def invalidate(self) -> None:
+        """Drops the catalogue so the voices are loaded again on next use."""
+        with self._lock:
+            self._voices = None
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def get(self, id_):
+        """
+        @param id_: Id of the voice
+        @type id_: str
+        @return: Voice with the given id, or None
+        @rtype: L{Voice}
+        """
+        self._load()
+        return self._byId.get(id_)
+
+    def find(self, language=None, gender=None, age=None) -> list:
+        """
+        Looks up the voices matching all the given criteria. A language
+        matches the voices speaking it or one of its variants, so "en"
+        matches "en-GB" and "en-US" while "en-GB" only matches the former.
+        Languages and genders are compared case-insensitively.
+
+        @param language: BCP-47 language tag, or None for any language
+        @type language: str
+        @param gender: Gender of the voice, or None for any gender
+        @type gender: str
+        @param age: Age of the voice, or None for any age
+        @type age: object
+        @return: Matching voices, in the order the driver lists them
+        @rtype: list
+        """
+        voices = self._load()
+        candidates = None
+        if language is not None:
+            tag = _languageTag(language)
+            candidates = [
+                voice
+                for voice in self._byLanguage.get(tag.split("-")[0], ())
+                if any(
+                    code == tag or code.startswith(tag + "-")
+                    for code in map(_languageTag, voice.languages)
+                )
+            ]
+        if gender is not None:
+            candidates = self._narrow(candidates, self._byGender.get(str(gender).lower(), ()))
+        if age is not None:
+            candidates = self._narrow(candidates, self._byAge.get(age, ()))
+        return list(voices) if candidates is None else candidates
+
+    @staticmethod
+    def _narrow(candidates, matches) -> list:
+        """@return: The candidates among matches, or all matches if there are no candidates yet"""
+        if candidates is None:
+            return list(matches)
+        matches = {id(voice) for voice in matches}
+        return [voice for voice in candidates if id(voice) in matches]
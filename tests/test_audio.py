@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import array
+import io
+import math
+import random
+import sys
+import time
+import wave
+
+import pytest
+
+from pyttsx3.audio import AudioBuffer, AudioFormat, FormatConverter, WavWriter
+
+ONE_SECOND = bytes(2 * 22050)  # 16-bit mono at 22,050 Hz
+PCM = b"\x01\x00\xff\xff\x00\x80"
+SILENT_8BIT_STEREO = b"\x80\x80"
+
+
+def test_audio_buffer_views() -> None:
+    audio = AudioBuffer(PCM[:4], sample_rate=16000)
+    audio.append(PCM[4:])
+    assert audio.frames == 3
+    assert audio.as_memoryview().tolist() == [1, -1, -32768]
+    assert bytes(audio) == PCM
+
+    f = io.BytesIO()
+    audio.write_wav(f)
+    f.seek(0)
+    with wave.open(f, "rb") as w:
+        assert w.getframerate() == 16000
+        assert w.readframes(w.getnframes()) == bytes(audio)
+
+
+def test_audio_buffer_numpy_view() -> None:
+    np = pytest.importorskip("numpy")
+    audio = AudioBuffer(b"\x01\x00\xff\xff")
+    assert audio.as_array().dtype == np.int16
+    assert audio.as_array().tolist() == [1, -1]
+
+
+def _pcm(samples) -> bytes:
+    """@return: 16-bit little-endian PCM holding the samples"""
+    pcm = array.array("h", samples)
+    if sys.byteorder == "big":
+        pcm.byteswap()
+    return pcm.tobytes()
+
+
+def _noise(frames, channels=1) -> AudioBuffer:
+    rng = random.Random(frames)
+    samples = [rng.randrange(-32768, 32768) for _ in range(frames * channels)]
+    return AudioBuffer(_pcm(samples), sample_rate=22050, channels=channels)
+
+
+def _tone(frequency) -> AudioBuffer:
+    """@return: One second of a sine at half of full scale"""
+    samples = [round(16384 * math.sin(2 * math.pi * frequency * i / 22050)) for i in range(22050)]
+    return AudioBuffer(_pcm(samples), sample_rate=22050)
+
+
+def _convertInChunks(audio, target, use_numpy, size=7) -> bytes:
+    converter = FormatConverter(audio.format, target, use_numpy)
+    data = bytes(audio)
+    chunks = [converter.convert(data[i : i + size]) for i in range(0, len(data), size)]
+    return b"".join(chunks) + converter.flush()
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_format_conversion(use_numpy) -> None:
+    if use_numpy:
+        pytest.importorskip("numpy")
+    # a ramp, so linear interpolation reproduces it exactly
+    audio = AudioBuffer(_pcm(range(0, 16000, 100)), sample_rate=16000)
+    converter = FormatConverter(audio.format, AudioFormat(32000), use_numpy)
+    doubled = converter.convert(bytes(audio)) + converter.flush()
+    assert AudioBuffer(doubled, 32000).as_memoryview().tolist() == list(range(0, 15901, 50))
+
+    stereo = FormatConverter(audio.format, AudioFormat(16000, 1, 2), use_numpy).convert(PCM[:2])
+    assert stereo == SILENT_8BIT_STEREO
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+@pytest.mark.parametrize(
+    ("channels", "target"), [(1, AudioFormat(8000)), (2, AudioFormat(48000, 1, 2))]
+)
+def test_chunked_conversion_matches_whole(use_numpy, channels, target) -> None:
+    if use_numpy:
+        pytest.importorskip("numpy")
+    # at a rate that is no whole multiple of the other, chunks split
+    # anywhere, even within a frame, convert like the whole
+    audio = _noise(5000, channels)
+    whole = _convertInChunks(audio, target, use_numpy, size=len(audio))
+    assert _convertInChunks(audio, target, use_numpy) == whole
+    assert _convertInChunks(audio, target, use_numpy, size=4096 * 4 + 3) == whole
+    frames = len(whole) // (target.sample_width * target.channels)
+    assert frames == (audio.frames - 1) * target.sample_rate // audio.sample_rate + 1
+
+
+@pytest.mark.parametrize(
+    "target", [AudioFormat(8000), AudioFormat(48000, 1, 2), AudioFormat(16000, 4, 1)]
+)
+def test_numpy_conversion_matches_plain_python(target) -> None:
+    pytest.importorskip("numpy")
+    audio = _noise(5000, 2)
+    assert _convertInChunks(audio, target, True) == _convertInChunks(audio, target, False)
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_downsampling_filters_aliases(use_numpy) -> None:
+    if use_numpy:
+        pytest.importorskip("numpy")
+    # 7 kHz is above what 8 kHz audio holds and would fold back to 1 kHz
+    target = AudioFormat(8000)
+    aliased = AudioBuffer(_convertInChunks(_tone(7000), target, use_numpy), 8000)
+    kept = AudioBuffer(_convertInChunks(_tone(1000), target, use_numpy), 8000)
+    # away from the clicks where the tones start and stop
+    assert max(map(abs, aliased.as_memoryview()[100:-100])) < 16384 / 100
+    assert max(map(abs, kept.as_memoryview()[100:-100])) > 16384 * 0.99
+
+
+def test_audio_buffer_convert() -> None:
+    audio = AudioBuffer(PCM * 100, sample_rate=22050)
+    assert audio.convert(audio.format).format == audio.format
+    converted = audio.convert(AudioFormat(11025, channels=2))
+    assert converted.format == AudioFormat(11025, 2, 2)
+    assert converted.duration == pytest.approx(audio.duration, abs=0.001)
+    with pytest.raises(ValueError, match="unsupported sample width"):
+        AudioFormat(8000, sample_width=3)
+
+
+def test_wav_writer_streams_to_file(tmp_path) -> None:
+    filename = str(tmp_path / "streamed.wav")
+    writer = WavWriter(filename, AudioFormat(16000), max_pending=2)
+    for _ in range(100):
+        writer.write(PCM)
+    assert writer.frames == 300
+    writer.close()
+    audio = AudioBuffer.read_wav(filename)
+    assert audio.format == AudioFormat(16000)
+    assert bytes(audio) == PCM * 100
+
+
+def test_wav_writer_converts_on_its_thread(tmp_path) -> None:
+    filename = str(tmp_path / "converted.wav")
+    audio = _noise(5000)
+    target = AudioFormat(8000, 1, 2)
+    writer = WavWriter(filename, target, source=audio.format)
+    for i in range(0, len(audio), 1000):
+        writer.write(bytes(audio)[i : i + 1000])
+    writer.close()
+    assert writer.frames == audio.frames
+    saved = AudioBuffer.read_wav(filename)
+    assert saved.format == target
+    assert bytes(saved) == bytes(audio.convert(target))
+
+
+def test_wav_writer_abort_removes_file(tmp_path) -> None:
+    filename = tmp_path / "aborted.wav"
+    writer = WavWriter(str(filename), AudioFormat(16000))
+    writer.write(PCM)
+    writer.abort()
+    writer.write(PCM)
+    assert not filename.exists()
+
+
+@pytest.mark.parallel_threads(1)
+def test_audio_buffer_accumulation_is_linear() -> None:
+    """Appending the last ten minutes of an hour must cost the same as the first ten."""
+    audio = AudioBuffer()
+    segments = []
+    for _ in range(6):
+        start = time.perf_counter()
+        for _ in range(10 * 60):
+            audio.append(ONE_SECOND)
+        segments.append(time.perf_counter() - start)
+    assert audio.duration == 60 * 60
+    # Copying the whole buffer per append would make the last segment ~11x slower
+    assert segments[-1] < 4 * segments[0] + 0.01, segments
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from pyttsx3.audio import AudioBuffer
+from pyttsx3.cache import SynthesisCache, split_sentences
+
+A, B, C = b"aaaa", b"bbbb", b"cccc"
+PCM = b"\x01\x00"
+
+
+def test_synthesis_cache_evicts_least_recently_used() -> None:
+    cache = SynthesisCache(max_bytes=8)
+    cache.put("a", AudioBuffer(A))
+    cache.put("b", AudioBuffer(B))
+    assert bytes(cache.get("a")) == A
+    cache.put("c", AudioBuffer(C))
+    assert cache.get("b") is None
+    assert bytes(cache.get("c")) == C
+    assert cache.stats() == {
+        "hits": 2,
+        "disk_hits": 0,
+        "misses": 1,
+        "evictions": 1,
+        "entries": 2,
+        "bytes": 8,
+    }
+
+
+def test_synthesis_cache_disk_tier(tmp_path) -> None:
+    key = SynthesisCache.key("espeak", "gmw/en", 200, 1.0, 50, "Hello", "1.52.0")
+    assert key != SynthesisCache.key("espeak", "gmw/en", 150, 1.0, 50, "Hello", "1.52.0")
+    SynthesisCache(directory=str(tmp_path)).put(key, AudioBuffer(PCM, sample_rate=16000))
+
+    # A fresh cache, as after a restart, finds the entry on disk
+    cache = SynthesisCache(directory=str(tmp_path))
+    audio = cache.get(key)
+    assert bytes(audio) == PCM
+    assert audio.sample_rate == 16000
+    assert cache.get(key) is audio
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.stats()["hits"] == 2
+
+
+def test_split_sentences() -> None:
+    assert split_sentences(" Your order has shipped.  Is it Tuesday?\nYes! 3.5 kg ") == [
+        "Your order has shipped.",
+        "Is it Tuesday?",
+        "Yes!",
+        "3.5 kg",
+    ]
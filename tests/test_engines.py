@@ -1,10 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+import ctypes
+import statistics
+import subprocess
 import sys
+import threading
+import time
+from unittest import mock
 
 import pytest
 
 import pyttsx3
+from pyttsx3.aio import AsyncEngine
+from pyttsx3.audio import AudioBuffer, AudioFormat
+from pyttsx3.cache import SynthesisCache
+from pyttsx3.drivers import _espeak
+from pyttsx3.drivers.espeak import EspeakDriver
+from pyttsx3.playback import AudioSink
 
 quick_brown_fox = "The quick brown fox jumped over the lazy dog."
 
@@ -138,3 +151,695 @@ def test_apple_nsss_voices(driver_name) -> None:
     engine.runAndWait()
     engine.setProperty("voice", voice)  # Reset voice to original value
     engine.stop()
+
+
+@pytest.mark.parallel_threads(1)
+@pytest.mark.parametrize("driver_name", pyttsx3.engine.engines_by_sys_platform())
+def test_espeak_synthesize_iter(driver_name) -> None:
+    if driver_name != "espeak":
+        pytest.skip(f"Skipping eSpeak-specific test for {driver_name}.")
+
+    engine = pyttsx3.init(driver_name)
+    chunks = list(engine.synthesize_iter(quick_brown_fox))
+    assert chunks, "Expected at least one PCM chunk"
+    assert all(len(chunk) % 2 == 0 for chunk in chunks), "Expected whole 16-bit samples"
+
+    # Abandoning a stream early must leave the driver ready for the next one
+    stream = engine.synthesize_iter(quick_brown_fox * 20)
+    assert next(stream)
+    stream.close()
+    pcm = b"".join(engine.synthesize_iter(quick_brown_fox))
+    # espeak output is not bit-exact between runs, so only compare lengths
+    assert abs(len(pcm) - sum(map(len, chunks))) < 100, "Unexpected length after an aborted stream"
+
+    # A busy driver is reported when the stream is requested, not on first use
+    stream = engine.synthesize_iter(quick_brown_fox)
+    with pytest.raises(RuntimeError):
+        engine.synthesize_iter(quick_brown_fox)
+    stream.close()
+    engine.stop()
+
+
+@pytest.mark.parallel_threads(1)
+@pytest.mark.parametrize("driver_name", pyttsx3.engine.engines_by_sys_platform())
+def test_espeak_synthesize(driver_name) -> None:
+    if driver_name != "espeak":
+        pytest.skip(f"Skipping eSpeak-specific test for {driver_name}.")
+
+    engine = pyttsx3.init(driver_name)
+    audio = engine.synthesize(quick_brown_fox)
+    assert audio.sample_rate == engine.getProperty("sample_rate")
+    assert audio.format == engine.audio_format
+    assert audio.sample_width == 2
+    assert audio.channels == 1
+    assert audio.frames == len(audio) // 2
+    assert 1 < audio.duration < 10
+    samples = audio.as_memoryview()
+    assert samples.format == "h"
+    assert len(samples) == audio.frames
+    engine.stop()
+
+
+@pytest.mark.parametrize("driver_name", pyttsx3.engine.engines_by_sys_platform())
+def test_espeak_output_format(driver_name, tmp_path) -> None:
+    if driver_name != "espeak":
+        pytest.skip(f"Skipping eSpeak-specific test for {driver_name}.")
+
+    engine = pyttsx3.init(driver_name)
+    native = engine.synthesize(quick_brown_fox)
+    engine.output_format = AudioFormat(8000, sample_width=1, channels=2)
+    try:
+        assert engine.audio_format == engine.output_format
+        audio = engine.synthesize(quick_brown_fox)
+        assert audio.format == engine.output_format
+        assert audio.duration == pytest.approx(native.duration, abs=0.01)
+        streamed = b"".join(engine.synthesize_iter(quick_brown_fox))
+        assert abs(len(streamed) - len(audio)) <= 2 * 2
+        filename = str(tmp_path / "converted.wav")
+        engine.save_to_file(quick_brown_fox, filename)
+        engine.runAndWait()
+        assert AudioBuffer.read_wav(filename).format == engine.output_format
+    finally:
+        engine.output_format = None
+
+
+@pytest.mark.parallel_threads(1)
+@pytest.mark.parametrize("driver_name", pyttsx3.engine.engines_by_sys_platform())
+def test_espeak_streaming_playback(driver_name) -> None:
+    if driver_name != "espeak":
+        pytest.skip(f"Skipping eSpeak-specific test for {driver_name}.")
+
+    class RecordingSink(AudioSink):
+        def __init__(self) -> None:
+            self.writes = []
+
+        def write(self, data, sample_rate, sample_width=2, channels=1) -> None:
+            self.writes.append((bytes(data), finished.is_set()))
+
+    finished = threading.Event()
+    sink = RecordingSink()
+    engine = pyttsx3.init(driver_name)
+    original_sink = engine.getProperty("sink")
+    token = engine.connect("finished-utterance", lambda name, completed: finished.set())
+    engine.setProperty("sink", sink)
+    engine.setProperty("streaming", True)
+    engine.setProperty("jitter_buffer", 0)
+    engine.say(quick_brown_fox * 3)
+    engine.runAndWait()
+    assert finished.wait(10)
+    engine.disconnect(token)
+    engine.setProperty("streaming", False)
+    engine.setProperty("sink", original_sink)
+    engine.runAndWait()
+
+    assert len(sink.writes) > 1, "Expected one sink write per espeak buffer"
+    assert not sink.writes[0][1], "Expected playback to start before synthesis finished"
+
+
+@pytest.mark.parametrize("driver_name", pyttsx3.engine.engines_by_sys_platform())
+def test_espeak_lookahead(driver_name) -> None:
+    if driver_name != "espeak":
+        pytest.skip(f"Skipping eSpeak-specific test for {driver_name}.")
+
+    class RecordingSink(AudioSink):
+        def __init__(self) -> None:
+            self.played = []
+
+        def play(self, audio) -> None:
+            self.played.append(bytes(audio))
+
+    sink = RecordingSink()
+    engine = pyttsx3.init(driver_name)
+    original_sink = engine.getProperty("sink")
+    engine.setProperty("sink", sink)
+    expected = engine.synthesize(quick_brown_fox)
+    engine.lookahead = 2
+    utterances = [engine.say(quick_brown_fox) for _ in range(3)]
+    engine.runAndWait()
+    engine.lookahead = 0
+    engine.setProperty("sink", original_sink)
+    assert all(utterance.result() for utterance in utterances)
+    assert sink.played == [bytes(expected)] * 3
+
+
+@pytest.mark.parallel_threads(1)
+@pytest.mark.parametrize("driver_name", pyttsx3.engine.engines_by_sys_platform())
+def test_espeak_synthesis_cache(driver_name) -> None:
+    if driver_name != "espeak":
+        pytest.skip(f"Skipping eSpeak-specific test for {driver_name}.")
+
+    class RecordingSink(AudioSink):
+        def __init__(self) -> None:
+            self.played = []
+
+        def play(self, audio) -> None:
+            self.played.append(bytes(audio))
+
+    sink = RecordingSink()
+    engine = pyttsx3.init(driver_name)
+    original_sink = engine.getProperty("sink")
+    engine.setProperty("sink", sink)
+    engine.cache = SynthesisCache()
+    with mock.patch.object(_espeak, "Synth", wraps=_espeak.Synth) as synth:
+        audio = engine.synthesize(quick_brown_fox)
+        assert engine.synthesize(quick_brown_fox).duration == audio.duration
+        assert synth.call_count == 1, "Expected the second synthesize() to hit the cache"
+        assert b"".join(engine.synthesize_iter(quick_brown_fox)) == bytes(audio)
+
+        for _ in range(2):
+            engine.say(quick_brown_fox * 2)
+            engine.runAndWait()
+        assert synth.call_count == 2, "Expected the second say() to hit the cache"
+
+        engine.setProperty("rate", 150)
+        engine.say(quick_brown_fox * 2)
+        engine.runAndWait()
+        assert synth.call_count == 3, "Expected a new rate to miss the cache"
+    assert len(sink.played) == 3
+    assert sink.played[0] == sink.played[1]
+    assert engine.cache.stats()["hits"] == 3
+    assert engine.cache.stats()["misses"] == 3
+
+    engine.cache = None
+    engine.setProperty("rate", 200)
+    engine.runAndWait()
+    engine.setProperty("sink", original_sink)
+    engine.stop()
+
+
+@pytest.mark.parallel_threads(1)
+@pytest.mark.parametrize("driver_name", pyttsx3.engine.engines_by_sys_platform())
+def test_espeak_sentence_cache(driver_name) -> None:
+    if driver_name != "espeak":
+        pytest.skip(f"Skipping eSpeak-specific test for {driver_name}.")
+
+    class RecordingSink(AudioSink):
+        def __init__(self) -> None:
+            self.played = []
+
+        def play(self, audio) -> None:
+            self.played.append(len(audio))
+
+    shipped, arrival = "Your order has shipped.", "It will arrive Tuesday."
+    sink = RecordingSink()
+    engine = pyttsx3.init(driver_name)
+    original_sink = engine.getProperty("sink")
+    engine.setProperty("sink", sink)
+    whole = engine.synthesize(f"{shipped} {arrival}")
+    engine.cache = SynthesisCache(sentences=True)
+    with mock.patch.object(_espeak, "Synth", wraps=_espeak.Synth) as synth:
+        stitched = engine.synthesize(f"{shipped} {arrival}")
+        assert synth.call_count == 2, "Expected one synthesis per sentence"
+        # Sentences synthesized with ENDPAUSE join up like a single synthesis
+        assert stitched.duration == pytest.approx(whole.duration, abs=0.01)
+
+        engine.synthesize(f"{shipped} It will arrive Friday.")
+        assert synth.call_count == 3, "Expected only the new sentence to be synthesized"
+        assert len(b"".join(engine.synthesize_iter(f"{arrival} {shipped}"))) == len(stitched)
+
+        engine.say(f"{arrival} {shipped}")
+        engine.runAndWait()
+        assert synth.call_count == 3, "Expected say() to reuse cached sentences"
+    assert sink.played == [len(stitched)]
+
+    engine.cache = None
+    engine.setProperty("sink", original_sink)
+    engine.stop()
+
+
+@pytest.mark.parallel_threads(1)
+@pytest.mark.parametrize("driver_name", pyttsx3.engine.engines_by_sys_platform())
+def test_espeak_loop_wakes_on_command(driver_name) -> None:
+    """An idle driver loop must start queued speech at once, not on its next poll."""
+    if driver_name != "espeak":
+        pytest.skip(f"Skipping eSpeak-specific test for {driver_name}.")
+
+    latencies = []
+    queued_at = 0.0
+    finished = threading.Event()
+
+    def onStart(name) -> None:
+        latencies.append(time.perf_counter() - queued_at)
+
+    engine = pyttsx3.init(driver_name)
+    original_sink = engine.getProperty("sink")
+    engine.setProperty("sink", AudioSink())
+    tokens = [
+        engine.connect("started-utterance", onStart),
+        engine.connect("finished-utterance", lambda name, completed: finished.set()),
+    ]
+    loop = threading.Thread(target=engine.startLoop)
+    loop.start()
+    for _ in range(20):
+        finished.clear()
+        queued_at = time.perf_counter()
+        engine.say("Hello")
+        assert finished.wait(10)
+    engine.endLoop()
+    loop.join(10)
+    for token in tokens:
+        engine.disconnect(token)
+    engine.setProperty("sink", original_sink)
+    engine.runAndWait()
+
+    assert not loop.is_alive(), "Expected endLoop() from another thread to end the loop"
+    old_poll_interval = 0.01
+    assert statistics.median(latencies) < old_poll_interval / 5, latencies
+
+
+@pytest.mark.parallel_threads(1)
+@pytest.mark.parametrize("driver_name", pyttsx3.engine.engines_by_sys_platform())
+def test_espeak_async_engine(driver_name) -> None:
+    """AsyncEngine utterances are awaitable and never block the event loop."""
+    if driver_name != "espeak":
+        pytest.skip(f"Skipping eSpeak-specific test for {driver_name}.")
+
+    async def main() -> tuple:
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.001)
+                ticks += 1
+
+        async with AsyncEngine(driver_name) as engine:
+            original_sink = await engine.getProperty("sink")
+            await engine.setProperty("sink", AudioSink())
+            topics = []
+
+            async def collect() -> None:
+                async for topic, _ in engine.events():
+                    topics.append(topic)
+
+            collector = asyncio.create_task(collect())
+            ticker = asyncio.create_task(tick())
+            await asyncio.sleep(0)
+            spoken = await asyncio.gather(engine.say("Hello", "a"), engine.say("World", "b"))
+            with pytest.raises(ValueError):  # noqa: PT011
+                await engine.say("")
+            stopped = [
+                engine.say("The quick brown fox jumped over the lazy dog.") for _ in range(3)
+            ]
+            await engine.stop()
+            await engine.drain()
+            dropped = [future.result() for future in stopped]
+            collector.cancel()
+            ticker.cancel()
+            await engine.setProperty("sink", original_sink)
+        return spoken, dropped, topics, ticks
+
+    spoken, dropped, topics, ticks = asyncio.run(main())
+    assert spoken == [True, True]
+    assert dropped == [False, False, False]
+    assert topics[:4] == [
+        "started-utterance",
+        "started-word",
+        "finished-utterance",
+        "started-utterance",
+    ]
+    assert ticks > 0, "Expected the event loop to keep running while speaking"
+
+
+def test_async_engine_dropped_utterances() -> None:
+    """Futures follow their own utterance, also when others are dropped without an event."""
+
+    async def main() -> list:
+        async with AsyncEngine("dummy") as engine:
+            engine.engine.limitQueue(depth=2, overflow="drop-oldest")
+            # queued before the loop takes any of them, so the first two are dropped
+            futures = [engine.say(name, name) for name in "abcd"]
+            await engine.drain()
+            return [future.result() for future in futures]
+
+    assert asyncio.run(main()) == [False, False, True, True]
+
+
+@pytest.mark.parallel_threads(1)
+@pytest.mark.parametrize("driver_name", pyttsx3.engine.engines_by_sys_platform())
+def test_espeak_utterance_handles(driver_name) -> None:
+    """Cancelling one utterance before or while it is spoken leaves the others alone."""
+    if driver_name != "espeak":
+        pytest.skip(f"Skipping eSpeak-specific test for {driver_name}.")
+
+    engine = pyttsx3.init(driver_name)
+    original_sink = engine.getProperty("sink")
+    engine.setProperty("sink", AudioSink())
+    finished = []
+    utterances = {}
+    current = []
+
+    def onStart(name) -> None:
+        current.append(name)
+        if name == "at start":
+            utterances[name].cancel()
+
+    def onWord(name, location, length) -> None:
+        if current[-1] == "mid word":
+            utterances["mid word"].cancel()
+
+    tokens = [
+        engine.connect("started-utterance", onStart),
+        engine.connect("started-word", onWord),
+        engine.connect(
+            "finished-utterance", lambda name, completed: finished.append((name, completed))
+        ),
+    ]
+    names = ("a", "at start", "mid word", "b")
+    texts = ("Hello", quick_brown_fox, quick_brown_fox * 5, "Goodbye")
+    for name, text in zip(names, texts, strict=True):
+        utterances[name] = engine.say(text, name)
+    engine.runAndWait()
+    for token in tokens:
+        engine.disconnect(token)
+    engine.setProperty("sink", original_sink)
+    engine.runAndWait()
+
+    assert finished == [("a", True), ("at start", False), ("mid word", False), ("b", True)]
+    assert [utterances[name].result(0) for name in names] == [True, False, False, True]
+    hello = utterances["a"]
+    assert hello.samples > 0
+    assert hello.duration == pytest.approx(hello.samples / engine.getProperty("sample_rate"))
+    assert not hello.cancel()
+
+
+@pytest.mark.parallel_threads(1)
+@pytest.mark.parametrize("streaming", [False, True])
+@pytest.mark.parametrize("driver_name", pyttsx3.engine.engines_by_sys_platform())
+def test_espeak_preemption(driver_name, streaming) -> None:
+    """An urgent utterance cuts in at the next word; the preempted one resumes from that word."""
+    if driver_name != "espeak":
+        pytest.skip(f"Skipping eSpeak-specific test for {driver_name}.")
+
+    engine = pyttsx3.init(driver_name)
+    original_sink = engine.getProperty("sink")
+    engine.setProperty("sink", AudioSink())
+    engine.setProperty("streaming", streaming)
+    full = engine.say(quick_brown_fox)
+    engine.runAndWait()
+    events = []
+    alerts = []
+
+    def onWord(name, location, length) -> None:
+        events.append(name)
+        if name == "brown":
+            alerts.append(engine.say("Alert", "alert", priority=1))
+
+    tokens = [
+        engine.connect("started-utterance", lambda name: events.append(f"<{name}>")),
+        engine.connect("started-word", onWord),
+    ]
+    results = {}
+    for resume in (True, False):
+        events.clear()
+        results[resume] = engine.say(quick_brown_fox, "fox", resume=resume)
+        engine.runAndWait()
+        assert events[:6] == ["<fox>", "The", "quick", "brown", "<alert>", "Alert"]
+        if resume:
+            assert events[6:] == ["<fox>", "fox", "jumped", "over", "the", "lazy", "dog"]
+        else:
+            assert events[6:] == []
+    for token in tokens:
+        engine.disconnect(token)
+    engine.setProperty("streaming", False)
+    engine.setProperty("sink", original_sink)
+    engine.runAndWait()
+
+    assert all(alert.result(0) is True for alert in alerts)
+    resumed, dropped = results[True], results[False]
+    assert resumed.result(0) is True
+    assert dropped.result(0) is False
+    # the resumed utterance is about as long as the one spoken in one go
+    assert resumed.samples == pytest.approx(full.samples, rel=0.05)
+
+
+class RealtimeSink(AudioSink):
+    """Blocks in write() and drain() as long as playing the audio would take."""
+
+    def __init__(self) -> None:
+        self.writing = threading.Event()
+        self.aborted = threading.Event()
+        self.writes = 0
+
+    def write(self, data, sample_rate, sample_width=2, channels=1) -> None:
+        self.writes += 1
+        self.writing.set()
+        self.aborted.wait(memoryview(data).nbytes / (sample_rate * sample_width * channels))
+
+    def drain(self) -> None:
+        self.aborted.wait(10)
+
+    def abort(self) -> None:
+        self.aborted.set()
+
+
+@pytest.mark.parallel_threads(1)
+@pytest.mark.parametrize("driver_name", pyttsx3.engine.engines_by_sys_platform())
+@pytest.mark.parametrize("phase", ["synthesis", "playback", "streaming"])
+def test_espeak_stop_latency(driver_name, phase) -> None:
+    """stop() must silence espeak and report the utterance at once, wherever it is."""
+    if driver_name != "espeak":
+        pytest.skip(f"Skipping eSpeak-specific test for {driver_name}.")
+
+    engine = pyttsx3.init(driver_name)
+    original_sink = engine.getProperty("sink")
+    engine.setProperty("streaming", phase == "streaming")
+    word = threading.Event()
+    finished = threading.Event()
+    results = []
+    tokens = [
+        engine.connect("started-word", lambda name, location, length: word.set()),
+        engine.connect(
+            "finished-utterance",
+            lambda name, completed: (
+                results.append((time.perf_counter(), completed)),
+                finished.set(),
+            ),
+        ),
+    ]
+    latencies = []
+    engine.startWorker()
+    for _ in range(3):
+        sink = RealtimeSink()
+        engine.setProperty("sink", sink)
+        word.clear()
+        finished.clear()
+        engine.say(quick_brown_fox * 50)
+        # mid synthesis at the first word, or once the sink is playing
+        assert (word if phase == "synthesis" else sink.writing).wait(10)
+        stopped_at = time.perf_counter()
+        engine.stop()
+        assert finished.wait(10)
+        writes = sink.writes
+        finished_at, completed = results[-1]
+        latencies.append(finished_at - stopped_at)
+        assert not completed
+        engine.runAndWait()
+        assert sink.writes == writes, "Expected no audio to be written after the stop"
+    engine.endWorker(10)
+    for token in tokens:
+        engine.disconnect(token)
+    engine.setProperty("streaming", False)
+    engine.setProperty("sink", original_sink)
+    engine.runAndWait()
+
+    # espeak's Cancel() alone took ~100 ms, and playback used to run to its end
+    cancel_latency = 0.1
+    assert statistics.median(latencies) < cancel_latency / 5, latencies
+
+
+@pytest.mark.parallel_threads(1)
+@pytest.mark.parametrize("driver_name", pyttsx3.engine.engines_by_sys_platform())
+def test_espeak_exit_after_stopped_loop(driver_name) -> None:
+    """The interpreter exits while a stopped synthesis winds down."""
+    if driver_name != "espeak":
+        pytest.skip(f"Skipping eSpeak-specific test for {driver_name}.")
+
+    script = f"""
+import pyttsx3
+from pyttsx3.playback import AudioSink
+engine = pyttsx3.init({driver_name!r})
+engine.setProperty("sink", AudioSink())
+engine.say({quick_brown_fox * 20!r})
+engine.startLoop(False)
+engine.iterate()
+engine.endLoop()
+"""
+    # the synth callback used to run during interpreter shutdown and hang it
+    subprocess.run([sys.executable, "-c", script], check=True, timeout=30)
+
+
+class FakeEspeak:
+    """
+    Stands in for the espeak library so the driver runs without it. Synth()
+    calls the synth callback on a thread of its own, like espeak does, with
+    a few buffers of silence.
+    """
+
+    sample_rate = 22050
+    buffers = 3
+    frames = 220
+
+    def __init__(self) -> None:
+        self.callback = None
+        self.syntheses = []
+
+    def Initialize(self, output, bufflength) -> int:
+        return self.sample_rate
+
+    def GetCurrentVoice(self) -> None:
+        return None
+
+    def SetSynthCallback(self, callback) -> None:
+        self.callback = callback
+
+    def SetVoiceByName(self, name) -> int:
+        return 0
+
+    def SetParameter(self, parameter, value, relative) -> None:
+        pass
+
+    def GetParameter(self, parameter) -> int:
+        return 0
+
+    def Cancel(self) -> None:
+        pass
+
+    def Info(self, path) -> bytes:
+        return b"1.52-fake"
+
+    def Synth(self, text, **kwargs) -> None:
+        thread = threading.Thread(target=self._run, daemon=True)
+        self.syntheses.append(thread)
+        thread.start()
+
+    def _run(self) -> None:
+        wav = (ctypes.c_short * self.frames)()
+        for _ in range(self.buffers):
+            events = (_espeak.EVENT * 1)()
+            if self.callback(wav, self.frames, events):
+                break
+        events = (_espeak.EVENT * 2)()
+        events[0].type = _espeak.EVENT_MSG_TERMINATED
+        self.callback(wav, 0, events)
+
+
+@pytest.fixture
+def fake_espeak(monkeypatch):
+    fake = FakeEspeak()
+    for name in dir(FakeEspeak):
+        if name[0].isupper():
+            monkeypatch.setattr(_espeak, name, getattr(fake, name))
+    monkeypatch.setattr(EspeakDriver, "_moduleInitialized", False)
+    monkeypatch.setattr(EspeakDriver, "_callbackOwner", None)
+    engine = pyttsx3.Engine("espeak")
+    yield engine
+    # unhook the driver while the fake library is still in place
+    engine.proxy._driver.destroy()
+
+
+class CallRecordingSink(AudioSink):
+    def __init__(self) -> None:
+        self.calls = []
+
+    def play(self, audio) -> None:
+        self.calls.append("play")
+
+    def drain(self) -> None:
+        self.calls.append("drain")
+
+    def abort(self) -> None:
+        self.calls.append("abort")
+
+
+def test_espeak_run_and_wait_plays_out(fake_espeak) -> None:
+    """runAndWait() waits for the queued audio to play instead of aborting it."""
+    engine = fake_espeak
+    sink = CallRecordingSink()
+    engine.setProperty("sink", sink)
+    finished = []
+    engine.connect(
+        "finished-utterance",
+        lambda name, completed: finished.append((name, completed, list(sink.calls))),
+    )
+    utterance = engine.say(quick_brown_fox, "fox")
+    engine.runAndWait()
+    assert sink.calls[:2] == ["play", "drain"]
+    assert "abort" not in sink.calls
+    assert [(name, completed) for name, completed, _ in finished] == [("fox", True)]
+    # reported once the audio was played, not when it was queued
+    assert finished[0][2][:2] == ["play", "drain"]
+    assert utterance.result(0) is True
+
+
+def test_espeak_synthesize_while_starting(fake_espeak) -> None:
+    """A synthesis requested as the loop starts an utterance fails instead of overlapping it."""
+    engine = fake_espeak
+    engine.setProperty("sink", CallRecordingSink())
+    errors = []
+
+    def onStart(name) -> None:
+        try:
+            engine.synthesize("other")
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    engine.connect("started-utterance", onStart)
+    utterance = engine.say(quick_brown_fox)
+    engine.runAndWait()
+    assert errors == ["espeak is busy with another utterance"]
+    assert len(_espeak.Synth.__self__.syntheses) == 1
+    assert utterance.result(0) is True
+
+
+def test_espeak_closed_stream_leaves_next_synthesis(fake_espeak) -> None:
+    """Closing a stream whose synthesis ended must not abort the one running now."""
+    driver = fake_espeak.proxy._driver
+    first = driver.synthesize_iter("first")
+    chunks = [next(first) for _ in range(FakeEspeak.buffers)]
+    # every chunk consumed, but not the end of the stream
+    _espeak.Synth.__self__.syntheses[-1].join(5)
+    second = driver.synthesize_iter("second", max_chunks=1)
+    first.close()
+    assert len(list(second)) == len(chunks)
+
+
+def test_espeak_save_to_file_cache(fake_espeak, tmp_path) -> None:
+    """A saved file's audio is cached even though it streams straight to disk."""
+    engine = fake_espeak
+    engine.cache = SynthesisCache()
+    paths = [tmp_path / "first.wav", tmp_path / "second.wav"]
+    for path in paths:
+        engine.save_to_file(quick_brown_fox, str(path))
+        engine.runAndWait()
+    assert len(_espeak.Synth.__self__.syntheses) == 1, "Expected the second save to hit the cache"
+    assert engine.cache.stats()["hits"] == 1
+    assert paths[0].read_bytes() == paths[1].read_bytes()
+
+
+class SlowSink(AudioSink):
+    def play(self, audio) -> None:
+        time.sleep(0.2)
+
+
+def test_espeak_played_utterance_order(fake_espeak) -> None:
+    """Playback overlaps the next synthesis, but the loop thread still reports both ends."""
+    engine = fake_espeak
+    engine.setProperty("sink", SlowSink())
+    events = []
+    engine.connect("started-utterance", lambda name: events.append(("started", name)))
+    engine.connect(
+        "finished-utterance",
+        lambda name, completed: events.append(("finished", name, threading.current_thread())),
+    )
+    engine.say(quick_brown_fox, "a")
+    engine.say(quick_brown_fox, "b")
+    engine.runAndWait()
+    me = threading.current_thread()
+    # b is synthesized while a plays, so it starts before a is reported finished
+    assert events == [
+        ("started", "a"),
+        ("started", "b"),
+        ("finished", "a", me),
+        ("finished", "b", me),
+    ]
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import ctypes.util
+import os
+import subprocess
+import sys
+
+import pytest
+
+from pyttsx3.drivers import _espeak
+
+# generous enough for slow CI machines, tight enough to catch the library
+# being loaded or every prototype being built at import time again
+IMPORT_BUDGET_US = 50_000
+
+
+def _importTimes(module) -> dict:
+    """@return: Cumulative import time in microseconds by module name"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import pyttsx3; import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_espeak_import_time() -> None:
+    times = _importTimes("pyttsx3.drivers._espeak")
+    assert times["pyttsx3.drivers._espeak"] < IMPORT_BUDGET_US
+    assert "ctypes.util" not in times
+
+
+def test_espeak_binds_lazily() -> None:
+    code = (
+        "from pyttsx3.drivers import _espeak; "
+        "assert _espeak.dll is None and _espeak.Synth and _espeak.cSynth._func is None"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_espeak_library_override(monkeypatch) -> None:
+    monkeypatch.setattr(_espeak, "_path", None)
+    monkeypatch.setattr(_espeak, "dll", None)
+    monkeypatch.setenv(_espeak.LIBRARY_ENV, os.devnull)
+    assert list(_espeak.library_paths()) == [os.devnull]
+    with pytest.raises(RuntimeError):
+        _espeak.library()
+    # a path that failed to load is not remembered
+    assert _espeak.library_path() is None
+
+
+def test_espeak_library_tries_each_path(monkeypatch) -> None:
+    class FakeLoader:
+        def __init__(self) -> None:
+            self.tried = []
+
+        def LoadLibrary(self, path):
+            self.tried.append(path)
+            if path != "libespeak.so.1":
+                msg = f"{path}: cannot open shared object file"
+                raise OSError(msg)
+            return path
+
+    loader = FakeLoader()
+    monkeypatch.setattr(_espeak, "_path", None)
+    monkeypatch.setattr(_espeak, "dll", None)
+    monkeypatch.setattr(_espeak, "cdll", loader)
+    monkeypatch.delenv(_espeak.LIBRARY_ENV, raising=False)
+    found = {"espeak-ng": "libespeak-ng.so.1"}
+    monkeypatch.setattr(ctypes.util, "find_library", found.get)
+    paths = ("/missing/libespeak-ng.so.1", "libespeak-ng.so.1", "libespeak.so.1")
+    monkeypatch.setattr(_espeak, "_LIBRARY_PATHS", paths)
+    assert _espeak.library() == "libespeak.so.1"
+    # find_library first, then the install locations it did not already name
+    assert loader.tried == ["libespeak-ng.so.1", "/missing/libespeak-ng.so.1", "libespeak.so.1"]
+    assert _espeak.library_path() == "libespeak.so.1"
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+from pyttsx3 import playback
+from pyttsx3.audio import AudioBuffer
+from pyttsx3.playback import (
+    AfplaySink,
+    AudioSink,
+    ProcessSink,
+    QueuedSink,
+    WinsoundSink,
+    aplay_command,
+    pacat_command,
+)
+
+# 800 frames at 8 kHz
+TENTH_OF_A_SECOND = 0.1
+
+
+class FakePlayer:
+    """Player command that consumes stdin at real-time speed and counts its launches."""
+
+    def __init__(self, output) -> None:
+        self.output = output
+        self.launches = []
+
+    def __call__(self, sample_rate: int, sample_width: int, channels: int) -> list[str]:
+        self.launches.append((sample_rate, sample_width, channels))
+        bytes_per_second = sample_rate * sample_width * channels
+        script = (
+            "import sys, time\n"
+            f"with open({str(self.output)!r}, 'ab') as f:\n"
+            f"    while data := sys.stdin.buffer.read1({bytes_per_second // 100}):\n"
+            "        f.write(data)\n"
+            f"        time.sleep(len(data) / {bytes_per_second})\n"
+        )
+        return [sys.executable, "-c", script]
+
+
+def test_player_commands() -> None:
+    assert aplay_command(22050, 2, 1)[-6:] == ["-f", "S16_LE", "-r", "22050", "-c", "1"]
+    assert "--format=s16le" in pacat_command(22050, 2, 1)
+
+
+@pytest.mark.parallel_threads(1)
+def test_process_sink_reuses_player(tmp_path) -> None:
+    output = tmp_path / "played.raw"
+    player = FakePlayer(output)
+    sink = ProcessSink(player)
+    sink.play(AudioBuffer(bytes(200), sample_rate=8000))
+    sink.play(AudioBuffer(bytes(200), sample_rate=8000))
+    assert len(player.launches) == 1, "Expected one player process for one sample format"
+
+    sink.play(AudioBuffer(bytes(100), sample_rate=16000))
+    assert player.launches == [(8000, 2, 1), (16000, 2, 1)]
+    sink.close()
+    assert output.read_bytes() == bytes(500)
+
+
+@pytest.mark.parallel_threads(1)
+def test_process_sink_drain_waits_for_playback_once(tmp_path) -> None:
+    """Writing more than a pipe buffer blocks in step with playback; drain must not add to it."""
+    sink = ProcessSink(FakePlayer(tmp_path / "played.raw"))
+    one_second = AudioBuffer(bytes(2 * 200_000), sample_rate=200_000)  # several pipe buffers
+    duration = one_second.duration
+    start = time.monotonic()
+    sink.play(one_second)
+    sink.drain()
+    elapsed = time.monotonic() - start
+    sink.close()
+    assert duration - 0.1 < elapsed < duration + 0.5, f"Drain returned after {elapsed:.2f} s"
+
+
+class BlockingSink(AudioSink):
+    """Sink whose writes block until released or aborted, like a player with a full pipe."""
+
+    def __init__(self) -> None:
+        self.written = []
+        self.played = []
+        self.release = threading.Event()
+
+    def write(self, data, sample_rate, sample_width=2, channels=1) -> None:
+        self.release.wait(5)
+        self.written.append(bytes(data))
+
+    def play(self, audio) -> None:
+        self.release.wait(5)
+        self.played.append(bytes(audio))
+
+    def abort(self) -> None:
+        self.release.set()
+
+
+def test_queued_sink_write_does_not_block() -> None:
+    inner = BlockingSink()
+    sink = QueuedSink(inner, max_pending=4)
+    start = time.monotonic()
+    data = bytearray(b"\x01\x00")
+    for _ in range(3):
+        sink.write(data, 8000)
+        data[0] += 1  # the caller may reuse its buffer at once
+    assert time.monotonic() - start < 1, "Expected writes to be queued, not played"
+    assert inner.written == []
+
+    audio = AudioBuffer(b"\x04\x00", sample_rate=8000)
+    sink.play(audio)
+    audio.clear()
+    inner.release.set()
+    sink.drain()
+    assert inner.written == [b"\x01\x00", b"\x02\x00", b"\x03\x00"]
+    assert inner.played == [b"\x04\x00"], "Expected the audio as queued, through play()"
+    sink.close()
+
+
+def test_queued_sink_abort_discards_queued_audio() -> None:
+    inner = BlockingSink()
+    sink = QueuedSink(inner)
+    for _ in range(5):
+        sink.write(bytes(2), 8000)
+    drained = threading.Thread(target=sink.drain)
+    drained.start()
+    sink.abort()
+    drained.join(1)
+    assert not drained.is_alive(), "Expected abort to end a running drain"
+    sink.drain()
+    # only the write already handed to the sink when aborting got through
+    assert len(inner.written) + len(inner.played) <= 1
+    sink.close()
+
+
+def test_queued_sink_when_played() -> None:
+    inner = BlockingSink()
+    sink = QueuedSink(inner)
+    results = []
+    sink.write(bytes(2), 8000)
+    sink.when_played(results.append)
+    sink.write(bytes(2), 8000)
+    sink.when_played(results.append)
+    sink.abort()
+    # the first write may have reached the sink already; neither was played
+    sink.drain()
+    assert results == [False, False]
+
+    inner.release.set()
+    sink.write(bytes(2), 8000)
+    sink.when_played(results.append)
+    sink.drain()
+    assert results == [False, False, True]
+    sink.close()
+
+
+def _abortWhilePlaying(sink, data, sample_rate) -> float:
+    """@return: Seconds write() took when abort() was called once it started playing"""
+    start = time.monotonic()
+    writer = threading.Thread(target=sink.write, args=(data, sample_rate))
+    writer.start()
+    time.sleep(0.2)
+    sink.abort()
+    writer.join(5)
+    assert not writer.is_alive(), "Expected abort to end the write"
+    return time.monotonic() - start
+
+
+@pytest.mark.parallel_threads(1)
+def test_afplay_sink_abort(monkeypatch) -> None:
+    launched = []
+    Popen = subprocess.Popen
+
+    def popen(args, **kwargs):
+        launched.append(args)
+        # stands in for afplay playing ten seconds of audio
+        return Popen([sys.executable, "-c", "import time; time.sleep(10)"], **kwargs)
+
+    monkeypatch.setattr(playback.subprocess, "Popen", popen)
+    sink = AfplaySink()
+    assert _abortWhilePlaying(sink, bytes(2 * 8000 * 10), 8000) < 2
+    assert launched[0][0] == "afplay"
+
+
+@pytest.mark.parallel_threads(1)
+def test_winsound_sink_abort(monkeypatch) -> None:
+    calls = []
+    winsound = types.SimpleNamespace(
+        SND_FILENAME=0x20000,
+        SND_ASYNC=0x1,
+        PlaySound=lambda sound, flags: calls.append((sound, flags)),
+    )
+    monkeypatch.setitem(sys.modules, "winsound", winsound)
+    sink = WinsoundSink()
+    assert _abortWhilePlaying(sink, bytes(2 * 8000 * 10), 8000) < 2
+    assert calls[0][1] == winsound.SND_FILENAME | winsound.SND_ASYNC
+    assert calls[-1] == (None, 0), "Expected abort to stop the asynchronous sound"
+
+    # otherwise write() keeps in step with playback
+    start = time.monotonic()
+    sink.write(bytes(2 * 800), 8000)
+    assert time.monotonic() - start >= TENTH_OF_A_SECOND
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from multiprocessing import shared_memory
+
+import pytest
+
+import pyttsx3
+from pyttsx3 import pool as pool_module
+from pyttsx3.audio import AudioBuffer, AudioFormat
+from pyttsx3.pool import SynthesisPool, _initWorker, _receive, _render, _share
+
+
+def test_audio_round_trips_through_shared_memory() -> None:
+    audio = AudioBuffer(b"\x01\x00\xff\xff\x00\x80", sample_rate=16000)
+    shared = _share(audio)
+    assert len(shared) == 5, "Expected only the block's name, size and format to be pickled"
+    received = _receive(shared)
+    assert received.format == audio.format
+    assert bytes(received) == bytes(audio)
+    assert not bytes(_receive(_share(AudioBuffer())))
+
+
+def test_pool_reports_unsupported_driver() -> None:
+    # the dummy engine starts but cannot synthesize, so each job fails
+    with SynthesisPool(1, "dummy") as pool, pytest.raises(NotImplementedError):
+        pool.map(["Hello"])
+
+
+def test_worker_that_failed_to_start_fails_its_jobs(monkeypatch) -> None:
+    # a worker whose engine cannot start fails its jobs instead of being
+    # restarted over and over
+    monkeypatch.setattr(pool_module, "_engine", None)
+    monkeypatch.setattr(pool_module, "_failure", None)
+    _initWorker("nonexistent", None)
+    assert pool_module._engine is None
+    with pytest.raises(ImportError, match="nonexistent"):
+        _render((0, "Hello", {}, None, None))
+
+
+def test_pool_releases_abandoned_audio() -> None:
+    pool = SynthesisPool(1, "dummy")
+    # as left behind by a job whose result was never received
+    name = _share(AudioBuffer(b"\x01\x00", sample_rate=16000))[0]
+    pool._blocks.add(name)
+    pool.close()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+
+@pytest.mark.parametrize("driver_name", pyttsx3.engine.engines_by_sys_platform())
+def test_espeak_synthesis_pool(driver_name, tmp_path) -> None:
+    if driver_name != "espeak":
+        pytest.skip(f"Skipping eSpeak-specific test for {driver_name}.")
+
+    filename = str(tmp_path / "saved.wav")
+    jobs = ["one", ("two", {"rate": 150}), ("three", None, filename)]
+    with SynthesisPool(2, driver_name, output_format=AudioFormat(16000)) as pool:
+        one, two, saved = pool.map(jobs)
+        unordered = dict(pool.imap_unordered(jobs[:2]))
+    assert one.format == AudioFormat(16000)
+    assert one.duration > 0
+    assert saved == filename
+    assert AudioBuffer.read_wav(filename).format == AudioFormat(16000)
+    assert bytes(unordered[0]) == bytes(one)
+    assert bytes(unordered[1]) == bytes(two)
+
+
+@pytest.mark.parametrize("driver_name", pyttsx3.engine.engines_by_sys_platform())
+def test_espeak_pool_job_properties_do_not_leak(driver_name) -> None:
+    if driver_name != "espeak":
+        pytest.skip(f"Skipping eSpeak-specific test for {driver_name}.")
+
+    text = "The quick brown fox jumped over the lazy dog."
+    # one worker runs every job, in order
+    with SynthesisPool(1, driver_name) as pool:
+        first, slow, last = pool.map([text, (text, {"rate": 80}), text])
+    assert slow.duration > first.duration
+    assert bytes(last) == bytes(first)
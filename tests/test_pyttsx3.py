@@ -168,10 +168,7 @@ def test_listening_for_events(engine) -> None:
     assert onEnd.called
 
 
-@pytest.mark.skipif(
-    sys.platform in ("linux", "win32"),
-    reason="TODO: Fix this test to pass on Linux and Windows",
-)
+@pytest.mark.skipif(sys.platform == "win32", reason="TODO: Fix this test to pass on Windows")
 @pytest.mark.parallel_threads(1)
 def test_interrupting_utterance(engine) -> None:
     def onWord(name, location, length) -> None:
@@ -242,10 +239,7 @@ def test_running_driver_event_loop(engine) -> None:
     engine.startLoop()
 
 
-@pytest.mark.skipif(
-    sys.platform in ("linux", "win32"),
-    reason="TODO: Fix this test to pass on Linux and Windows",
-)
+@pytest.mark.skipif(sys.platform == "win32", reason="TODO: Fix this test to pass on Windows")
 @pytest.mark.parallel_threads(1)
 def test_external_event_loop(engine) -> None:
     def externalLoop() -> None:
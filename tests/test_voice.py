@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import dataclasses
+
+import pytest
+
+from pyttsx3.engine import Engine
+from pyttsx3.voice import Voice, VoiceRegistry
+
+VOICES = [
+    Voice("en-gb", "British", ["en-GB"], "Female", 30),
+    Voice("en-us", "American", ["en_US"], "Male", 40),
+    Voice("en", "English", ["en"], "Male", None),
+    Voice("fr", "French", ["fr-FR"], "Female", 30),
+]
+
+
+def test_voice_is_frozen() -> None:
+    voice = VOICES[0]
+    assert voice.languages == ("en-GB",)
+    assert voice == Voice("en-gb", "British", ("en-GB",), "Female", 30)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        voice.name = "Scottish"
+    assert not hasattr(voice, "__dict__")
+
+
+def test_voice_registry_find() -> None:
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return VOICES
+
+    registry = VoiceRegistry(loader)
+    assert registry.get("fr") is VOICES[3]
+    assert [v.id for v in registry.find(language="en")] == ["en-gb", "en-us", "en"]
+    assert [v.id for v in registry.find(language="EN-us")] == ["en-us"]
+    assert [v.id for v in registry.find(language="en-GB", gender="female")] == ["en-gb"]
+    assert [v.id for v in registry.find(gender="Female", age=30)] == ["en-gb", "fr"]
+    assert registry.find(language="de") == []
+    assert len(registry.find()) == 4
+    assert len(loads) == 1
+    registry.invalidate()
+    assert len(registry) == 4
+    assert len(loads) == 2
+
+
+def test_engine_find_voices() -> None:
+    engine = Engine("dummy")
+    assert [v.id for v in engine.find_voices(language="en-GB", gender="Male", age=10)] == [
+        "dummy.voice3"
+    ]
+    assert engine.getProperty("voices")[1].name == "Jane Doe"